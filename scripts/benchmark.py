@@ -0,0 +1,244 @@
+"""
+Benchmark the hot paths of the verifier and its caches, and compare them against a stored baseline.
+
+    $ python3 scripts/benchmark.py                   # run and compare with benchmarks/baseline.json
+    $ python3 scripts/benchmark.py --full            # also run the slow (49, 6, 7, 3) cases
+    $ python3 scripts/benchmark.py --update-baseline # store the results as the new baseline
+
+Each case runs in a fresh process, so its peak RSS is not inflated by the cases before it.
+The exit code is 1 if a case is slower than the baseline by more than --tolerance.
+"""
+
+import argparse
+import importlib.util
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, islice
+from multiprocessing import get_context
+sys.path.append('src')
+sys.path.append('src/int_set')
+from combination_index_utils import calculate_combination_index, generate_combination_by_index
+from lottery_problem_with_cache import LotteryProblemWithCache
+from lottery_problem_verifier import LotteryProblemVerifier
+
+DEFAULT_BASELINE_PATH = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "benchmarks", "baseline.json"))
+# cheap benchmarks are repeated until they take this long, so that their timing is not just noise
+MIN_BENCHMARK_SECONDS = 0.2
+
+# the two script problems and scaled-down variants of them
+SCALED_DOWN_PROBLEMS = [(16, 5, 5, 2), (14, 6, 7, 3)]
+SCRIPT_PROBLEMS = [(39, 5, 5, 2), (49, 6, 7, 3)]
+# the size of the ticket sets of the scripts, used for random ticket sets of the same size
+SCRIPT_TICKET_COUNTS = {(39, 5, 5, 2): 23, (49, 6, 7, 3): 117}
+SLOW_PROBLEMS = [(49, 6, 7, 3)]
+
+
+def get_which_int_sets():
+    which_int_sets = ["native", "bitset"]
+    if importlib.util.find_spec("numpy") is not None:
+        which_int_sets.append("numpy")
+    return which_int_sets
+
+
+def get_peak_rss_bytes():
+    try:
+        import resource
+    except ImportError:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def get_random_ticket_indices(lpc, ticket_count):
+    return random.Random(0).sample(range(lpc.total_ticket_count), ticket_count)
+
+
+def time_repeatedly(run_once, op_count_per_run, min_run_count=3):
+    """
+    Call run_once at least min_run_count times and until MIN_BENCHMARK_SECONDS pass, after a warm-up call.
+    Return (op_count_per_run, seconds of the fastest run), since slower runs are mostly noise from other processes.
+    """
+    run_once()
+    run_seconds = []
+    start_time = time.perf_counter()
+    while len(run_seconds) < min_run_count or time.perf_counter() - start_time < MIN_BENCHMARK_SECONDS:
+        run_start_time = time.perf_counter()
+        run_once()
+        run_seconds.append(time.perf_counter() - run_start_time)
+    return op_count_per_run, min(run_seconds)
+
+
+"""benchmarks, each returns (op count, seconds spent on the ops)"""
+
+
+def benchmark_calculate_combination_index(problem_tuple, which_int_set):
+    total_num_count, num_count_in_ticket, _, _ = problem_tuple
+    combos = list(islice(combinations(range(total_num_count), num_count_in_ticket), 100_000))
+
+    def run_once():
+        for combo in combos:
+            calculate_combination_index(combo, total_num_count)
+    return time_repeatedly(run_once, len(combos))
+
+
+def benchmark_generate_combination_by_index(problem_tuple, which_int_set):
+    total_num_count, num_count_in_ticket, _, _ = problem_tuple
+    total_ticket_count = math.comb(total_num_count, num_count_in_ticket)
+    combo_indices = range(0, total_ticket_count, max(1, total_ticket_count // 100_000))
+
+    def run_once():
+        for combo_index in combo_indices:
+            generate_combination_by_index(combo_index, total_num_count, num_count_in_ticket)
+    return time_repeatedly(run_once, len(combo_indices))
+
+
+def benchmark_generate_covered_draws(problem_tuple, which_int_set):
+    lpc = LotteryProblemWithCache(*problem_tuple, which_int_set=which_int_set)
+    ticket_indices = get_random_ticket_indices(lpc, min(20, 10_000_000 // lpc.total_draw_count + 1))
+
+    def run_once():
+        for ticket_index in ticket_indices:
+            lpc.generate_covered_draws(ticket_index)
+    return time_repeatedly(run_once, len(ticket_indices))
+
+
+def benchmark_cache_covered_draws(problem_tuple, which_int_set):
+    lpc = LotteryProblemWithCache(*problem_tuple, which_int_set=which_int_set)
+    start_time = time.perf_counter()
+    lpc.cache_covered_draws()
+    return lpc.total_ticket_count, time.perf_counter() - start_time
+
+
+def get_verify_coverage_ticket_indices(lpc, problem_tuple):
+    ticket_count = SCRIPT_TICKET_COUNTS.get(problem_tuple, math.ceil(lpc.solution_size_lower_bound) * 2)
+    return get_random_ticket_indices(lpc, ticket_count)
+
+
+def benchmark_verify_coverage(problem_tuple, which_int_set):
+    # verify_coverage would take the shadow path since nothing is cached, so call the draw set path directly
+    lpc = LotteryProblemWithCache(*problem_tuple, which_int_set=which_int_set)
+    ticket_indices = get_verify_coverage_ticket_indices(lpc, problem_tuple)
+    verifier = LotteryProblemVerifier(lpc)
+    return time_repeatedly(
+        lambda: verifier.verify_coverage_draw_sets(ticket_indices, print_info=False), len(ticket_indices)
+    )
+
+
+def benchmark_verify_coverage_shadow(problem_tuple, which_int_set):
+    lpc = LotteryProblemWithCache(*problem_tuple)
+    ticket_indices = get_verify_coverage_ticket_indices(lpc, problem_tuple)
+    verifier = LotteryProblemVerifier(lpc)
+    return time_repeatedly(
+        lambda: verifier.verify_coverage_shadow(ticket_indices, print_info=False), len(ticket_indices)
+    )
+
+
+def get_cases(full=False):
+    """Return the list of (benchmark name, problem tuple, which_int_set) to run."""
+    problems = SCALED_DOWN_PROBLEMS + [
+        problem_tuple for problem_tuple in SCRIPT_PROBLEMS if full or problem_tuple not in SLOW_PROBLEMS
+    ]
+    which_int_sets = get_which_int_sets()
+    cases = []
+    for problem_tuple in problems:
+        # ranking doesn't depend on the backend
+        cases.append(("calculate_combination_index", problem_tuple, None))
+        cases.append(("generate_combination_by_index", problem_tuple, None))
+        # the shadow needs no draw set, so it doesn't depend on the backend either
+        cases.append(("verify_coverage_shadow", problem_tuple, None))
+        for which_int_set in which_int_sets:
+            cases.append(("generate_covered_draws", problem_tuple, which_int_set))
+            # caching the covered draws of every ticket only fits in memory for small problems
+            if problem_tuple in SCALED_DOWN_PROBLEMS:
+                cases.append(("cache_covered_draws", problem_tuple, which_int_set))
+            cases.append(("verify_coverage", problem_tuple, which_int_set))
+    return cases
+
+
+def get_case_name(benchmark_name, problem_tuple, which_int_set):
+    return "/".join([benchmark_name, "_".join(map(str, problem_tuple)), which_int_set or "-"])
+
+
+def run_case(benchmark_name, problem_tuple, which_int_set):
+    op_count, seconds = globals()[f"benchmark_{benchmark_name}"](problem_tuple, which_int_set)
+    return {
+        "op_count": op_count,
+        "wall_seconds": seconds,
+        "ops_per_second": op_count / seconds if seconds > 0 else None,
+        "peak_rss_bytes": get_peak_rss_bytes(),
+    }
+
+
+def run_benchmarks(cases):
+    results = {}
+    for benchmark_name, problem_tuple, which_int_set in cases:
+        case_name = get_case_name(benchmark_name, problem_tuple, which_int_set)
+        # a fresh process per case, so that peak RSS is per case
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+            results[case_name] = executor.submit(run_case, benchmark_name, problem_tuple, which_int_set).result()
+        result = results[case_name]
+        peak_rss_mb = result["peak_rss_bytes"] / 2 ** 20 if result["peak_rss_bytes"] is not None else float("nan")
+        print(
+            f"{case_name:55} {result['wall_seconds']:9.3f} s {result['ops_per_second'] or 0:14.1f} ops/s "
+            f"{peak_rss_mb:9.1f} MB"
+        )
+    return results
+
+
+def compare_with_baseline(results, baseline_results, tolerance):
+    """Print the cases slower than the baseline by more than tolerance, and return their names."""
+    regressed_case_names = []
+    for case_name, result in results.items():
+        baseline_result = baseline_results.get(case_name)
+        if baseline_result is None or not baseline_result["ops_per_second"] or not result["ops_per_second"]:
+            continue
+        ratio = result["ops_per_second"] / baseline_result["ops_per_second"]
+        if ratio < 1 - tolerance:
+            regressed_case_names.append(case_name)
+            print(f"REGRESSION {case_name}: {ratio:.2f}x the ops/s of the baseline")
+    return regressed_case_names
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--full", action="store_true", help="also run the slow cases")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="the baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results to the baseline")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.5, help="the allowed slowdown ratio, 0.5 means 50%% fewer ops/s"
+    )
+    args = parser.parse_args()
+
+    results = run_benchmarks(get_cases(args.full))
+    report = {
+        "python": platform.python_implementation() + " " + platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}, run with --update-baseline to create it")
+        return 0
+    with open(args.baseline) as file:
+        baseline_results = json.load(file)["results"]
+    return 1 if compare_with_baseline(results, baseline_results, args.tolerance) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class BoundedLRUCache:
+    """
+    A least-recently-used cache whose values take at most max_bytes in total,
+    as measured by get_size(value).
+    When a new value doesn't fit, the least recently used values are evicted.
+    A value larger than max_bytes is never stored.
+    """
+
+    def __init__(self, max_bytes: int, get_size: Callable[[Any], int]):
+        self.max_bytes = max_bytes
+        self.get_size = get_size
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self.current_bytes = 0
+        self.hit_count = 0
+        self.miss_count = 0
+        self.eviction_count = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the value of key and mark it as recently used, or None if it's not cached."""
+        value = self._entries.get(key)
+        if value is None:
+            self.miss_count += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hit_count += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self.get_size(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        while self.current_bytes + size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.eviction_count += 1
+        self._entries[key] = value
+        self._sizes[key] = size
+        self.current_bytes += size
+
+    def _remove(self, key: Hashable) -> None:
+        del self._entries[key]
+        self.current_bytes -= self._sizes.pop(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._sizes.clear()
+        self.current_bytes = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "entry_count": len(self._entries),
+            "current_bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hit_count": self.hit_count,
+            "miss_count": self.miss_count,
+            "eviction_count": self.eviction_count,
+        }
@@ -1,5 +1,6 @@
-from typing import Tuple
+from typing import Iterator, Optional, Tuple
 import math
+import operator
 
 def calculate_combination_index(combination: Tuple[int, ...], total_numbers: int) -> int:
     """
@@ -69,3 +70,116 @@ def generate_combination_by_index(
                 break
             current_index += combo_count
     return tuple(combination)
+
+def calculate_combination_bitmask(combination: Tuple[int, ...]) -> int:
+    """
+    Return the int whose bit i is set iff i is in combination.
+    The count of numbers shared by two combinations is (mask_1 & mask_2).bit_count().
+    """
+    bitmask = 0
+    for number in combination:
+        bitmask |= 1 << number
+    return bitmask
+
+def yield_revolving_door_swaps(total_numbers: int, combo_length: int) -> Iterator[Tuple[int, int]]:
+    """
+    Enumerate all combinations of combo_length numbers in range(total_numbers) in revolving-door order,
+    where each combination differs from the previous one by swapping one number.
+    The first combination is tuple(range(combo_length)),
+    and (removed_number, added_number) is yielded for each following combination.
+
+    This is Algorithm R of Knuth, TAOCP 7.2.1.3, with c[1] < c[2] < ... < c[combo_length]
+    and the sentinel c[combo_length + 1] = total_numbers.
+    """
+    t = combo_length
+    if t == 0 or t >= total_numbers:
+        return
+    c = [0] + list(range(t)) + [total_numbers]
+    while True:
+        # the easy case only moves c[1]
+        if t % 2 == 1:
+            if c[1] + 1 < c[2]:
+                c[1] += 1
+                yield c[1] - 1, c[1]
+                continue
+            j = 2
+            try_decrease = True
+        else:
+            if c[1] > 0:
+                c[1] -= 1
+                yield c[1] + 1, c[1]
+                continue
+            j = 2
+            try_decrease = False
+        while j <= t:
+            if try_decrease:
+                # here c[j] == c[j - 1] + 1, and c[j] leaves for j - 2
+                if c[j] >= j:
+                    removed_number = c[j]
+                    c[j] = c[j - 1]
+                    c[j - 1] = j - 2
+                    yield removed_number, j - 2
+                    break
+                j += 1
+            else:
+                # here c[j - 1] == j - 2, which leaves for c[j] + 1
+                if c[j] + 1 < c[j + 1]:
+                    c[j - 1] = c[j]
+                    c[j] += 1
+                    yield j - 2, c[j]
+                    break
+                j += 1
+            try_decrease = not try_decrease
+        else:
+            return
+
+class CombinationRankTable:
+    """
+    Maps a sorted combination to its index in list(combinations(range(total_numbers), combo_length)),
+    like a dict built from that list, but with combo_length table lookups
+    and O(total_numbers * combo_length) memory instead of one dict entry per combination.
+
+    The index of a sorted combination c is
+        comb(n, k) - 1 - sum(comb(n - 1 - c[i], k - i) for i in range(k))
+    (see calculate_combination_indices), so self.table[i][num] holds the term of num at position i,
+    with the constant folded into position 0.
+    Like a dict, a combination of the wrong length, out of range or not strictly increasing
+    raises KeyError, is not `in` the table, and get returns the default for it.
+    """
+
+    def __init__(self, total_numbers: int, combo_length: int) -> None:
+        self.total_numbers = total_numbers
+        self.combo_length = combo_length
+        combo_count = math.comb(total_numbers, combo_length)
+        self.table = tuple(
+            tuple(
+                (combo_count - 1 if position == 0 else 0)
+                - math.comb(total_numbers - 1 - number, combo_length - position)
+                for number in range(total_numbers)
+            )
+            for position in range(combo_length)
+        )
+        self._combo_count = combo_count
+
+    def __len__(self) -> int:
+        return self._combo_count
+
+    def __contains__(self, combination: Tuple[int, ...]) -> bool:
+        return (
+            len(combination) == self.combo_length
+            and (not combination or (0 <= combination[0] and combination[-1] < self.total_numbers))
+            and all(map(operator.lt, combination, combination[1:]))
+        )
+
+    def __getitem__(self, combination: Tuple[int, ...]) -> int:
+        if combination not in self:
+            raise KeyError(combination)
+        if not self.combo_length:
+            return 0
+        return sum(map(tuple.__getitem__, self.table, combination))
+
+    def get(self, combination: Tuple[int, ...], default: Optional[int] = None) -> Optional[int]:
+        try:
+            return self[combination]
+        except KeyError:
+            return default
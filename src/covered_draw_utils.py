@@ -0,0 +1,190 @@
+from functools import lru_cache
+from itertools import chain
+from typing import Iterable, Iterator, List, Optional, Tuple
+import heapq
+import math
+
+# [start, stop) of draw indices
+DrawIndexRangeType = Tuple[int, int]
+
+
+@lru_cache(maxsize=None)
+def get_combination_table(total_numbers: int, max_length: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Return a table where table[m][r] == comb(m, r)
+    for m in range(total_numbers + 1) and r in range(max_length + 1).
+    """
+    return tuple(
+        tuple(math.comb(m, r) for r in range(max_length + 1))
+        for m in range(total_numbers + 1)
+    )
+
+
+def _extend_shifted_ranges(
+    ranges: List[DrawIndexRangeType],
+    child_ranges: List[DrawIndexRangeType],
+    shift: int,
+) -> None:
+    """Append child_ranges shifted by shift to ranges, merging adjacent ranges."""
+    if not child_ranges:
+        return
+    first_start, first_stop = child_ranges[0]
+    if ranges and ranges[-1][1] == shift + first_start:
+        ranges[-1] = (ranges[-1][0], shift + first_stop)
+    else:
+        ranges.append((shift + first_start, shift + first_stop))
+    ranges.extend([(shift + a, shift + b) for a, b in child_ranges[1:]])
+
+
+def generate_covered_draw_index_ranges(
+    ticket_combo: Tuple[int, ...],
+    total_numbers: int,
+    draw_length: int,
+    min_matched_count: int,
+    start_index: int = 0,
+    stop_index: Optional[int] = None,
+) -> List[DrawIndexRangeType]:
+    """
+    Return the indices of the draws that share at least min_matched_count numbers
+    with ticket_combo, as sorted, disjoint [start, stop) ranges.
+    A draw index is the index in list(combinations(range(total_numbers), draw_length)).
+    Only the draw indices in range(start_index, stop_index) are returned if given.
+
+    We walk the draws in lexicographic order by choosing the draw numbers one by one.
+    Choosing num after prev, with remaining_length numbers left to choose,
+    skips the draws that choose prev + 1, ..., num - 1 instead, which are
+        comb(n - prev - 1, remaining_length) - comb(n - num, remaining_length)
+    draws (see calculate_combination_index).
+    So the indices are built incrementally from the combination table,
+    and no draw tuple is built, sorted or ranked.
+
+    All the draws sharing a prefix are contiguous in lexicographic order,
+    so once a prefix matches min_matched_count numbers of the ticket,
+    the whole block of draws starting with it is covered and emitted as one range.
+    For the same reason, prefixes whose block is outside [start_index, stop_index)
+    are skipped without being visited.
+
+    The covered draws after a prefix, relative to the first draw after the prefix,
+    only depend on (remaining_length, last number of the prefix, matched numbers still needed),
+    so each such state is solved once and then shifted for every prefix reaching it.
+    """
+    n = total_numbers
+    t = min_matched_count
+    total_draw_count = math.comb(n, draw_length)
+    if stop_index is None or stop_index > total_draw_count:
+        stop_index = total_draw_count
+    start_index = max(start_index, 0)
+    if start_index >= stop_index:
+        return []
+    if t <= 0:
+        return [(start_index, stop_index)]
+
+    comb_table = get_combination_table(n, draw_length)
+    # columns[r][m] == comb(m, r)
+    columns = [[row[r] for row in comb_table] for r in range(draw_length + 1)]
+    ticket_nums = sorted(ticket_combo)
+
+    is_in_ticket = [False] * n
+    for num in ticket_nums:
+        is_in_ticket[num] = True
+    # if we still need `need` numbers of the ticket,
+    # the next number must be less than stop_by_need[need]
+    stop_by_need = [n] + [ticket_nums[-need] + 1 for need in range(1, len(ticket_nums) + 1)]
+
+    def get_next_nums(remaining_length: int, prev: int, need: int) -> Iterable[int]:
+        if need == remaining_length:
+            # every remaining number must be a ticket number
+            return [num for num in ticket_nums if prev < num < stop_by_need[need]]
+        return range(prev + 1, min(stop_by_need[need], n - remaining_length + 1))
+
+    solved = {}
+
+    def solve(remaining_length: int, prev: int, need: int) -> List[DrawIndexRangeType]:
+        """Return the covered draws after the prefix relative to its first draw."""
+        key = (remaining_length, prev, need)
+        if key in solved:
+            return solved[key]
+
+        ranges: List[DrawIndexRangeType] = []
+        column = columns[remaining_length]
+        block_column = columns[remaining_length - 1]
+        skipped_base = column[n - prev - 1]
+        for num in get_next_nums(remaining_length, prev, need):
+            start = skipped_base - column[n - num]
+            child_need = need - is_in_ticket[num]
+            if child_need <= 0:
+                child_ranges = [(0, block_column[n - num - 1])]
+            else:
+                child_ranges = solve(remaining_length - 1, num, child_need)
+            _extend_shifted_ranges(ranges, child_ranges, start)
+
+        solved[key] = ranges
+        return ranges
+
+    def solve_window(
+        remaining_length: int,
+        prev: int,
+        need: int,
+        first_index: int,
+        ranges: List[DrawIndexRangeType],
+    ) -> None:
+        """Append the covered draws after the prefix within the window to ranges."""
+        column = columns[remaining_length]
+        stop = first_index + column[n - prev - 1]
+        if stop <= start_index or first_index >= stop_index:
+            return
+        if need <= 0:
+            _extend_shifted_ranges(ranges, [(max(first_index, start_index), min(stop, stop_index))], 0)
+        elif start_index <= first_index and stop <= stop_index:
+            _extend_shifted_ranges(ranges, solve(remaining_length, prev, need), first_index)
+        else:
+            # the draws after prev + 1, ..., num - 1 are skipped, as in solve
+            for num in get_next_nums(remaining_length, prev, need):
+                solve_window(
+                    remaining_length - 1,
+                    num,
+                    need - is_in_ticket[num],
+                    stop - column[n - num],
+                    ranges,
+                )
+
+    ranges: List[DrawIndexRangeType] = []
+    solve_window(draw_length, -1, t, 0, ranges)
+    return ranges
+
+
+def get_uncovered_draw_index_ranges(
+    covered_draw_index_ranges: Iterable[List[DrawIndexRangeType]],
+    start_index: int,
+    stop_index: int,
+) -> List[DrawIndexRangeType]:
+    """
+    Given several lists of sorted covered draw index ranges, e.g. one list per ticket,
+    return the sorted ranges of the draw indices in [start_index, stop_index) not covered by any of them.
+    """
+    uncovered_ranges: List[DrawIndexRangeType] = []
+    next_uncovered_index = start_index
+    for start, stop in heapq.merge(*covered_draw_index_ranges):
+        if start > next_uncovered_index:
+            uncovered_ranges.append((next_uncovered_index, min(start, stop_index)))
+        next_uncovered_index = max(next_uncovered_index, stop)
+        if next_uncovered_index >= stop_index:
+            break
+    if next_uncovered_index < stop_index:
+        uncovered_ranges.append((next_uncovered_index, stop_index))
+    return [(start, stop) for start, stop in uncovered_ranges if start < stop]
+
+
+def generate_covered_draw_indices(
+    ticket_combo: Tuple[int, ...],
+    total_numbers: int,
+    draw_length: int,
+    min_matched_count: int,
+) -> Iterator[int]:
+    """Yield the indices of the draws covered by ticket_combo in increasing order."""
+    return chain.from_iterable(
+        range(start, stop)
+        for start, stop in generate_covered_draw_index_ranges(
+            ticket_combo, total_numbers, draw_length, min_matched_count
+        )
+    )
@@ -0,0 +1,243 @@
+import multiprocessing
+from array import array
+from itertools import chain, starmap
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional, Tuple
+from combination_index_utils import generate_combination_by_index
+from covered_draw_utils import generate_covered_draw_index_ranges
+
+
+def get_draw_index_typecode(total_draw_count: int) -> str:
+    """Return the array typecode of the smallest unsigned int that can store every draw index."""
+    return "I" if total_draw_count <= 2 ** 32 else "Q"
+
+
+class CoveredDrawsCSR:
+    """
+    The draws covered by each ticket in a compressed sparse row (CSR) layout:
+    the covered draw indices of ticket i are draw_indices[offsets[i]:offsets[i + 1]].
+
+    offsets and draw_indices are typed memoryviews over some buffer,
+    e.g. a memory-mapped file or shared memory,
+    and self[ticket_index] returns a zero-copy memoryview of the covered draw indices.
+    """
+
+    def __init__(self, offsets: memoryview, draw_indices: memoryview):
+        self._offsets = offsets
+        self._draw_indices = draw_indices
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, ticket_index: int) -> memoryview:
+        return self._draw_indices[self._offsets[ticket_index]:self._offsets[ticket_index + 1]]
+
+    def get_memory_size(self) -> int:
+        return self._offsets.nbytes + self._draw_indices.nbytes
+
+    def _release_views(self) -> None:
+        for view in [self._offsets, self._draw_indices]:
+            if view is not None:
+                view.release()
+        self._offsets = None
+        self._draw_indices = None
+
+    def close(self) -> None:
+        """
+        Release the underlying buffer.
+        The memoryviews returned by __getitem__ must not be used afterwards.
+        Raise BufferError if something, e.g. a NumPy array, still exports one of them.
+        """
+        self._release_views()
+
+
+class InMemoryCoveredDrawsCSR(CoveredDrawsCSR):
+    """
+    A CoveredDrawsCSR over two arrays owned by this process:
+        offsets (uint64), draw indices (uint32 or uint64)
+    Each covered draw costs 4 or 8 bytes, compared with about 60 bytes in a NativeIntSet.
+    """
+
+    def __init__(self, offsets: array, draw_indices: array):
+        self.offset_array = offsets
+        self.draw_index_array = draw_indices
+        super().__init__(memoryview(offsets), memoryview(draw_indices))
+
+    @classmethod
+    def create(cls, ticket_count: int, draw_index_count: int, typecode: str) -> "InMemoryCoveredDrawsCSR":
+        # repeating a one-item array allocates the zeroed array once,
+        # while array(typecode, bytes(size)) also holds the bytes, doubling the peak memory
+        return cls(
+            array("Q", [0]) * (ticket_count + 1),
+            array(typecode, [0]) * draw_index_count,
+        )
+
+    def close(self) -> None:
+        self._release_views()
+        self.offset_array = None
+        self.draw_index_array = None
+
+
+class SharedMemoryCoveredDrawsCSR(CoveredDrawsCSR):
+    """
+    A CoveredDrawsCSR stored in one multiprocessing.shared_memory block:
+        offsets (uint64), draw indices (uint32 or uint64)
+    Other processes can attach to it by name with SharedMemoryCoveredDrawsCSR.attach
+    without copying or pickling the covered draws.
+    """
+
+    def __init__(
+        self,
+        shared_memory: SharedMemory,
+        ticket_count: int,
+        draw_index_count: int,
+        typecode: str,
+        is_owner: bool,
+    ):
+        self.shared_memory = shared_memory
+        self.ticket_count = ticket_count
+        self.draw_index_count = draw_index_count
+        self.typecode = typecode
+        self.is_owner = is_owner
+        offsets_size = (ticket_count + 1) * 8
+        draw_indices_size = draw_index_count * array(typecode).itemsize
+        buffer = shared_memory.buf
+        super().__init__(
+            buffer[:offsets_size].cast("Q"),
+            buffer[offsets_size:offsets_size + draw_indices_size].cast(typecode),
+        )
+
+    @classmethod
+    def create(cls, ticket_count: int, draw_index_count: int, typecode: str) -> "SharedMemoryCoveredDrawsCSR":
+        size = (ticket_count + 1) * 8 + draw_index_count * array(typecode).itemsize
+        # SharedMemory doesn't accept size 0
+        shared_memory = SharedMemory(create=True, size=max(size, 1))
+        return cls(shared_memory, ticket_count, draw_index_count, typecode, is_owner=True)
+
+    @classmethod
+    def attach(cls, spec: Tuple[str, int, int, str]) -> "SharedMemoryCoveredDrawsCSR":
+        """Attach to the shared memory described by get_spec() of the owner."""
+        name, ticket_count, draw_index_count, typecode = spec
+        return cls(SharedMemory(name), ticket_count, draw_index_count, typecode, is_owner=False)
+
+    def get_spec(self) -> Tuple[str, int, int, str]:
+        """Return the picklable description needed to attach to this CSR from another process."""
+        return (self.shared_memory.name, self.ticket_count, self.draw_index_count, self.typecode)
+
+    def close(self) -> None:
+        """
+        Detach from the shared memory, and free it if this process created it.
+        The block is unlinked even if detaching raises BufferError because a row is still viewed,
+        so it doesn't leak, and its memory is returned once the last view is gone.
+        """
+        try:
+            self._release_views()
+            self.shared_memory.close()
+        finally:
+            if self.is_owner:
+                self.is_owner = False
+                self.shared_memory.unlink()
+
+
+# the CSR a worker process of build_covered_draws_csr_in_shared_memory writes to
+_worker_csr: Optional[SharedMemoryCoveredDrawsCSR] = None
+
+
+def _init_worker(spec: Tuple[str, int, int, str]) -> None:
+    global _worker_csr
+    _worker_csr = SharedMemoryCoveredDrawsCSR.attach(spec)
+
+
+def _write_covered_draws(args: Tuple[Tuple[int, int, int, int], int, int]) -> int:
+    """Write the covered draws of the tickets in [start_ticket_index, stop_ticket_index) to _worker_csr."""
+    problem_tuple, start_ticket_index, stop_ticket_index = args
+    write_covered_draws_to_csr(_worker_csr, problem_tuple, start_ticket_index, stop_ticket_index)
+    return stop_ticket_index - start_ticket_index
+
+
+def write_fixed_size_offsets(csr: CoveredDrawsCSR, covered_draw_count_per_ticket: int) -> None:
+    """
+    Every ticket covers covered_draw_count_per_ticket draws,
+    so the slot of each ticket is known before its draws are generated.
+    """
+    csr._offsets[:] = array(
+        "Q", range(0, (len(csr) + 1) * covered_draw_count_per_ticket, covered_draw_count_per_ticket)
+    )
+
+
+def write_covered_draws_to_csr(
+    csr: CoveredDrawsCSR,
+    problem_tuple: Tuple[int, int, int, int],
+    start_ticket_index: int,
+    stop_ticket_index: int,
+) -> None:
+    """
+    Write the covered draws of tickets in [start_ticket_index, stop_ticket_index) to their preallocated slots.
+    The covered draws are generated with NumPy if it is available, see generate_covered_draw_index_array.
+    """
+    total_num_count, num_count_in_ticket, num_count_in_draw, min_matched_num_count = problem_tuple
+    try:
+        import numpy as np
+        from numpy_covered_draw_utils import generate_covered_draw_index_array
+    except ImportError:
+        np = None
+    for ticket_index in range(start_ticket_index, stop_ticket_index):
+        ticket_combo = generate_combination_by_index(ticket_index, total_num_count, num_count_in_ticket)
+        if np is not None:
+            np.asarray(csr[ticket_index])[:] = generate_covered_draw_index_array(
+                ticket_combo, total_num_count, num_count_in_draw, min_matched_num_count
+            )
+            continue
+        covered_draw_index_ranges = generate_covered_draw_index_ranges(
+            ticket_combo, total_num_count, num_count_in_draw, min_matched_num_count
+        )
+        csr[ticket_index][:] = array(
+            csr._draw_indices.format, chain.from_iterable(starmap(range, covered_draw_index_ranges))
+        )
+
+
+def build_covered_draws_csr_in_shared_memory(
+    problem_tuple: Tuple[int, int, int, int],
+    total_ticket_count: int,
+    total_draw_count: int,
+    covered_draw_count_per_ticket: int,
+    process_count: Optional[int] = None,
+    chunk_count: Optional[int] = None,
+) -> SharedMemoryCoveredDrawsCSR:
+    """
+    Build the covered draws of every ticket into shared memory with a pool of worker processes.
+
+    The slot of each ticket is known before its draws are generated, see write_fixed_size_offsets.
+    The parent preallocates the whole CSR, and each worker attaches to it by name
+    and writes the covered draws of a range of tickets straight into their slots.
+    Nothing but ticket ranges is pickled between processes.
+    """
+    csr = SharedMemoryCoveredDrawsCSR.create(
+        total_ticket_count,
+        total_ticket_count * covered_draw_count_per_ticket,
+        get_draw_index_typecode(total_draw_count),
+    )
+    write_fixed_size_offsets(csr, covered_draw_count_per_ticket)
+
+    process_count = process_count or multiprocessing.cpu_count()
+    chunk_count = min(chunk_count or process_count * 16, total_ticket_count)
+    chunk_args = [
+        (
+            problem_tuple,
+            total_ticket_count * chunk_index // chunk_count,
+            total_ticket_count * (chunk_index + 1) // chunk_count,
+        )
+        for chunk_index in range(chunk_count)
+    ]
+    try:
+        if process_count == 1:
+            for _, start_ticket_index, stop_ticket_index in chunk_args:
+                write_covered_draws_to_csr(csr, problem_tuple, start_ticket_index, stop_ticket_index)
+        else:
+            with multiprocessing.Pool(process_count, _init_worker, (csr.get_spec(),)) as pool:
+                for _ in pool.imap_unordered(_write_covered_draws, chunk_args):
+                    pass
+    except BaseException:
+        csr.close()
+        raise
+    return csr
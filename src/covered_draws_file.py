@@ -0,0 +1,130 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Iterable, Optional
+from covered_draws_csr import CoveredDrawsCSR, get_draw_index_typecode
+
+# magic, version, itemsize of draw indices, is_big_endian, signature length, ticket count, draw index count
+_HEADER_FORMAT = "<8sIIIIQQ"
+_HEADER_SIZE = struct.calcsize(_HEADER_FORMAT)
+_MAGIC = b"LPCOVDRW"
+_VERSION = 1
+
+
+def _get_padded_size(size: int) -> int:
+    """Round size up to a multiple of 8 so that the array after it is aligned."""
+    return (size + 7) // 8 * 8
+
+
+def write_covered_draws_file(
+    path: str,
+    signature: str,
+    total_draw_count: int,
+    ticket_index_to_covered_draw_indices: Iterable[Iterable[int]],
+) -> None:
+    """
+    Write the draws covered by each ticket to path in a CSR layout:
+        header, signature, draw indices, offsets
+    The covered draw indices of ticket i are draw_indices[offsets[i]:offsets[i + 1]].
+    Draw indices are uint32 or uint64 and offsets are uint64, in the native byte order.
+
+    Tickets are written one by one, so all the covered draws never need to be in memory.
+    The file is written to a temporary path and then renamed,
+    so readers never see a partially written file,
+    and the temporary file is removed if writing fails.
+    """
+    typecode = get_draw_index_typecode(total_draw_count)
+    itemsize = array(typecode).itemsize
+    signature_bytes = signature.encode()
+    offsets = array("Q", [0])
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as file:
+            file.seek(_get_padded_size(_HEADER_SIZE + len(signature_bytes)))
+            for covered_draw_indices in ticket_index_to_covered_draw_indices:
+                covered_draw_indices = array(typecode, covered_draw_indices)
+                covered_draw_indices.tofile(file)
+                offsets.append(offsets[-1] + len(covered_draw_indices))
+
+            draw_indices_end = file.tell()
+            file.write(bytes(_get_padded_size(draw_indices_end) - draw_indices_end))
+            offsets.tofile(file)
+
+            file.seek(0)
+            file.write(struct.pack(
+                _HEADER_FORMAT,
+                _MAGIC,
+                _VERSION,
+                itemsize,
+                sys.byteorder == "big",
+                len(signature_bytes),
+                len(offsets) - 1,
+                offsets[-1],
+            ))
+            file.write(signature_bytes)
+        os.replace(temp_path, path)
+    except BaseException:
+        # e.g. a full disk or an interrupted generator; don't leave the partial file behind
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class CoveredDrawsFile(CoveredDrawsCSR):
+    """
+    A read-only, memory-mapped covered draws file written by write_covered_draws_file.
+
+    covered_draws_file[ticket_index] is a zero-copy memoryview of the covered draw indices,
+    backed by the page cache, so several processes mapping the same file share its memory.
+    """
+
+    def __init__(self, path: str, expected_signature: Optional[str] = None):
+        self.path = path
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._offsets = None
+        self._draw_indices = None
+
+        (
+            magic,
+            version,
+            itemsize,
+            is_big_endian,
+            signature_length,
+            ticket_count,
+            draw_index_count,
+        ) = struct.unpack_from(_HEADER_FORMAT, self._mmap)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a covered draws file of version {_VERSION}.")
+        if is_big_endian != (sys.byteorder == "big"):
+            self.close()
+            raise ValueError(f"{path} was written on a machine with another byte order.")
+        self.signature = self._mmap[_HEADER_SIZE:_HEADER_SIZE + signature_length].decode()
+        if expected_signature is not None and self.signature != expected_signature:
+            self.close()
+            raise ValueError(
+                f"{path} is for problem {self.signature}, not {expected_signature}."
+            )
+
+        draw_indices_start = _get_padded_size(_HEADER_SIZE + signature_length)
+        draw_indices_end = draw_indices_start + draw_index_count * itemsize
+        offsets_start = _get_padded_size(draw_indices_end)
+        offsets_end = offsets_start + (ticket_count + 1) * 8
+
+        buffer = memoryview(self._mmap)
+        super().__init__(
+            buffer[offsets_start:offsets_end].cast("Q"),
+            buffer[draw_indices_start:draw_indices_end].cast("I" if itemsize == 4 else "Q"),
+        )
+        buffer.release()
+
+    def close(self) -> None:
+        """
+        Unmap the file.
+        The memoryviews returned by __getitem__ must not be used afterwards.
+        """
+        self._release_views()
+        self._mmap.close()
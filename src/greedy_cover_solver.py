@@ -0,0 +1,202 @@
+import heapq
+import importlib.util
+import logging
+import random
+from typing import Iterable, List, Optional
+from lottery_problem_with_cache import LotteryProblemWithCache
+from lottery_data_types import DrawSetType, TicketIndexType
+from bounded_lru_cache import BoundedLRUCache
+
+# problems with more tickets than this choose from a random sample of this many tickets by default
+DEFAULT_CANDIDATE_COUNT = 1_000
+
+
+class _UncoveredDrawSet:
+    """The uncovered draws as a draw set, and the covered draws of a ticket as a draw set."""
+
+    def __init__(self, uncovered_draws: DrawSetType) -> None:
+        self.uncovered_draws = uncovered_draws
+
+    def __len__(self) -> int:
+        return len(self.uncovered_draws)
+
+    def get_uncovered_part(self, covered_draws: DrawSetType) -> DrawSetType:
+        return covered_draws & self.uncovered_draws
+
+    def cover(self, covered_draws: DrawSetType) -> None:
+        self.uncovered_draws.difference_update(covered_draws)
+
+    def get_any(self) -> int:
+        return next(iter(self.uncovered_draws))
+
+
+class _UncoveredDrawArray:
+    """
+    The uncovered draws as a NumPy bool array, and the covered draws of a ticket as an index array,
+    so the uncovered part of the covered draws of a ticket is one vectorized gather
+    instead of a set intersection.
+    """
+
+    def __init__(self, is_uncovered) -> None:
+        import numpy as np
+        self.np = np
+        self.is_uncovered = is_uncovered
+        self.uncovered_count = int(np.count_nonzero(is_uncovered))
+
+    def __len__(self) -> int:
+        return self.uncovered_count
+
+    def get_uncovered_part(self, draw_indices):
+        return draw_indices[self.is_uncovered[draw_indices]]
+
+    def cover(self, draw_indices) -> None:
+        self.uncovered_count -= int(self.np.count_nonzero(self.is_uncovered[draw_indices]))
+        self.is_uncovered[draw_indices] = False
+
+    def get_any(self) -> int:
+        return int(self.np.argmax(self.is_uncovered))
+
+
+def _get_covered_draws_memory_size(covered_draws) -> int:
+    if hasattr(covered_draws, "get_memory_size"):
+        return covered_draws.get_memory_size()
+    return covered_draws.nbytes
+
+
+class GreedyCoverSolver:
+    """
+    Builds a set of tickets covering every draw by repeatedly selecting
+    the ticket that covers the most still-uncovered draws.
+
+    The gain of a ticket only decreases as more draws are covered, so we use lazy greedy:
+    a priority queue keeps an upper bound of each candidate's gain,
+    and only the candidate on top is re-evaluated, until its fresh gain is
+    at least the bound of the next candidate. Most candidates are never re-evaluated.
+    With NumPy, a gain is a count of the uncovered draws among the covered draw indices of the ticket,
+    otherwise it is the size of the intersection of two draw sets,
+    which is a popcount with the bitset backend.
+    The covered draws of candidates are kept in an LRU cache within covered_draws_cache_max_bytes,
+    so re-evaluating a candidate doesn't generate its covered draws again.
+    Covered draws never become uncovered, so only the part still uncovered when a candidate
+    is evaluated is kept, and the cache and the cost of evaluations shrink as the cover grows.
+
+    Evaluating all the tickets of a large problem is expensive,
+    so candidate_ticket_indices may limit the tickets to choose from.
+    It defaults to all the tickets up to DEFAULT_CANDIDATE_COUNT tickets,
+    and to a random sample of DEFAULT_CANDIDATE_COUNT tickets drawn with seed beyond that.
+    More candidates give smaller covers but take longer, since each one is generated at least once,
+    e.g. for (39, 5, 5, 2) with NumPy on one core:
+        300 candidates: 49 tickets in 1.3 s
+        1,000 candidates: 47 tickets in 4 s
+        5,000 candidates: 43 tickets in 25 s
+        10,000 candidates: 44 tickets in 100 s (the covered draws outgrow the 1 GB cache)
+    Pass candidate_ticket_indices to choose another tradeoff.
+    If the candidates can't cover every draw, a ticket containing an uncovered draw
+    is added for each remaining uncovered draw, so the result is always a cover.
+    """
+
+    def __init__(
+        self,
+        lottery_problem_with_cache: LotteryProblemWithCache,
+        candidate_ticket_indices: Optional[Iterable[TicketIndexType]] = None,
+        covered_draws_cache_max_bytes: int = 1 << 30,
+        logger=None,
+        seed=None,
+    ) -> None:
+        self.lpc = lottery_problem_with_cache
+        self.logger = logger or logging.getLogger("GreedyCoverSolver")
+        if candidate_ticket_indices is None:
+            candidate_ticket_indices = range(self.lpc.total_ticket_count)
+            if self.lpc.total_ticket_count > DEFAULT_CANDIDATE_COUNT:
+                candidate_ticket_indices = random.Random(seed).sample(candidate_ticket_indices, DEFAULT_CANDIDATE_COUNT)
+                self.logger.info(
+                    f"choosing from {DEFAULT_CANDIDATE_COUNT} random tickets of {self.lpc.total_ticket_count}"
+                )
+        self.candidate_ticket_indices = list(candidate_ticket_indices)
+        self.use_index_arrays = importlib.util.find_spec("numpy") is not None
+        # covered draws of re-evaluated candidates, within a memory budget
+        self.covered_draws_cache = BoundedLRUCache(covered_draws_cache_max_bytes, _get_covered_draws_memory_size)
+        self.evaluation_count = 0
+
+    def get_covered_draws(self, ticket_index: TicketIndexType):
+        """Return the covered draws of the ticket, as an index array with NumPy and a draw set without."""
+        covered_draws = self.covered_draws_cache.get(ticket_index)
+        if covered_draws is None:
+            covered_draws = self._generate_covered_draws(ticket_index)
+            self.covered_draws_cache.put(ticket_index, covered_draws)
+        return covered_draws
+
+    def _generate_covered_draws(self, ticket_index: TicketIndexType):
+        if not self.use_index_arrays:
+            return self.lpc.get_covered_draws(ticket_index)
+        import numpy as np
+        # a copy, since a row of a covered draws CSR must not outlive it, and uint32 is half the size
+        return self.lpc.get_covered_draw_index_array(ticket_index).astype(
+            np.uint32 if self.lpc.total_draw_count <= 2 ** 32 else np.uint64
+        )
+
+    def _create_uncovered_draws(self, ticket_indices: List[TicketIndexType]):
+        if not self.use_index_arrays:
+            return _UncoveredDrawSet(self.lpc.get_uncovered_draws_of_tickets(ticket_indices))
+        import numpy as np
+        is_uncovered = np.ones(self.lpc.total_draw_count, dtype=bool)
+        for ticket_index in ticket_indices:
+            is_uncovered[self.lpc.get_covered_draw_index_array(ticket_index)] = False
+        return _UncoveredDrawArray(is_uncovered)
+
+    def solve(
+        self,
+        initial_ticket_indices: Iterable[TicketIndexType] = (),
+        print_info=True,
+    ) -> List[TicketIndexType]:
+        """Return a list of tickets covering every draw, starting from initial_ticket_indices."""
+        selected_ticket_indices = list(initial_ticket_indices)
+        uncovered_draws = self._create_uncovered_draws(selected_ticket_indices)
+
+        # (-upper bound of gain, ticket index)
+        heap = [
+            (-self.lpc.covered_draw_count_per_ticket, ticket_index)
+            for ticket_index in self.candidate_ticket_indices
+        ]
+        heapq.heapify(heap)
+
+        while len(uncovered_draws):
+            ticket_index = None
+            while heap:
+                _, candidate_index = heapq.heappop(heap)
+                covered_draws = uncovered_draws.get_uncovered_part(self.get_covered_draws(candidate_index))
+                self.covered_draws_cache.put(candidate_index, covered_draws)
+                gain = len(covered_draws)
+                self.evaluation_count += 1
+                if gain == 0:
+                    # it won't cover anything later, either
+                    continue
+                if not heap or gain >= -heap[0][0]:
+                    ticket_index = candidate_index
+                    break
+                heapq.heappush(heap, (-gain, candidate_index))
+
+            if ticket_index is None:
+                ticket_index = self.get_ticket_covering_draw(uncovered_draws.get_any())
+                covered_draws = self._generate_covered_draws(ticket_index)
+
+            uncovered_draws.cover(covered_draws)
+            selected_ticket_indices.append(ticket_index)
+            if print_info:
+                self.logger.info(
+                    f"select ticket {len(selected_ticket_indices)}: {self.lpc.get_ticket_combo(ticket_index)}, "
+                    f"{len(uncovered_draws)} draws uncovered, {self.evaluation_count} evaluations"
+                )
+
+        return selected_ticket_indices
+
+    def get_ticket_covering_draw(self, draw_index: int) -> TicketIndexType:
+        """Return a ticket sharing min_matched_num_count numbers with the draw."""
+        draw_combo = self.lpc.get_draw_combo(draw_index)
+        ticket_nums = list(draw_combo[:self.lpc.min_matched_num_count])
+        for num in range(self.lpc.total_num_count):
+            if len(ticket_nums) == self.lpc.num_count_in_ticket:
+                break
+            if num not in ticket_nums:
+                ticket_nums.append(num)
+        return self.lpc.get_ticket_index(tuple(sorted(ticket_nums)))
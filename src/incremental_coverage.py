@@ -0,0 +1,115 @@
+from collections import Counter
+from typing import Iterable, List, Optional
+import numpy as np
+from bounded_lru_cache import BoundedLRUCache
+from lottery_problem_with_cache import LotteryProblemWithCache
+from lottery_data_types import TicketIndexType
+
+
+class IncrementalCoverage:
+    """
+    Keeps how many selected tickets cover each draw, so that tickets can be
+    added, removed or swapped without recomputing the coverage from scratch.
+
+    cover_counts[draw_index] is the count of selected tickets covering the draw.
+    It is a uint8 or uint16 array, so it costs 1 or 2 bytes per draw.
+    Each operation costs O(draws covered by the tickets involved).
+    The same ticket may be selected more than once.
+    If draw_indices_cache is given, the covered draw indices of each ticket are generated once
+    and kept in it, which helps when the same tickets are evaluated again and again.
+    Rows of a covered draws CSR are zero-copy views and are never kept,
+    so that the CSR can be closed while this object is alive.
+
+    Requires NumPy.
+    """
+
+    def __init__(
+        self,
+        lottery_problem_with_cache: LotteryProblemWithCache,
+        ticket_indices: Iterable[TicketIndexType] = (),
+        dtype=np.uint16,
+        draw_indices_cache: Optional[BoundedLRUCache] = None,
+    ):
+        self.lpc = lottery_problem_with_cache
+        self.draw_indices_cache = draw_indices_cache
+        self.cover_counts = np.zeros(self.lpc.total_draw_count, dtype=dtype)
+        self.max_cover_count = np.iinfo(dtype).max
+        self.uncovered_count = self.lpc.total_draw_count
+        self.ticket_index_counter = Counter()
+        for ticket_index in ticket_indices:
+            self.add_ticket(ticket_index)
+
+    def get_ticket_indices(self) -> List[TicketIndexType]:
+        return list(self.ticket_index_counter.elements())
+
+    def get_draw_indices(self, ticket_index: TicketIndexType) -> np.ndarray:
+        if self.draw_indices_cache is None or self.lpc.covered_draws_csr is not None:
+            return self.lpc.get_covered_draw_index_array(ticket_index)
+        draw_indices = self.draw_indices_cache.get(ticket_index)
+        if draw_indices is None:
+            draw_indices = self.lpc.get_covered_draw_index_array(ticket_index)
+            self.draw_indices_cache.put(ticket_index, draw_indices)
+        return draw_indices
+
+    def is_solution(self) -> bool:
+        return self.uncovered_count == 0
+
+    def add_ticket(self, ticket_index: TicketIndexType) -> int:
+        """Select the ticket. Return the count of draws that become covered."""
+        draw_indices = self.get_draw_indices(ticket_index)
+        counts = self.cover_counts[draw_indices]
+        if counts.max(initial=0) >= self.max_cover_count:
+            raise OverflowError("A draw is covered by too many tickets for the dtype of cover_counts.")
+        newly_covered_count = int(np.count_nonzero(counts == 0))
+        # the draw indices of a ticket are unique, so fancy indexing increments each draw once
+        self.cover_counts[draw_indices] = counts + 1
+        self.uncovered_count -= newly_covered_count
+        self.ticket_index_counter[ticket_index] += 1
+        return newly_covered_count
+
+    def remove_ticket(self, ticket_index: TicketIndexType) -> int:
+        """Unselect the ticket. Return the count of draws that become uncovered."""
+        if self.ticket_index_counter[ticket_index] <= 0:
+            raise ValueError(f"ticket {ticket_index} is not selected")
+        draw_indices = self.get_draw_indices(ticket_index)
+        counts = self.cover_counts[draw_indices]
+        newly_uncovered_count = int(np.count_nonzero(counts == 1))
+        self.cover_counts[draw_indices] = counts - 1
+        self.uncovered_count += newly_uncovered_count
+        self.ticket_index_counter[ticket_index] -= 1
+        if self.ticket_index_counter[ticket_index] == 0:
+            del self.ticket_index_counter[ticket_index]
+        return newly_uncovered_count
+
+    def get_add_gain(self, ticket_index: TicketIndexType) -> int:
+        """Return the count of draws that adding the ticket would cover, without adding it."""
+        return int(np.count_nonzero(self.cover_counts[self.get_draw_indices(ticket_index)] == 0))
+
+    def get_remove_loss(self, ticket_index: TicketIndexType) -> int:
+        """
+        Return the count of draws that removing the selected ticket would uncover, without removing it.
+        These are the draws covered by this ticket only.
+        """
+        return int(np.count_nonzero(self.cover_counts[self.get_draw_indices(ticket_index)] == 1))
+
+    def get_swap_delta(self, old_ticket_index: TicketIndexType, new_ticket_index: TicketIndexType) -> int:
+        """
+        Return how uncovered_count would change if the selected old ticket was replaced by the new ticket,
+        without changing the selection.
+        """
+        old_draw_indices = self.get_draw_indices(old_ticket_index)
+        new_draw_indices = self.get_draw_indices(new_ticket_index)
+        # draws only covered by the old ticket, unless the new ticket covers them, too
+        only_old_draw_indices = old_draw_indices[self.cover_counts[old_draw_indices] == 1]
+        lost_count = len(only_old_draw_indices) - len(
+            np.intersect1d(only_old_draw_indices, new_draw_indices, assume_unique=True)
+        )
+        gained_count = int(np.count_nonzero(self.cover_counts[new_draw_indices] == 0))
+        return lost_count - gained_count
+
+    def swap_ticket(self, old_ticket_index: TicketIndexType, new_ticket_index: TicketIndexType) -> int:
+        """Replace the selected old ticket by the new ticket. Return the change of uncovered_count."""
+        uncovered_count = self.uncovered_count
+        self.remove_ticket(old_ticket_index)
+        self.add_ticket(new_ticket_index)
+        return self.uncovered_count - uncovered_count
@@ -0,0 +1,118 @@
+import logging
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+try:
+    import resource
+except ImportError:
+    # e.g. on Windows
+    resource = None
+
+
+def get_rss_bytes() -> Optional[int]:
+    """
+    Return the resident set size of this process,
+    or its peak if the current one isn't available, or None on platforms without either.
+    """
+    if resource is None:
+        return None
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class Observer:
+    """
+    Receives the progress of long-running phases of LotteryProblemVerifier and LotteryProblemWithCache,
+    e.g. "cache_covered_draws" or "verify_coverage".
+    Every method does nothing, so a subclass only overrides what it needs.
+
+    on_progress is called once per step, e.g. per ticket, in the hot loop,
+    so it must be cheap. get_details returns a description of the current state
+    which may be expensive, e.g. counting uncovered draws, so call it only when it's reported.
+    """
+
+    def on_phase_start(self, phase: str, total_step_count: Optional[int] = None, draws_per_step: int = 0) -> None:
+        pass
+
+    def on_progress(self, phase: str, done_step_count: int, get_details: Optional[Callable[[], str]] = None) -> None:
+        pass
+
+    def on_phase_end(self, phase: str, done_step_count: int) -> None:
+        pass
+
+
+class PhaseTimer(Observer):
+    """Records the time, the step count and the RSS at the end of each phase."""
+
+    def __init__(self) -> None:
+        self.phase_seconds: Dict[str, float] = {}
+        self.phase_step_counts: Dict[str, int] = {}
+        self.phase_end_rss_bytes: Dict[str, Optional[int]] = {}
+        self._start_times: Dict[str, float] = {}
+
+    def on_phase_start(self, phase, total_step_count=None, draws_per_step=0):
+        self._start_times[phase] = time.perf_counter()
+
+    def on_phase_end(self, phase, done_step_count):
+        self.phase_seconds[phase] = self.phase_seconds.get(phase, 0.0) + time.perf_counter() - self._start_times.pop(phase)
+        self.phase_step_counts[phase] = self.phase_step_counts.get(phase, 0) + done_step_count
+        self.phase_end_rss_bytes[phase] = get_rss_bytes()
+
+
+class ProgressReporter(Observer):
+    """
+    Logs the progress of each phase at most once per interval seconds:
+    steps done, steps/s, draws/s, ETA, RSS and the details of the caller.
+    """
+
+    def __init__(self, logger=None, interval: float = 10.0) -> None:
+        self.logger = logger or logging.getLogger("ProgressReporter")
+        self.interval = interval
+        self._phases: Dict[str, List] = {}
+
+    def on_phase_start(self, phase, total_step_count=None, draws_per_step=0):
+        start_time = time.perf_counter()
+        # start time, next report time, total step count, draws per step
+        self._phases[phase] = [start_time, start_time + self.interval, total_step_count, draws_per_step]
+
+    def on_progress(self, phase, done_step_count, get_details=None):
+        phase_state = self._phases[phase]
+        now = time.perf_counter()
+        if now < phase_state[1]:
+            return
+        phase_state[1] = now + self.interval
+        self.logger.info(self._format(phase, done_step_count, now, get_details))
+
+    def on_phase_end(self, phase, done_step_count):
+        start_time, _, _, _ = self._phases[phase]
+        self.logger.info(
+            f"{phase} done: {done_step_count} steps in {time.perf_counter() - start_time:.2f} s"
+            + self._format_rss()
+        )
+        del self._phases[phase]
+
+    def _format(self, phase, done_step_count, now, get_details) -> str:
+        start_time, _, total_step_count, draws_per_step = self._phases[phase]
+        elapsed_seconds = now - start_time
+        step_rate = done_step_count / elapsed_seconds if elapsed_seconds > 0 else 0.0
+        message = f"{phase}: {done_step_count}"
+        if total_step_count:
+            message += f" / {total_step_count} ({done_step_count / total_step_count * 100:.1f}%)"
+        message += f", {step_rate:.1f} steps/s"
+        if draws_per_step:
+            message += f", {step_rate * draws_per_step:.0f} draws/s"
+        if total_step_count and step_rate > 0:
+            message += f", ETA {(total_step_count - done_step_count) / step_rate:.0f} s"
+        message += self._format_rss()
+        if get_details is not None:
+            message += f", {get_details()}"
+        return message
+
+    def _format_rss(self) -> str:
+        rss_bytes = get_rss_bytes()
+        return f", RSS {rss_bytes / 2 ** 20:.0f} MB" if rss_bytes is not None else ""
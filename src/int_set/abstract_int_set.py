@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Iterable
+from itertools import chain, starmap
+from typing import Iterable, Iterator, Sequence, Set, Tuple
 
 
 class AbstractIntSet(ABC):
@@ -12,14 +13,35 @@ class AbstractIntSet(ABC):
     def __init__(self, max_size: int, data: Iterable[int] = ()):
         pass
 
+    @classmethod
+    def from_ranges(cls, max_size: int, ranges: Iterable[Tuple[int, int]]) -> "AbstractIntSet":
+        """
+        Create a set from disjoint [start, stop) ranges of items.
+        Subclasses may override this to fill each range at once.
+        """
+        return cls(max_size, chain.from_iterable(starmap(range, ranges)))
+
     @abstractmethod
     def __len__(self) -> int:
         pass
 
+    @abstractmethod
+    def __iter__(self) -> Iterator[int]:
+        pass
+
+    @abstractmethod
+    def get_memory_size(self) -> int:
+        """Return the approximate count of bytes used by the set."""
+        pass
+
     @abstractmethod
     def is_full(self) -> bool:
         pass
 
+    @abstractmethod
+    def get_items(self) -> Set[int]:
+        pass
+
     @abstractmethod
     def add(self, item: int) -> None:
         pass
@@ -39,3 +61,31 @@ class AbstractIntSet(ABC):
     @abstractmethod
     def difference_update(self, another_set: "AbstractIntSet") -> None:
         pass
+
+    def update_sorted_items(self, items: Sequence[int]) -> None:
+        """
+        Add the sorted items, e.g. a zero-copy view of a CoveredDrawsCSR row,
+        without the caller creating a set of them first.
+        Subclasses may override this to scatter the items at once.
+        """
+        self.update(self.__class__(self.max_size, items))
+
+    def difference_update_sorted_items(self, items: Sequence[int]) -> None:
+        """Remove the sorted items. See update_sorted_items."""
+        self.difference_update(self.__class__(self.max_size, items))
+
+    @abstractmethod
+    def intersection(self, another_set: "AbstractIntSet") -> "AbstractIntSet":
+        pass
+
+    @abstractmethod
+    def intersection_update(self, another_set: "AbstractIntSet") -> None:
+        pass
+
+    @abstractmethod
+    def negation(self) -> "AbstractIntSet":
+        pass
+
+    @abstractmethod
+    def negation_update(self) -> None:
+        pass
@@ -1,4 +1,5 @@
-from typing import Iterable, List, Set
+import sys
+from typing import Iterable, List, Sequence, Set
 from abstract_int_set import AbstractIntSet
 
 
@@ -41,6 +42,10 @@ class NativeIntSet(AbstractIntSet):
         # Return an iterator over the items in the set
         return iter(self.data)
 
+    def get_memory_size(self) -> int:
+        # the hash table plus one int object per item
+        return sys.getsizeof(self.data) + len(self.data) * sys.getsizeof(self.max_size)
+
     def is_full(self) -> bool:
         return len(self.data) == self.max_size
 
@@ -59,6 +64,12 @@ class NativeIntSet(AbstractIntSet):
     def update(self, another_set: "NativeIntSet") -> None:
         self.data.update(another_set.data)
 
+    def update_sorted_items(self, items: Sequence[int]) -> None:
+        self.data.update(items)
+
+    def difference_update_sorted_items(self, items: Sequence[int]) -> None:
+        self.data.difference_update(items)
+
     def difference(self, another_set: "NativeIntSet") -> "NativeIntSet":
         result_set = NativeIntSet(self.max_size)
         result_set.data = self.data.difference(another_set.data)
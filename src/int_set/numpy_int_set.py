@@ -1,24 +1,52 @@
 import numpy as np
-from typing import Iterable
+from typing import Iterable, Iterator, Sequence, Set, Tuple
 from abstract_int_set import AbstractIntSet
 
 
 class NumpyIntSet(AbstractIntSet):
     """
     Use Numpy array as a set that stores only integers in range(max_size).
+
+    In-place operations write into the existing array with `out=`,
+    so updating a set in a hot loop does not allocate a new array.
     """
     def __init__(self, max_size: int, data: Iterable[int] = ()):
         self.array = np.zeros(max_size, dtype=bool)
-        for item in data:
-            self.array[item] = True
+        self.array[self._to_index_array(data)] = True
         self.max_size = max_size
 
+    @classmethod
+    def from_ranges(cls, max_size: int, ranges: Iterable[Tuple[int, int]]) -> "NumpyIntSet":
+        """
+        Create a set from disjoint [start, stop) ranges of items.
+        Each range is filled with one slice assignment.
+        """
+        result_set = cls(max_size)
+        for start, stop in ranges:
+            result_set.array[start:stop] = True
+        return result_set
+
+    @staticmethod
+    def _to_index_array(data: Iterable[int]) -> np.ndarray:
+        if isinstance(data, (np.ndarray, memoryview)):
+            return np.asarray(data)
+        if isinstance(data, (list, tuple, range)):
+            return np.asarray(data, dtype=np.intp)
+        return np.fromiter(data, dtype=np.intp)
+
+    def _create(self, array: np.ndarray) -> "NumpyIntSet":
+        """Create a set of the same max_size that owns array."""
+        result_set = NumpyIntSet.__new__(NumpyIntSet)
+        result_set.max_size = self.max_size
+        result_set.array = array
+        return result_set
+
     def __len__(self) -> int:
-        return np.sum(self.array)
+        return int(np.count_nonzero(self.array))
 
     def __bool__(self):
         """Return False if the set is empty, True otherwise"""
-        return not np.any(self.array)
+        return bool(self.array.any())
 
     def __sub__(self, another_set):
         return self.difference(another_set)
@@ -29,32 +57,56 @@ class NumpyIntSet(AbstractIntSet):
     def __or__(self, another_set):
         return self.union(another_set)
 
+    def __iter__(self) -> Iterator[int]:
+        return iter(np.flatnonzero(self.array).tolist())
+
+    def get_memory_size(self) -> int:
+        return self.array.nbytes
+
     def is_full(self) -> bool:
-        return np.all(self.array)
+        return bool(self.array.all())
+
+    def get_items(self) -> Set[int]:
+        return set(np.flatnonzero(self.array).tolist())
+
+    def get_index_array(self) -> np.ndarray:
+        """Return the sorted items as an index array."""
+        return np.flatnonzero(self.array)
 
     def add(self, item: int) -> None:
         self.array[item] = True
 
     def union(self, another_set: 'NumpyIntSet') -> 'NumpyIntSet':
-        result_set = NumpyIntSet(self.max_size)
-        result_set.array = np.bitwise_or(self.array, another_set.array)
-        return result_set
+        return self._create(np.bitwise_or(self.array, another_set.array))
 
     def update(self, another_set: 'NumpyIntSet') -> None:
-        self.array = np.bitwise_or(self.array, another_set.array)
+        np.bitwise_or(self.array, another_set.array, out=self.array)
+
+    def update_sorted_items(self, items: Sequence[int]) -> None:
+        """Scatter the items into the array, reading a memoryview or an array without copying it."""
+        self.array[self._to_index_array(items)] = True
+
+    def difference_update_sorted_items(self, items: Sequence[int]) -> None:
+        self.array[self._to_index_array(items)] = False
 
     def difference(self, another_set: 'NumpyIntSet') -> 'NumpyIntSet':
-        result_set = NumpyIntSet(self.max_size)
-        result_set.array = np.bitwise_and(self.array, np.bitwise_not(another_set.array))
-        return result_set
+        # for booleans, a & ~b == a > b, which needs no temporary array
+        return self._create(np.greater(self.array, another_set.array))
 
     def difference_update(self, another_set: 'NumpyIntSet') -> None:
-        self.array = np.bitwise_and(self.array, np.bitwise_not(another_set.array))
+        np.greater(self.array, another_set.array, out=self.array)
 
     def intersection(self, another_set: "NumpyIntSet") -> "NumpyIntSet":
-        result_set = NumpyIntSet(self.max_size)
-        result_set.array = np.bitwise_and(self.array, another_set.array)
-        return result_set
+        return self._create(np.bitwise_and(self.array, another_set.array))
 
     def intersection_update(self, another_set: "NumpyIntSet") -> None:
-        self.array = np.bitwise_and(self.array, another_set.array)
+        np.bitwise_and(self.array, another_set.array, out=self.array)
+
+    def negation(self) -> "NumpyIntSet":
+        """
+        Return a new set that contains all the items not in this set.
+        """
+        return self._create(np.logical_not(self.array))
+
+    def negation_update(self) -> None:
+        np.logical_not(self.array, out=self.array)
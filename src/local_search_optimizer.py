@@ -0,0 +1,230 @@
+import logging
+import math
+import random
+import time
+from typing import Callable, Iterable, List, NamedTuple, Optional
+import numpy as np
+from bounded_lru_cache import BoundedLRUCache
+from combination_index_utils import calculate_combination_index
+from incremental_coverage import IncrementalCoverage
+from lottery_bounds import get_solution_size_lower_bound
+from lottery_problem_with_cache import LotteryProblemWithCache
+from lottery_data_types import TicketIndexType
+
+
+class LocalSearchResult(NamedTuple):
+    """The best ticket set found by a local search and how much work it took."""
+    ticket_indices: List[TicketIndexType]
+    uncovered_count: int
+    move_count: int
+    accepted_move_count: int
+    elapsed_seconds: float
+
+    @property
+    def moves_per_second(self) -> float:
+        return self.move_count / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+class LocalSearchOptimizer:
+    """
+    Simulated annealing over sets of a fixed number of tickets,
+    minimizing the count of uncovered draws.
+
+    A move replaces one selected ticket by a neighbor, a ticket differing by one number.
+    Half of the moves are guided: the neighbor takes a number of a random uncovered draw.
+    Moves are scored by IncrementalCoverage.get_swap_delta from the per-draw cover counts,
+    so a move costs O(draws covered by the two tickets) instead of a whole verification.
+    A worse move is accepted with probability exp(-delta / temperature).
+
+    The covered draw indices of evaluated tickets are kept in an LRU cache
+    of at most draw_indices_cache_max_bytes.
+    Requires NumPy.
+    """
+
+    def __init__(
+        self,
+        lottery_problem_with_cache: LotteryProblemWithCache,
+        seed: Optional[int] = None,
+        draw_indices_cache_max_bytes: int = 1 << 30,
+        logger=None,
+    ) -> None:
+        self.lpc = lottery_problem_with_cache
+        self.random = random.Random(seed)
+        self.draw_indices_cache = BoundedLRUCache(
+            draw_indices_cache_max_bytes, lambda draw_indices: draw_indices.nbytes
+        )
+        self.logger = logger or logging.getLogger("LocalSearchOptimizer")
+
+    def get_neighbor(
+        self,
+        ticket_index: TicketIndexType,
+        target_draw_index: Optional[int] = None,
+    ) -> TicketIndexType:
+        """
+        Return a ticket that differs from the given ticket by one number.
+        If target_draw_index is given, the new number is from that draw and the removed number isn't,
+        so the neighbor matches one more number of the draw.
+        """
+        ticket_combo = self.lpc.get_ticket_combo(ticket_index)
+        if target_draw_index is None:
+            removable_nums = ticket_combo
+            addable_nums = [num for num in range(self.lpc.total_num_count) if num not in ticket_combo]
+        else:
+            draw_combo = self.lpc.get_draw_combo(target_draw_index)
+            removable_nums = [num for num in ticket_combo if num not in draw_combo]
+            addable_nums = [num for num in draw_combo if num not in ticket_combo]
+            if not removable_nums or not addable_nums:
+                return self.get_neighbor(ticket_index)
+        old_num = self.random.choice(removable_nums)
+        new_num = self.random.choice(addable_nums)
+        neighbor_combo = tuple(sorted(
+            new_num if num == old_num else num for num in ticket_combo
+        ))
+        return calculate_combination_index(neighbor_combo, self.lpc.total_num_count)
+
+    def anneal(
+        self,
+        ticket_indices: Iterable[TicketIndexType],
+        time_limit: Optional[float] = None,
+        max_move_count: Optional[int] = None,
+        initial_temperature: float = 1.0,
+        cooling_rate: float = 0.9999,
+        min_temperature: float = 0.01,
+        print_info=True,
+        log_interval: float = 10.0,
+        on_progress: Optional[Callable[[int], None]] = None,
+        progress_interval: int = 1000,
+    ) -> LocalSearchResult:
+        """
+        Run simulated annealing on the tickets until every draw is covered,
+        time_limit seconds pass or max_move_count moves are made.
+        Return the ticket set with the fewest uncovered draws seen.
+
+        on_progress, if given, is called with the count of new moves every progress_interval moves
+        and once more at the end, so the counts it receives add up to move_count.
+        """
+        start_time = time.perf_counter()
+        selected_ticket_indices = list(ticket_indices)
+        coverage = IncrementalCoverage(
+            self.lpc, selected_ticket_indices, draw_indices_cache=self.draw_indices_cache
+        )
+        best_ticket_indices = list(selected_ticket_indices)
+        best_uncovered_count = coverage.uncovered_count
+        temperature = initial_temperature
+        move_count = 0
+        accepted_move_count = 0
+        # recomputed after every accepted move, since a swap with delta 0 can still change which draws are uncovered
+        uncovered_draw_indices = None
+        next_log_time = start_time + log_interval
+
+        while coverage.uncovered_count > 0 and selected_ticket_indices:
+            now = time.perf_counter()
+            if time_limit is not None and now - start_time >= time_limit:
+                break
+            if max_move_count is not None and move_count >= max_move_count:
+                break
+            if print_info and now >= next_log_time:
+                self.logger.info(
+                    f"{move_count} moves ({move_count / (now - start_time):.0f}/s), "
+                    f"{coverage.uncovered_count} draws uncovered, best {best_uncovered_count}, "
+                    f"temperature {temperature:.4f}"
+                )
+                next_log_time = now + log_interval
+
+            position = self.random.randrange(len(selected_ticket_indices))
+            old_ticket_index = selected_ticket_indices[position]
+            target_draw_index = None
+            if self.random.random() < 0.5:
+                if uncovered_draw_indices is None:
+                    uncovered_draw_indices = np.flatnonzero(coverage.cover_counts == 0)
+                target_draw_index = int(uncovered_draw_indices[self.random.randrange(len(uncovered_draw_indices))])
+            new_ticket_index = self.get_neighbor(old_ticket_index, target_draw_index)
+            move_count += 1
+            if on_progress is not None and move_count % progress_interval == 0:
+                on_progress(progress_interval)
+
+            delta = coverage.get_swap_delta(old_ticket_index, new_ticket_index)
+            if delta <= 0 or self.random.random() < math.exp(-delta / temperature):
+                coverage.swap_ticket(old_ticket_index, new_ticket_index)
+                selected_ticket_indices[position] = new_ticket_index
+                accepted_move_count += 1
+                uncovered_draw_indices = None
+                if coverage.uncovered_count < best_uncovered_count:
+                    best_ticket_indices = list(selected_ticket_indices)
+                    best_uncovered_count = coverage.uncovered_count
+            temperature = max(temperature * cooling_rate, min_temperature)
+
+        if on_progress is not None and move_count % progress_interval:
+            on_progress(move_count % progress_interval)
+        result = LocalSearchResult(
+            ticket_indices=best_ticket_indices,
+            uncovered_count=best_uncovered_count,
+            move_count=move_count,
+            accepted_move_count=accepted_move_count,
+            elapsed_seconds=time.perf_counter() - start_time,
+        )
+        if print_info:
+            self.logger.info(
+                f"annealed {len(best_ticket_indices)} tickets: {result.uncovered_count} draws uncovered, "
+                f"{result.move_count} moves ({result.moves_per_second:.0f}/s), "
+                f"{result.accepted_move_count} accepted"
+            )
+        return result
+
+    def shrink(
+        self,
+        ticket_indices: Iterable[TicketIndexType],
+        time_limit: float,
+        target_ticket_count: Optional[int] = None,
+        print_info=True,
+        **anneal_kwargs,
+    ) -> LocalSearchResult:
+        """
+        Shrink a valid cover: remove the ticket whose removal uncovers the fewest draws,
+        anneal until every draw is covered again, and repeat
+        until target_ticket_count tickets remain or time_limit seconds pass.
+        target_ticket_count defaults to the proven lower bound of get_solution_size_lower_bound,
+        since no smaller cover exists.
+        Return the smallest valid cover found.
+        If ticket_indices is not a cover, it is returned unchanged with its uncovered_count.
+        """
+        start_time = time.perf_counter()
+        if target_ticket_count is None:
+            target_ticket_count = get_solution_size_lower_bound(self.lpc)
+        best_ticket_indices = list(ticket_indices)
+        move_count = 0
+        accepted_move_count = 0
+        coverage = IncrementalCoverage(self.lpc, best_ticket_indices, draw_indices_cache=self.draw_indices_cache)
+        uncovered_count = coverage.uncovered_count
+        if uncovered_count > 0 and print_info:
+            self.logger.warning(f"not shrinking {len(best_ticket_indices)} tickets: {uncovered_count} draws uncovered")
+
+        while uncovered_count == 0 and len(best_ticket_indices) > target_ticket_count:
+            remaining_time = time_limit - (time.perf_counter() - start_time)
+            if remaining_time <= 0:
+                break
+            removed_ticket_index = min(best_ticket_indices, key=coverage.get_remove_loss)
+            ticket_indices = list(best_ticket_indices)
+            ticket_indices.remove(removed_ticket_index)
+
+            result = self.anneal(
+                ticket_indices, time_limit=remaining_time, print_info=print_info, **anneal_kwargs
+            )
+            move_count += result.move_count
+            accepted_move_count += result.accepted_move_count
+            if result.uncovered_count > 0:
+                break
+            best_ticket_indices = result.ticket_indices
+            if print_info:
+                self.logger.info(f"found a cover of {len(best_ticket_indices)} tickets")
+            coverage = IncrementalCoverage(
+                self.lpc, best_ticket_indices, draw_indices_cache=self.draw_indices_cache
+            )
+
+        return LocalSearchResult(
+            ticket_indices=best_ticket_indices,
+            uncovered_count=uncovered_count,
+            move_count=move_count,
+            accepted_move_count=accepted_move_count,
+            elapsed_seconds=time.perf_counter() - start_time,
+        )
@@ -0,0 +1,122 @@
+"""
+Lower bounds of the size of a lottery design, i.e. the number of tickets needed
+so that every draw matches at least t numbers of some ticket.
+n, k, p, t are total_num_count, num_count_in_ticket, num_count_in_draw, min_matched_num_count.
+
+Every bound is proven, so a search can stop as soon as it finds a solution of that size.
+"""
+
+import math
+from fractions import Fraction
+from functools import lru_cache
+from lottery_problem import LotteryProblem
+
+
+def _ceil_div(a: int, b: int) -> int:
+    return -(-a // b)
+
+
+def _count_covered_draws(n: int, k: int, p: int, t: int) -> int:
+    """Return the count of draws a ticket covers."""
+    return sum(math.comb(k, matched) * math.comb(n - k, p - matched) for matched in range(t, min(k, p) + 1))
+
+
+def get_sphere_bound(n: int, k: int, p: int, t: int) -> int:
+    """Every ticket covers the same count of draws, so we need at least all draws / draws per ticket."""
+    return _ceil_div(math.comb(n, p), _count_covered_draws(n, k, p, t))
+
+
+@lru_cache(maxsize=None)
+def get_schonheim_bound(n: int, k: int, t: int) -> int:
+    """
+    The Schönheim bound of a covering design, the (n, k, t, t) lottery problem:
+        C(n, k, t) >= ceil(n / k * C(n - 1, k - 1, t - 1))
+    The tickets containing any number, without that number, form an (n - 1, k - 1, t - 1, t - 1) design,
+    and each ticket contains k numbers.
+    """
+    if t <= 0:
+        return 1
+    return _ceil_div(n * get_schonheim_bound(n - 1, k - 1, t - 1), k)
+
+
+def get_turan_number_upper_bound(n: int, p: int, t: int) -> int:
+    """
+    Return an upper bound of the Turán number ex(n, K_p^t),
+    the max count of t-subsets of n numbers without all the t-subsets of any p numbers.
+    It is exact for t <= 2. For t >= 3, it is the smaller one of
+    the Katona-Nemetz-Simonovits bound, ex(n) <= floor(ex(n - 1) * n / (n - t)) from ex(p) = C(p, t) - 1,
+    and the de Caen bound, C(n, t) * (1 - (n - p + 1) / (n - t + 1) / C(p - 1, t - 1)).
+    """
+    if n < p:
+        return math.comb(n, t)
+    if t <= 0:
+        return 0
+    if t == 1:
+        return p - 1
+    if t == 2:
+        # the complete (p - 1)-partite graph with parts as equal as possible
+        part_count = p - 1
+        part_sizes = [n // part_count + (part_index < n % part_count) for part_index in range(part_count)]
+        return math.comb(n, 2) - sum(math.comb(part_size, 2) for part_size in part_sizes)
+
+    katona_nemetz_simonovits_bound = math.comb(p, t) - 1
+    for m in range(p + 1, n + 1):
+        katona_nemetz_simonovits_bound = katona_nemetz_simonovits_bound * m // (m - t)
+    de_caen_bound = math.floor(
+        math.comb(n, t) * (1 - Fraction(n - p + 1, (n - t + 1) * math.comb(p - 1, t - 1)))
+    )
+    return min(katona_nemetz_simonovits_bound, de_caen_bound)
+
+
+def get_turan_bound(n: int, k: int, p: int, t: int) -> int:
+    """
+    A draw is covered iff it contains a t-subset of a ticket.
+    So the t-subsets not contained in any ticket must not contain all the t-subsets of any draw,
+    and there are at most ex(n, K_p^t) of them.
+    Each ticket contains C(k, t) t-subsets.
+    """
+    if t <= 0:
+        return 1
+    return _ceil_div(math.comb(n, t) - get_turan_number_upper_bound(n, p, t), math.comb(k, t))
+
+
+def get_restriction_bound(n: int, k: int, p: int, t: int) -> int:
+    """
+    For any m numbers S, the tickets with at least t numbers in S, restricted to S,
+    form a (m, k, p, t) design on S, so there are at least L(m, k, p, t) of them.
+    Averaged over every S, a fraction P_m of the tickets has at least t numbers in S,
+    where P_m is the hypergeometric probability, so
+        L(n, k, p, t) >= ceil(L(m, k, p, t) / P_m)
+    for every p <= m < n, with L(m, k, p, t) bounded recursively by get_lower_bound.
+    """
+    lower_bound = 1
+    for m in range(p, n):
+        k_in_subset = min(k, m)
+        ticket_count_with_t_in_subset = sum(
+            math.comb(k, j) * math.comb(n - k, m - j) for j in range(t, k_in_subset + 1)
+        )
+        # ceil(L(m) / (ticket_count_with_t_in_subset / C(n, m)))
+        lower_bound = max(lower_bound, _ceil_div(
+            get_lower_bound(m, k_in_subset, p, t) * math.comb(n, m), ticket_count_with_t_in_subset
+        ))
+    return lower_bound
+
+
+@lru_cache(maxsize=None)
+def get_lower_bound(n: int, k: int, p: int, t: int) -> int:
+    """Return the best lower bound of the size of a (n, k, p, t) lottery design."""
+    if t <= 0 or k >= n:
+        return 1
+    lower_bound = max(get_sphere_bound(n, k, p, t), get_turan_bound(n, k, p, t))
+    if p == t:
+        lower_bound = max(lower_bound, get_schonheim_bound(n, k, t))
+    return max(lower_bound, get_restriction_bound(n, k, p, t))
+
+
+def get_solution_size_lower_bound(lottery: LotteryProblem) -> int:
+    return get_lower_bound(
+        lottery.total_num_count,
+        lottery.num_count_in_ticket,
+        lottery.num_count_in_draw,
+        lottery.min_matched_num_count,
+    )
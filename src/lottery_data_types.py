@@ -1,6 +1,8 @@
-from typing import List, Tuple, Dict, Set, Union
+from typing import List, Tuple, Dict, Set, Union, TYPE_CHECKING
 from int_set.native_int_set import NativeIntSet
-# from int_set.numpy_int_set import NumpyIntSet
+from int_set.bitset_int_set import BitsetIntSet
+if TYPE_CHECKING:
+    from int_set.numpy_int_set import NumpyIntSet
 
 TicketType = Tuple[int, ...]
 TicketComboType = Tuple[int, ...]
@@ -12,5 +14,4 @@ TicketComboSetType = Set[TicketComboType]
 DrawType = Tuple[int, ...]
 DrawComboType = Tuple[int, ...]
 DrawIndexType = int
-# DrawSetType = Union[NativeIntSet, NumpyIntSet]
-DrawSetType = NativeIntSet
+DrawSetType = Union[NativeIntSet, BitsetIntSet, "NumpyIntSet"]
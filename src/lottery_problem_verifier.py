@@ -1,6 +1,86 @@
 import logging
+import math
+import multiprocessing
+import random
+from array import array
 from collections import defaultdict, Counter
+from itertools import chain, islice
+from statistics import NormalDist
+from typing import Iterator, List, NamedTuple, Optional, Tuple
 from lottery_problem_with_cache import LotteryProblemWithCache
+from instrumentation import Observer, ProgressReporter
+from t_subset_shadow import TSubsetShadow
+import ticket_set_analytics
+from lottery_data_types import DrawComboType, DrawIndexType
+from combination_index_utils import (
+    calculate_combination_bitmask,
+    calculate_combination_index,
+    yield_revolving_door_swaps,
+)
+from covered_draw_utils import (
+    DrawIndexRangeType,
+    generate_covered_draw_index_ranges,
+    get_uncovered_draw_index_ranges,
+)
+
+
+def find_uncovered_draw_ranges_in_shard(
+    problem_tuple: Tuple[int, int, int, int],
+    ticket_combos: List[Tuple[int, ...]],
+    start_index: int,
+    stop_index: int,
+) -> List[DrawIndexRangeType]:
+    """
+    Return the ranges of draw indices in [start_index, stop_index)
+    not covered by any of ticket_combos.
+    Only needs plain data, so that it can run in a worker process.
+    """
+    total_num_count, _, num_count_in_draw, min_matched_num_count = problem_tuple
+    return get_uncovered_draw_index_ranges(
+        [
+            generate_covered_draw_index_ranges(
+                ticket_combo,
+                total_num_count,
+                num_count_in_draw,
+                min_matched_num_count,
+                start_index,
+                stop_index,
+            )
+            for ticket_combo in ticket_combos
+        ],
+        start_index,
+        stop_index,
+    )
+
+
+def _find_uncovered_draw_ranges_in_shard(args) -> List[DrawIndexRangeType]:
+    return find_uncovered_draw_ranges_in_shard(*args)
+
+
+class CoverageEstimate(NamedTuple):
+    """The estimated ratio of covered draws and its confidence interval."""
+    coverage: float
+    lower_bound: float
+    upper_bound: float
+    confidence: float
+    sample_count: int
+    uncovered_sample_count: int
+
+
+def get_wilson_interval(
+    success_count: int, sample_count: int, confidence: float
+) -> Tuple[float, float]:
+    """
+    Return the Wilson score interval of a binomial proportion.
+    Unlike the normal approximation, it stays inside [0, 1] and is still meaningful
+    when every sample is a success, which is the common case for nearly valid ticket sets.
+    """
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    ratio = success_count / sample_count
+    denominator = 1 + z * z / sample_count
+    center = (ratio + z * z / (2 * sample_count)) / denominator
+    half_width = z * math.sqrt(ratio * (1 - ratio) / sample_count + z * z / (4 * sample_count * sample_count)) / denominator
+    return max(0.0, center - half_width), min(1.0, center + half_width)
 
 
 class LotteryProblemVerifier:
@@ -19,82 +99,684 @@ class LotteryProblemVerifier:
                 datefmt="%Y-%m-%d %H:%M:%S",
             )
             self.logger = logging.getLogger("LotteryProblemVerifier")
+        self.observers: List[Observer] = []
+
+    def add_observer(self, observer: Observer) -> None:
+        """Report the progress of long-running methods, e.g. verify_coverage, to observer."""
+        self.observers.append(observer)
+
+    def remove_observer(self, observer: Observer) -> None:
+        self.observers.remove(observer)
+
+    def _get_observers(self, print_info: bool, log_interval: float) -> List[Observer]:
+        if print_info:
+            return self.observers + [ProgressReporter(self.logger, log_interval)]
+        return self.observers
 
     # check if selected_ticket_idxs covers all draws
     def verify_coverage(
-        self, ticket_indices, print_info=True
+        self, ticket_indices, print_info=True, log_interval: float = 10.0
     ):
+        """
+        Return the count of draws not covered by the tickets.
+        See verify_coverage_draw_sets if the covered draws are cached,
+        otherwise verify_coverage_shadow, which needs no draw set at all.
+        """
+        if not self.lpc.are_covered_draws_cached and self.lpc.covered_draws_csr is None:
+            return self.verify_coverage_shadow(ticket_indices, print_info, log_interval)
+        return self.verify_coverage_draw_sets(ticket_indices, print_info, log_interval)
+
+    def verify_coverage_draw_sets(
+        self, ticket_indices, print_info=True, log_interval: float = 10.0
+    ) -> int:
+        """
+        Same as verify_coverage, but subtract the covered draw sets of the tickets from a full draw set,
+        generating the ones that aren't cached.
+        With print_info, the progress is logged at most once per log_interval seconds.
+        The uncovered draws are only counted when the progress is logged,
+        since len() of a draw set can cost O(draws).
+        """
         total_draw_count = self.lpc.total_draw_count
         if print_info:
             self.logger.info(f"{total_draw_count} draws in total")
+        observers = self._get_observers(print_info, log_interval)
+        total_ticket_count = len(ticket_indices) if hasattr(ticket_indices, "__len__") else None
 
+        for observer in observers:
+            observer.on_phase_start("create_full_draw_set")
         uncovered_draws = self.lpc.create_full_draw_set()
-        for index, ticket_index in enumerate(ticket_indices):
-            uncovered_draws.difference_update(
-                self.lpc.get_covered_draws(ticket_index)
+        for observer in observers:
+            observer.on_phase_end("create_full_draw_set", 1)
+
+        def get_details():
+            uncovered_draw_count = len(uncovered_draws)
+            return f"{uncovered_draw_count} / {total_draw_count} = {uncovered_draw_count / total_draw_count * 100:.2f}% draws uncovered"
+
+        for observer in observers:
+            observer.on_phase_start(
+                "subtract_covered_draws", total_ticket_count, self.lpc.covered_draw_count_per_ticket
+            )
+        done_ticket_count = 0
+        for ticket_index in ticket_indices:
+            self.lpc.subtract_covered_draws(uncovered_draws, ticket_index)
+            done_ticket_count += 1
+            for observer in observers:
+                observer.on_progress("subtract_covered_draws", done_ticket_count, get_details)
+        for observer in observers:
+            observer.on_phase_end("subtract_covered_draws", done_ticket_count)
+
+        uncovered_draw_count = len(uncovered_draws)
+        if print_info:
+            uncovered_draw_percentage = uncovered_draw_count / total_draw_count * 100
+            self.logger.info(f"{uncovered_draw_count} / {total_draw_count} = {uncovered_draw_percentage:.2f}% draws uncovered")
+        return uncovered_draw_count
+
+    def get_t_subset_shadow(self, ticket_indices) -> TSubsetShadow:
+        return TSubsetShadow(
+            self.lpc.get_tickets_by_indices(ticket_indices),
+            self.lpc.total_num_count,
+            self.lpc.num_count_in_draw,
+            self.lpc.min_matched_num_count,
+        )
+
+    def verify_coverage_shadow(
+        self, ticket_indices, print_info=True, log_interval: float = 10.0
+    ) -> int:
+        """
+        Same as verify_coverage, but mark the t-subsets (t = min_matched_num_count) contained in the tickets,
+        and count the draws none of whose t-subsets is marked. See TSubsetShadow.
+        The memory is O(comb(n, t)) instead of O(draws), e.g. 18,424 flags for (49, 6, 7, 3),
+        so this works for production-size problems.
+        """
+        total_draw_count = self.lpc.total_draw_count
+        if print_info:
+            self.logger.info(f"{total_draw_count} draws in total")
+        observers = self._get_observers(print_info, log_interval)
+
+        for observer in observers:
+            observer.on_phase_start("mark_t_subsets")
+        shadow = self.get_t_subset_shadow(ticket_indices)
+        for observer in observers:
+            observer.on_phase_end("mark_t_subsets", shadow.get_marked_t_subset_count())
+
+        for observer in observers:
+            observer.on_phase_start("count_uncovered_draws")
+        uncovered_draw_count = shadow.count_uncovered_draws()
+        for observer in observers:
+            # every draw is checked, most of them in skipped blocks
+            observer.on_phase_end("count_uncovered_draws", total_draw_count)
+
+        if print_info:
+            uncovered_draw_percentage = uncovered_draw_count / total_draw_count * 100
+            self.logger.info(f"{uncovered_draw_count} / {total_draw_count} = {uncovered_draw_percentage:.2f}% draws uncovered")
+        return uncovered_draw_count
+
+    def find_uncovered_draws_shadow(self, ticket_indices) -> List[int]:
+        """Return the indices of the draws not covered by the tickets in increasing order. See verify_coverage_shadow."""
+        return list(self.get_t_subset_shadow(ticket_indices).yield_uncovered_draw_indices())
+
+    def find_uncovered_draw_ranges_parallel(
+        self,
+        ticket_indices,
+        process_count: Optional[int] = None,
+        shard_count: Optional[int] = None,
+        print_info=True,
+    ) -> List[DrawIndexRangeType]:
+        """
+        Return the sorted [start, stop) ranges of the draw indices not covered by the tickets.
+
+        The draw index space is split into shard_count contiguous shards,
+        which are checked by a pool of process_count worker processes.
+        Each worker only generates the covered draws inside its shard,
+        so the work and the memory are split across workers, too.
+        process_count defaults to the CPU count, and shard_count to 4 shards per process.
+        """
+        total_draw_count = self.lpc.total_draw_count
+        process_count = process_count or multiprocessing.cpu_count()
+        shard_count = min(shard_count or process_count * 4, total_draw_count)
+        problem_tuple = (
+            self.lpc.total_num_count,
+            self.lpc.num_count_in_ticket,
+            self.lpc.num_count_in_draw,
+            self.lpc.min_matched_num_count,
+        )
+        ticket_combos = self.lpc.get_tickets_by_indices(ticket_indices)
+        shard_args = [
+            (
+                problem_tuple,
+                ticket_combos,
+                total_draw_count * shard_index // shard_count,
+                total_draw_count * (shard_index + 1) // shard_count,
+            )
+            for shard_index in range(shard_count)
+        ]
+        if print_info:
+            self.logger.info(f"{total_draw_count} draws in total")
+            self.logger.info(f"checking {shard_count} shards with {process_count} processes")
+
+        if process_count == 1:
+            shard_results = map(_find_uncovered_draw_ranges_in_shard, shard_args)
+            return list(chain.from_iterable(shard_results))
+
+        uncovered_ranges_by_shard = [None] * shard_count
+        with multiprocessing.Pool(process_count) as pool:
+            shard_results = pool.imap(_find_uncovered_draw_ranges_in_shard, shard_args)
+            for shard_index, uncovered_ranges in enumerate(shard_results):
+                uncovered_ranges_by_shard[shard_index] = uncovered_ranges
+                if print_info:
+                    self.logger.info(f"shard {shard_index + 1} / {shard_count} done")
+        return list(chain.from_iterable(uncovered_ranges_by_shard))
+
+    def find_uncovered_draws_parallel(
+        self,
+        ticket_indices,
+        process_count: Optional[int] = None,
+        shard_count: Optional[int] = None,
+        print_info=True,
+    ) -> List[int]:
+        """Return the indices of the draws not covered by the tickets. See find_uncovered_draw_ranges_parallel."""
+        uncovered_ranges = self.find_uncovered_draw_ranges_parallel(
+            ticket_indices, process_count, shard_count, print_info
+        )
+        return [draw_index for start, stop in uncovered_ranges for draw_index in range(start, stop)]
+
+    def verify_coverage_parallel(
+        self,
+        ticket_indices,
+        process_count: Optional[int] = None,
+        shard_count: Optional[int] = None,
+        print_info=True,
+    ) -> int:
+        """
+        Same as verify_coverage, but check shards of the draws in worker processes.
+        Return the count of uncovered draws.
+        """
+        uncovered_ranges = self.find_uncovered_draw_ranges_parallel(
+            ticket_indices, process_count, shard_count, print_info
+        )
+        uncovered_draw_count = sum(stop - start for start, stop in uncovered_ranges)
+        if print_info:
+            total_draw_count = self.lpc.total_draw_count
+            uncovered_draw_percentage = uncovered_draw_count / total_draw_count * 100
+            self.logger.info(f"{uncovered_draw_count} / {total_draw_count} = {uncovered_draw_percentage:.2f}% draws uncovered")
+        return uncovered_draw_count
+
+    def yield_uncovered_draws_streaming(
+        self, ticket_indices, chunk_size: int = 1 << 16, print_info=False
+    ) -> Iterator[int]:
+        """
+        Yield the indices of the draws not covered by the tickets in increasing order.
+
+        Draws are streamed from yield_all_draw_combos in chunks and checked against
+        a bitmask of each ticket, so the memory is O(tickets + chunk_size)
+        and no draw set is created. This works for problems whose draws don't fit in memory,
+        but costs O(tickets) per uncovered draw.
+        The ticket that covered the previous draw is checked first,
+        because consecutive draws share most of their numbers.
+        """
+        total_draw_count = self.lpc.total_draw_count
+        min_matched_num_count = self.lpc.min_matched_num_count
+        ticket_masks = [
+            calculate_combination_bitmask(ticket_combo)
+            for ticket_combo in self.lpc.get_tickets_by_indices(ticket_indices)
+        ]
+        num_masks = [1 << num for num in range(self.lpc.total_num_count)]
+        last_ticket_mask = ticket_masks[0] if ticket_masks else 0
+
+        draw_combos = self.lpc.yield_all_draw_combos()
+        chunk_start = 0
+        while chunk_start < total_draw_count:
+            # numbers in a draw are distinct, so the sum of their masks is the draw mask
+            draw_masks = [sum(map(num_masks.__getitem__, combo)) for combo in islice(draw_combos, chunk_size)]
+            for offset, draw_mask in enumerate(draw_masks):
+                if (draw_mask & last_ticket_mask).bit_count() >= min_matched_num_count:
+                    continue
+                for ticket_mask in ticket_masks:
+                    if (draw_mask & ticket_mask).bit_count() >= min_matched_num_count:
+                        last_ticket_mask = ticket_mask
+                        break
+                else:
+                    yield chunk_start + offset
+            chunk_start += len(draw_masks)
+            if print_info:
+                self.logger.info(f"checked {chunk_start} / {total_draw_count} draws")
+
+    def verify_coverage_streaming(
+        self, ticket_indices, chunk_size: int = 1 << 16, print_info=True
+    ) -> int:
+        """
+        Same as verify_coverage, but stream over the draws instead of creating a full draw set.
+        See yield_uncovered_draws_streaming. Return the count of uncovered draws.
+        """
+        total_draw_count = self.lpc.total_draw_count
+        if print_info:
+            self.logger.info(f"{total_draw_count} draws in total")
+        uncovered_draw_count = sum(
+            1 for _ in self.yield_uncovered_draws_streaming(ticket_indices, chunk_size, print_info)
+        )
+        if print_info:
+            uncovered_draw_percentage = uncovered_draw_count / total_draw_count * 100
+            self.logger.info(f"{uncovered_draw_count} / {total_draw_count} = {uncovered_draw_percentage:.2f}% draws uncovered")
+        return uncovered_draw_count
+
+    def yield_uncovered_draws_revolving_door(
+        self, ticket_indices, print_info=False, log_interval: float = 10.0
+    ) -> Iterator[int]:
+        """
+        Yield the indices of the draws not covered by the tickets, in revolving-door order, not increasing.
+
+        Draws are enumerated by yield_revolving_door_swaps, so consecutive draws differ by one swapped number.
+        The matched number count of a ticket only changes if the ticket contains the removed or the added number,
+        so only those tickets are updated, found with a number -> tickets inverted list,
+        together with the count of tickets matching at least min_matched_num_count numbers.
+        A sweep costs O(draws * k * T / n) instead of O(draws * T * p), and the memory is O(tickets).
+        """
+        total_num_count = self.lpc.total_num_count
+        num_count_in_draw = self.lpc.num_count_in_draw
+        min_matched_num_count = self.lpc.min_matched_num_count
+        ticket_combos = self.lpc.get_tickets_by_indices(ticket_indices)
+        observers = self._get_observers(print_info, log_interval)
+
+        # ticket_positions_by_num[num] are the positions in ticket_combos of the tickets containing num
+        ticket_positions_by_num = [[] for _ in range(total_num_count)]
+        for ticket_position, ticket_combo in enumerate(ticket_combos):
+            for num in ticket_combo:
+                ticket_positions_by_num[num].append(ticket_position)
+
+        # the first draw is tuple(range(num_count_in_draw))
+        draw_mask = (1 << num_count_in_draw) - 1
+        matched_counts = [sum(1 for num in ticket_combo if num < num_count_in_draw) for ticket_combo in ticket_combos]
+        covered_ticket_count = sum(1 for matched_count in matched_counts if matched_count >= min_matched_num_count)
+
+        for observer in observers:
+            observer.on_phase_start("sweep_draws", self.lpc.total_draw_count, 1)
+        if covered_ticket_count == 0:
+            yield calculate_combination_index(tuple(range(num_count_in_draw)), total_num_count)
+        done_draw_count = 1
+        for removed_num, added_num in yield_revolving_door_swaps(total_num_count, num_count_in_draw):
+            for ticket_position in ticket_positions_by_num[removed_num]:
+                if matched_counts[ticket_position] == min_matched_num_count:
+                    covered_ticket_count -= 1
+                matched_counts[ticket_position] -= 1
+            for ticket_position in ticket_positions_by_num[added_num]:
+                matched_counts[ticket_position] += 1
+                if matched_counts[ticket_position] == min_matched_num_count:
+                    covered_ticket_count += 1
+            draw_mask ^= (1 << removed_num) | (1 << added_num)
+            if covered_ticket_count == 0:
+                draw_combo = tuple(num for num in range(total_num_count) if draw_mask >> num & 1)
+                yield calculate_combination_index(draw_combo, total_num_count)
+            done_draw_count += 1
+            if observers and done_draw_count & 0xFFFF == 0:
+                for observer in observers:
+                    observer.on_progress("sweep_draws", done_draw_count)
+        for observer in observers:
+            observer.on_phase_end("sweep_draws", done_draw_count)
+
+    def verify_coverage_revolving_door(
+        self, ticket_indices, print_info=True, log_interval: float = 10.0
+    ) -> int:
+        """
+        Same as verify_coverage, but sweep the draws in revolving-door order with incremental match counts.
+        See yield_uncovered_draws_revolving_door. Return the count of uncovered draws.
+        """
+        total_draw_count = self.lpc.total_draw_count
+        if print_info:
+            self.logger.info(f"{total_draw_count} draws in total")
+        uncovered_draw_count = sum(
+            1 for _ in self.yield_uncovered_draws_revolving_door(ticket_indices, print_info, log_interval)
+        )
+        if print_info:
+            uncovered_draw_percentage = uncovered_draw_count / total_draw_count * 100
+            self.logger.info(f"{uncovered_draw_count} / {total_draw_count} = {uncovered_draw_percentage:.2f}% draws uncovered")
+        return uncovered_draw_count
+
+    def find_uncovered_draw(
+        self,
+        ticket_indices,
+        greedy_attempt_count: int = 100,
+        sample_count: int = 10_000,
+        shard_count: int = 256,
+        seed=None,
+        print_info=True,
+    ) -> Optional[Tuple[DrawIndexType, DrawComboType]]:
+        """
+        Return (draw_index, draw_combo) of some draw not covered by the tickets,
+        or None if the tickets cover every draw.
+
+        Most invalid ticket sets miss many draws, so we try cheap searches first:
+        1. Build draws greedily from numbers that keep every ticket below min_matched_num_count,
+           preferring numbers that appear in few tickets.
+        2. Check uniformly random draws.
+        3. Check the draws shard by shard exhaustively, stopping at the first uncovered draw.
+        Only a valid ticket set pays for the full exhaustive check.
+        """
+        rng = random.Random(seed)
+        ticket_combos = self.lpc.get_tickets_by_indices(ticket_indices)
+        ticket_masks = [calculate_combination_bitmask(ticket_combo) for ticket_combo in ticket_combos]
+
+        for _ in range(greedy_attempt_count):
+            draw_combo = self._build_draw_avoiding_tickets(ticket_combos, rng)
+            if draw_combo is not None:
+                if print_info:
+                    self.logger.info(f"found uncovered draw {draw_combo} greedily")
+                return self.lpc.get_draw_index(draw_combo), draw_combo
+
+        for _ in range(sample_count):
+            draw_index = rng.randrange(self.lpc.total_draw_count)
+            draw_combo = self.lpc.get_draw_combo(draw_index)
+            if not self._is_draw_covered(calculate_combination_bitmask(draw_combo), ticket_masks):
+                if print_info:
+                    self.logger.info(f"found uncovered draw {draw_combo} by random sampling")
+                return draw_index, draw_combo
+
+        if print_info:
+            self.logger.info("no uncovered draw found by sampling, checking all draws")
+        problem_tuple = (
+            self.lpc.total_num_count,
+            self.lpc.num_count_in_ticket,
+            self.lpc.num_count_in_draw,
+            self.lpc.min_matched_num_count,
+        )
+        total_draw_count = self.lpc.total_draw_count
+        shard_count = min(shard_count, total_draw_count)
+        for shard_index in range(shard_count):
+            uncovered_ranges = find_uncovered_draw_ranges_in_shard(
+                problem_tuple,
+                ticket_combos,
+                total_draw_count * shard_index // shard_count,
+                total_draw_count * (shard_index + 1) // shard_count,
+            )
+            if uncovered_ranges:
+                draw_index = uncovered_ranges[0][0]
+                return draw_index, self.lpc.get_draw_combo(draw_index)
+        return None
+
+    def _is_draw_covered(self, draw_mask: int, ticket_masks: List[int]) -> bool:
+        min_matched_num_count = self.lpc.min_matched_num_count
+        return any((draw_mask & ticket_mask).bit_count() >= min_matched_num_count for ticket_mask in ticket_masks)
+
+    def _build_draw_avoiding_tickets(self, ticket_combos, rng: random.Random) -> Optional[DrawComboType]:
+        """
+        Pick the numbers of a draw one by one, so that every ticket keeps matching
+        fewer than min_matched_num_count numbers. Among the allowed numbers, prefer the ones
+        bringing the fewest tickets to the limit, then the ones in the fewest tickets,
+        and break ties randomly.
+        Return the draw, or None if we got stuck.
+        """
+        min_matched_num_count = self.lpc.min_matched_num_count
+        num_to_ticket_ids = [[] for _ in range(self.lpc.total_num_count)]
+        for ticket_id, ticket_combo in enumerate(ticket_combos):
+            for num in ticket_combo:
+                num_to_ticket_ids[num].append(ticket_id)
+        matched_counts = [0] * len(ticket_combos)
+
+        draw_nums = []
+        candidate_nums = set(range(self.lpc.total_num_count))
+        for _ in range(self.lpc.num_count_in_draw):
+            best_key = None
+            best_num = None
+            for num in candidate_nums:
+                ticket_ids = num_to_ticket_ids[num]
+                if any(matched_counts[ticket_id] + 1 >= min_matched_num_count for ticket_id in ticket_ids):
+                    continue
+                limit_count = sum(
+                    1 for ticket_id in ticket_ids
+                    if matched_counts[ticket_id] + 2 >= min_matched_num_count
+                )
+                key = (limit_count, len(ticket_ids), rng.random())
+                if best_key is None or key < best_key:
+                    best_key = key
+                    best_num = num
+            if best_num is None:
+                return None
+            draw_nums.append(best_num)
+            candidate_nums.remove(best_num)
+            for ticket_id in num_to_ticket_ids[best_num]:
+                matched_counts[ticket_id] += 1
+        return tuple(sorted(draw_nums))
+
+    def verify_coverage_fail_fast(self, ticket_indices, seed=None, print_info=True) -> bool:
+        """
+        Return True if the tickets cover every draw.
+        Invalid ticket sets are usually rejected within milliseconds. See find_uncovered_draw.
+        """
+        return self.find_uncovered_draw(ticket_indices, seed=seed, print_info=print_info) is None
+
+    def estimate_coverage(
+        self,
+        ticket_indices,
+        target_half_width: float = 1e-4,
+        confidence: float = 0.95,
+        batch_size: int = 1 << 16,
+        max_sample_count: int = 1 << 26,
+        seed=None,
+        print_info=True,
+        max_matrix_bytes: int = 1 << 26,
+    ) -> CoverageEstimate:
+        """
+        Estimate the ratio of draws covered by the tickets by Monte Carlo sampling.
+
+        Uniformly random draw indices are unranked in batches
+        and checked against the tickets with matrix products,
+        taking at most about max_matrix_bytes per product however many tickets there are.
+        Sampling stops once the confidence interval is narrower than 2 * target_half_width,
+        or after max_sample_count samples, so the cost doesn't depend on total_draw_count.
+        Requires NumPy.
+        """
+        import numpy as np
+        from numpy_coverage_utils import get_number_matrix, is_covered_by_tickets
+
+        if max_sample_count <= 0:
+            raise ValueError("max_sample_count must be positive.")
+        rng = np.random.default_rng(seed)
+        ticket_number_matrix = get_number_matrix(
+            self.lpc.get_ticket_combo_array(list(ticket_indices)), self.lpc.total_num_count
+        )
+        sample_count = 0
+        uncovered_sample_count = 0
+        while sample_count < max_sample_count:
+            current_batch_size = min(batch_size, max_sample_count - sample_count)
+            draw_indices = rng.integers(0, self.lpc.total_draw_count, current_batch_size)
+            is_covered = is_covered_by_tickets(
+                self.lpc.get_draw_combo_array(draw_indices),
+                ticket_number_matrix,
+                self.lpc.min_matched_num_count,
+                max_matrix_bytes,
+            )
+            sample_count += current_batch_size
+            uncovered_sample_count += current_batch_size - int(np.count_nonzero(is_covered))
+            lower_bound, upper_bound = get_wilson_interval(
+                sample_count - uncovered_sample_count, sample_count, confidence
             )
             if print_info:
-                ticket_combo = self.lpc.get_ticket_combo(ticket_index)
-                uncovered_draw_count = len(uncovered_draws)
-                uncovered_draw_percentage = uncovered_draw_count / total_draw_count * 100
-                self.logger.info("----")
-                self.logger.info(f"add ticket {index + 1}: {ticket_combo}")
-                self.logger.info(f"{uncovered_draw_count} / {total_draw_count} = {uncovered_draw_percentage:.2f}% draws uncovered")
+                self.logger.info(
+                    f"{sample_count} samples: {lower_bound * 100:.4f}% ~ {upper_bound * 100:.4f}% draws covered"
+                )
+            if (upper_bound - lower_bound) / 2 <= target_half_width:
+                break
 
-        # print("uncovered draws:", [self.lpc.get_draw_combo(draw_index) for draw_index in uncovered_draws])
-        return len(uncovered_draws)
+        return CoverageEstimate(
+            coverage=(sample_count - uncovered_sample_count) / sample_count,
+            lower_bound=lower_bound,
+            upper_bound=upper_bound,
+            confidence=confidence,
+            sample_count=sample_count,
+            uncovered_sample_count=uncovered_sample_count,
+        )
 
-    # check if selected_ticket_idxs covers all draws
+    def get_cover_counts(self, ticket_indices):
+        """
+        Return a dense uint16 array whose item at draw_index is how many of the tickets cover the draw.
+        It is a NumPy array if NumPy is available, and an array.array otherwise.
+
+        The covered draw indices of each ticket come from get_covered_draw_index_array,
+        so cached covered draws (a CSR, cache_covered_draws or the LRU cache) are reused.
+        Otherwise they are generated with NumPy, about 20 ms per ticket of (49, 6, 7, 3).
+        A chunked matrix product of draws and tickets, as in estimate_coverage, would take
+        about 45 s for the 85,900,584 draws of (49, 6, 7, 3) however few tickets there are,
+        so it only pays off for thousands of tickets.
+        """
+        ticket_indices = list(ticket_indices)
+        try:
+            import numpy as np
+        except ImportError:
+            cover_counts = array("H", bytes(2 * self.lpc.total_draw_count))
+            for ticket_index in ticket_indices:
+                for draw_index in self.lpc.get_covered_draw_indices(ticket_index):
+                    cover_counts[draw_index] += 1
+            return cover_counts
+        cover_counts, _ = self._count_covers(ticket_indices)
+        return cover_counts
+
+    def _count_covers(self, ticket_indices: List[int], record_last_covers: bool = False):
+        """
+        Return (cover_counts, last_covers) as NumPy arrays, see get_cover_counts.
+        If record_last_covers, last_covers[draw_index] is the position in ticket_indices
+        of the last ticket covering the draw, which is the only one for draws covered once,
+        otherwise last_covers is None. Requires NumPy.
+        """
+        import numpy as np
+        if len(ticket_indices) > np.iinfo(np.uint16).max:
+            raise OverflowError("A draw may be covered by too many tickets for uint16 cover counts.")
+        cover_counts = np.zeros(self.lpc.total_draw_count, dtype=np.uint16)
+        last_covers = None
+        if record_last_covers:
+            last_covers = np.zeros(
+                self.lpc.total_draw_count, dtype=np.uint8 if len(ticket_indices) <= 256 else np.uint16
+            )
+        for position, ticket_index in enumerate(ticket_indices):
+            draw_indices = self.lpc.get_covered_draw_index_array(ticket_index)
+            # the covered draw indices of a ticket are unique, so each draw is incremented once
+            cover_counts[draw_indices] += 1
+            if last_covers is not None:
+                last_covers[draw_indices] = position
+        return cover_counts, last_covers
+
+    # check how many times each draw is covered by selected_ticket_idxs
     def check_coverage_distribution(
         self, ticket_indices, print_info=True
     ):
+        """
+        Return a Counter from cover count to how many draws are covered that many times.
+        Draws covered 0 times are counted, too.
+        """
         total_draw_count = self.lpc.total_draw_count
         if print_info:
             print(f"{total_draw_count} draws in total")
 
-        draw_index_to_covered_frequency = defaultdict(int)
-
-        for index, ticket_index in enumerate(ticket_indices):
-            covered_draw_indices = self.lpc.get_covered_draws(ticket_index)
-            for draw_index in covered_draw_indices:
-                draw_index_to_covered_frequency[draw_index] += 1
-
-        frequencies = draw_index_to_covered_frequency.values()
-        frequency_to_occurence_count = Counter(frequencies)
+        cover_counts = self.get_cover_counts(ticket_indices)
+        if isinstance(cover_counts, array):
+            frequency_to_occurence_count = Counter(cover_counts)
+        else:
+            import numpy as np
+            frequency_to_occurence_count = Counter({
+                frequency: occurence_count
+                for frequency, occurence_count in enumerate(np.bincount(cover_counts).tolist())
+                if occurence_count
+            })
         if print_info:
             print("covered_frequency_to_occurence_count:", frequency_to_occurence_count)
-            # print(frequency_to_occurence_count)
 
-        # print([self.lpc.get_draw_combo(draw_index) for draw_index in uncovered_draws])
         return frequency_to_occurence_count
 
+    def _get_ticket_set_analytics(self, ticket_indices):
+        """
+        Return the ticket set analytics module to use, the vectorized one if NumPy is available,
+        and the tickets in the form it takes.
+        """
+        try:
+            import numpy_ticket_set_analytics as analytics
+        except ImportError:
+            return ticket_set_analytics, self.lpc.get_tickets_by_indices(ticket_indices)
+        return analytics, self.lpc.get_ticket_combo_array(list(ticket_indices))
+
     # Count the occurrences of each number
     def count_nums(self, ticket_indices, print_info=True):
-        ticket_combos = self.lpc.get_tickets_by_indices(ticket_indices)
-        counter = Counter([num for combo in ticket_combos for num in combo])
+        analytics, ticket_combos = self._get_ticket_set_analytics(ticket_indices)
+        counter = Counter({
+            num: count
+            for num, count in enumerate(analytics.get_number_frequencies(ticket_combos, self.lpc.total_num_count))
+            if count
+        })
         sorted_counts = sorted(counter.items(), key=lambda item: item[1], reverse=True)
         if print_info:
             for k, v in sorted_counts:
                 print(f"number {k} appears {v} times")
         return counter
 
+    def count_pairs(self, ticket_indices) -> List[List[int]]:
+        """
+        Return a matrix whose item [a][b] is the count of tickets containing both numbers a and b.
+        See ticket_set_analytics.get_pair_frequencies.
+        """
+        analytics, ticket_combos = self._get_ticket_set_analytics(ticket_indices)
+        return analytics.get_pair_frequencies(ticket_combos, self.lpc.total_num_count)
+
+    def evaluate_unique_coverage(self, selected_ticket_idxs) -> List[int]:
+        """
+        Return how many draws are covered by each selected ticket only.
+        A ticket whose unique coverage is 0 can be removed without uncovering any draw.
+
+        With NumPy, this takes one pass over the covered draws of the tickets:
+        the draws covered once are attributed to the last ticket covering them,
+        so the covered draws of each ticket are read only once.
+        """
+        selected_ticket_idxs = list(selected_ticket_idxs)
+        try:
+            import numpy as np
+        except ImportError:
+            cover_counts = self.get_cover_counts(selected_ticket_idxs)
+            return [
+                sum(
+                    1 for draw_idx in self.lpc.get_covered_draw_indices(ticket_idx)
+                    if cover_counts[draw_idx] == 1
+                )
+                for ticket_idx in selected_ticket_idxs
+            ]
+
+        cover_counts, last_covers = self._count_covers(selected_ticket_idxs, record_last_covers=True)
+        return np.bincount(last_covers[cover_counts == 1], minlength=len(selected_ticket_idxs)).tolist()
+
     def evaluate_redundancy(self, selected_ticket_idxs):
-        ticket_redundancies = [0] * len(selected_ticket_idxs)
-        draw_idx_to_cover_times = [0] * self.lpc.total_draw_count
+        """
+        Return how many draws covered by each selected ticket are also covered by another selected ticket.
+        """
+        # every ticket covers the same count of draws
+        return [
+            self.lpc.covered_draw_count_per_ticket - unique_coverage
+            for unique_coverage in self.evaluate_unique_coverage(selected_ticket_idxs)
+        ]
+
+    def prune_redundant_tickets(self, selected_ticket_idxs, print_info=True) -> List[int]:
+        """
+        Greedily remove the tickets that cover no draw on their own, and return the remaining tickets.
+        The remaining tickets cover exactly the same draws.
 
-        # First pass: Identify covered draws and their covering times
-        for ticket_idx in selected_ticket_idxs:
-            for draw_idx in self.lpc.get_covered_draws(ticket_idx):
-                draw_idx_to_cover_times[draw_idx] += 1
+        Removing a ticket never decreases the unique coverage of the others,
+        so only the tickets with no unique coverage at the start need to be checked,
+        each once, against the cover counts updated after every removal.
+        Requires NumPy.
+        """
+        from incremental_coverage import IncrementalCoverage
 
-        # Second pass: Calculate redundancy count for each selected ticket
+        selected_ticket_idxs = list(selected_ticket_idxs)
+        coverage = IncrementalCoverage(self.lpc, selected_ticket_idxs)
+        unique_coverages = [coverage.get_remove_loss(ticket_idx) for ticket_idx in selected_ticket_idxs]
+        is_removed = [False] * len(selected_ticket_idxs)
         for i, ticket_idx in enumerate(selected_ticket_idxs):
-            for draw_idx in self.lpc.get_covered_draws(ticket_idx):
-                # If this draw combination is covered by more than one ticket, it's redundant for this ticket
-                if draw_idx_to_cover_times[draw_idx] > 1:
-                    ticket_redundancies[i] += 1
+            if unique_coverages[i] == 0 and coverage.get_remove_loss(ticket_idx) == 0:
+                coverage.remove_ticket(ticket_idx)
+                is_removed[i] = True
+                if print_info:
+                    self.logger.info(f"remove ticket {ticket_idx}: {self.lpc.get_ticket_combo(ticket_idx)}")
 
-        return ticket_redundancies
+        remaining_ticket_idxs = [
+            ticket_idx for ticket_idx, removed in zip(selected_ticket_idxs, is_removed) if not removed
+        ]
+        if print_info:
+            self.logger.info(f"{len(selected_ticket_idxs)} tickets pruned to {len(remaining_ticket_idxs)} tickets")
+        return remaining_ticket_idxs
 
     def sort_and_print_tickets_by_redundancy(self, selected_ticket_idxs):
         ticket_redundancies = self.evaluate_redundancy(selected_ticket_idxs)
@@ -111,15 +793,18 @@ class LotteryProblemVerifier:
             print(f"Ticket {ticket_idx}, Combo: {self.lpc.get_ticket_combo(ticket_idx)}, Redundancy Count: {redundancy}/{self.lpc.covered_draw_count_per_ticket}")
 
     def count_overlap(self, ticket_indices, print_info=True):
-        ticket_combos = self.lpc.get_tickets_by_indices(ticket_indices)
-
-        counter = defaultdict(int)
-        for i in range(len(ticket_combos)):
-            combo_1 = ticket_combos[i]
-            for j in range(i + 1, len(ticket_combos)):
-                combo_2 = ticket_combos[j]
-                overlap_count = len(set(combo_1) & set(combo_2))
-                counter[overlap_count] += 1
+        """
+        Return a dict from m to the count of ticket pairs sharing exactly m numbers.
+        See ticket_set_analytics.get_overlap_histogram.
+        """
+        analytics, ticket_combos = self._get_ticket_set_analytics(ticket_indices)
+        counter = defaultdict(int, {
+            overlap_count: pair_count
+            for overlap_count, pair_count in enumerate(
+                analytics.get_overlap_histogram(ticket_combos, self.lpc.total_num_count)
+            )
+            if pair_count
+        })
 
         sorted_counts = sorted(counter.items(), key=lambda item: item[0], reverse=True)
         if print_info:
@@ -1,10 +1,37 @@
-from typing import List, Iterable
+import importlib.util
+import os
+from array import array
+from typing import List, Iterable, Optional, Sequence, Tuple, TYPE_CHECKING
 from itertools import combinations
-from lottery_problem import LotteryProblem
+from lottery_problem import LotteryProblem, generate_problem_signature
 from lottery_data_types import TicketComboType, TicketIndexType, DrawComboType, DrawIndexType, DrawSetType
-from combination_index_utils import calculate_combination_index, generate_combination_by_index
+from combination_index_utils import CombinationRankTable, calculate_combination_index, generate_combination_by_index
+from covered_draw_utils import DrawIndexRangeType, generate_covered_draw_index_ranges, generate_covered_draw_indices
+from covered_draws_csr import (
+    CoveredDrawsCSR,
+    InMemoryCoveredDrawsCSR,
+    build_covered_draws_csr_in_shared_memory,
+    get_draw_index_typecode,
+    write_covered_draws_to_csr,
+    write_fixed_size_offsets,
+)
+from covered_draws_file import CoveredDrawsFile, write_covered_draws_file
+from bounded_lru_cache import BoundedLRUCache
+from instrumentation import Observer
 from int_set.native_int_set import NativeIntSet
-# from int_set.numpy_int_set import NumpyIntSet
+from int_set.bitset_int_set import BitsetIntSet
+if TYPE_CHECKING:
+    import numpy as np
+
+# without NumPy, covered draw indices are kept as array.array instead
+_IS_NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+
+
+def _get_covered_draws_memory_size(covered_draws) -> int:
+    """Return the bytes used by a draw set, or by a NumPy or array.array array of draw indices."""
+    if hasattr(covered_draws, "get_memory_size"):
+        return covered_draws.get_memory_size()
+    return memoryview(covered_draws).nbytes
 
 
 # TODO: cache_covered_draws after initial ticket set is given. to reduce memory usage
@@ -17,10 +44,16 @@ class LotteryProblemWithCache(LotteryProblem):
         * When searching for solutions, we may generate unique ticket combos and
           get ticket index from it.
     * self.cache_draw_to_index()
-        * When cache_covered_draws, we generate draws and get the indices of them.
+        * When we convert many draw combos to indices.
     * self.cache_covered_draws()
         * When searching for solutions, we get covered draws of tickets frequently.
         * This may use a lot of spaces.
+    * self.cache_covered_draws_on_disk(cache_dir)
+        * When we verify or search the same problem in many runs or processes.
+        * The covered draws are written to a file once and memory-mapped afterwards.
+    * self.enable_covered_draws_lru_cache(max_bytes)
+        * When we get the covered draws of the same tickets repeatedly,
+          but can't cache the covered draws of all the tickets.
     """
 
     # TODO: can choose to cache all_tickets and all_draws
@@ -36,6 +69,8 @@ class LotteryProblemWithCache(LotteryProblem):
         cache_ticket_to_index: bool = False,
         cache_draw_to_index: bool = False,
         cache_covered_draws: bool = False,
+        covered_draws_cache_dir: Optional[str] = None,
+        covered_draws_lru_cache_max_bytes: Optional[int] = None,
     ):
         super().__init__(
             total_num_count,
@@ -44,10 +79,15 @@ class LotteryProblemWithCache(LotteryProblem):
             min_matched_num_count,
         )
 
+        self.which_int_set = which_int_set
         if which_int_set == "native":
             self.IntSet = NativeIntSet
-        # elif which_int_set == "numpy":
-        #     self.IntSet = NumpyIntSet
+        elif which_int_set == "bitset":
+            self.IntSet = BitsetIntSet
+        elif which_int_set == "numpy":
+            # import lazily so that numpy stays optional, e.g. for PyPy
+            from int_set.numpy_int_set import NumpyIntSet
+            self.IntSet = NumpyIntSet
         else:
             raise ValueError(f"unexpected value of which_int_set {which_int_set}")
 
@@ -57,8 +97,14 @@ class LotteryProblemWithCache(LotteryProblem):
         self.ticket_to_index = None
         self.draw_to_index = None
 
+        # notified of the progress of long-running methods, e.g. cache_covered_draws
+        self.observers: List[Observer] = []
+
         self.are_covered_draws_cached: bool = False
         self.ticket_index_to_covered_draws: List[DrawSetType] = []
+        # covered draws in a compact CSR layout, e.g. a memory-mapped file or shared memory
+        self.covered_draws_csr: Optional[CoveredDrawsCSR] = None
+        self.covered_draws_lru_cache: Optional[BoundedLRUCache] = None
 
         if cache_all_ticket_combos:
             self.cache_all_ticket_combos()
@@ -75,14 +121,34 @@ class LotteryProblemWithCache(LotteryProblem):
         if cache_covered_draws:
             self.cache_covered_draws()
 
+        if covered_draws_cache_dir is not None:
+            self.cache_covered_draws_on_disk(covered_draws_cache_dir)
+
+        if covered_draws_lru_cache_max_bytes is not None:
+            self.enable_covered_draws_lru_cache(covered_draws_lru_cache_max_bytes)
+
     """handle ticket combos"""
 
     def is_all_ticket_combos_cached(self):
         return self.all_ticket_combos is not None
 
     def cache_all_ticket_combos(self):
+        """See generate_all_combos."""
         if not self.is_all_ticket_combos_cached():
-            self.all_ticket_combos = list(self.yield_all_ticket_combos())
+            self.all_ticket_combos = self.generate_all_combos(self.num_count_in_ticket)
+
+    def generate_all_combos(self, combo_length: int) -> Sequence[Tuple[int, ...]]:
+        """
+        Return all the combinations of combo_length numbers in lexicographic order.
+        With NumPy, they are a CombinationArray backed by an (N, combo_length) uint8 array,
+        about 15 times smaller and faster to build than a list of tuples,
+        otherwise they are a list of tuples.
+        """
+        try:
+            from numpy_combination_index_utils import CombinationArray, generate_all_combinations
+        except ImportError:
+            return list(combinations(range(self.total_num_count), combo_length))
+        return CombinationArray(generate_all_combinations(self.total_num_count, combo_length))
 
     def yield_all_ticket_combos(self):
         return combinations(
@@ -107,6 +173,19 @@ class LotteryProblemWithCache(LotteryProblem):
     ) -> List[TicketComboType]:
         return [self.get_ticket_combo(ticket_index) for ticket_index in ticket_indices]
 
+    def get_ticket_combo_array(self, ticket_indices) -> "np.ndarray":
+        """
+        Return the tickets at ticket_indices as an (N, num_count_in_ticket) NumPy array.
+        Much faster than get_tickets_by_indices for large batches. Requires NumPy.
+        """
+        import numpy as np
+        from numpy_combination_index_utils import CombinationArray, generate_combinations_by_indices
+        if isinstance(self.all_ticket_combos, CombinationArray):
+            return self.all_ticket_combos.array[np.asarray(ticket_indices, dtype=np.intp)]
+        return generate_combinations_by_indices(
+            ticket_indices, self.total_num_count, self.num_count_in_ticket
+        )
+
     """handle ticket_to_index"""
 
     def is_ticket_to_index_cached(self) -> bool:
@@ -122,6 +201,14 @@ class LotteryProblemWithCache(LotteryProblem):
     ) -> List[TicketIndexType]:
         return [self.get_ticket_index(ticket_combo) for ticket_combo in tickets]
 
+    def get_ticket_index_array(self, ticket_combos) -> "np.ndarray":
+        """
+        Return the indices of an (N, num_count_in_ticket) array of sorted tickets.
+        Much faster than get_indices_by_tickets for large batches. Requires NumPy.
+        """
+        from numpy_combination_index_utils import calculate_combination_indices
+        return calculate_combination_indices(ticket_combos, self.total_num_count)
+
     def cache_ticket_to_index(self) -> None:
         """
         Call this function to cache ticket_to_index,
@@ -131,11 +218,12 @@ class LotteryProblemWithCache(LotteryProblem):
         if not self.is_ticket_to_index_cached():
             self.ticket_to_index = self.generate_ticket_to_index()
 
-    def generate_ticket_to_index(self):
-        return {
-            ticket: i
-            for i, ticket in enumerate(self.yield_all_ticket_combos())
-        }
+    def generate_ticket_to_index(self) -> CombinationRankTable:
+        """
+        Return a mapping from a ticket to its index.
+        It ranks tickets with table lookups instead of storing one dict entry per ticket.
+        """
+        return CombinationRankTable(self.total_num_count, self.num_count_in_ticket)
 
     def delete_cache_ticket_to_index(self) -> None:
         self.ticket_to_index = None
@@ -146,8 +234,9 @@ class LotteryProblemWithCache(LotteryProblem):
         return self.all_draw_combos is not None
 
     def cache_all_draw_combos(self):
+        """See generate_all_combos."""
         if not self.is_all_draw_combos_cached():
-            self.all_draw_combos = list(self.yield_all_draw_combos())
+            self.all_draw_combos = self.generate_all_combos(self.num_count_in_draw)
 
     def yield_all_draw_combos(self):
         return combinations(
@@ -167,6 +256,19 @@ class LotteryProblemWithCache(LotteryProblem):
     # old interface
     get_draw = get_draw_combo
 
+    def get_draw_combo_array(self, draw_indices) -> "np.ndarray":
+        """
+        Return the draws at draw_indices as an (N, num_count_in_draw) NumPy array.
+        Requires NumPy.
+        """
+        import numpy as np
+        from numpy_combination_index_utils import CombinationArray, generate_combinations_by_indices
+        if isinstance(self.all_draw_combos, CombinationArray):
+            return self.all_draw_combos.array[np.asarray(draw_indices, dtype=np.intp)]
+        return generate_combinations_by_indices(
+            draw_indices, self.total_num_count, self.num_count_in_draw
+        )
+
     def get_draw_combos_of_draw_set(self, draws: DrawSetType):
         return [
             self.get_draw_combo(draw_index)
@@ -181,6 +283,14 @@ class LotteryProblemWithCache(LotteryProblem):
             return self.draw_to_index[draw_combo]
         return calculate_combination_index(draw_combo, self.total_num_count)
 
+    def get_draw_index_array(self, draw_combos) -> "np.ndarray":
+        """
+        Return the indices of an (N, num_count_in_draw) array of sorted draws.
+        Requires NumPy.
+        """
+        from numpy_combination_index_utils import calculate_combination_indices
+        return calculate_combination_indices(draw_combos, self.total_num_count)
+
     def cache_draw_to_index(self) -> None:
         """
         Call this function to cache draw_to_index,
@@ -190,8 +300,9 @@ class LotteryProblemWithCache(LotteryProblem):
         if not self.is_draw_to_index_cached():
             self.draw_to_index = self.generate_draw_to_index()
 
-    def generate_draw_to_index(self):
-        return {draw: i for i, draw in enumerate(self.yield_all_draw_combos())}
+    def generate_draw_to_index(self) -> CombinationRankTable:
+        """Return a mapping from a draw to its index. See generate_ticket_to_index."""
+        return CombinationRankTable(self.total_num_count, self.num_count_in_draw)
 
     def delete_cache_draw_to_index(self) -> None:
         self.draw_to_index = None
@@ -202,7 +313,14 @@ class LotteryProblemWithCache(LotteryProblem):
         self.are_covered_draws_cached = False
         self.ticket_index_to_covered_draws = []
 
-    def cache_covered_draws(self, temp_cache_draw_to_index: bool=True) -> None:
+    def add_observer(self, observer: Observer) -> None:
+        """Report the progress of long-running methods, e.g. cache_covered_draws, to observer."""
+        self.observers.append(observer)
+
+    def remove_observer(self, observer: Observer) -> None:
+        self.observers.remove(observer)
+
+    def cache_covered_draws(self, temp_cache_draw_to_index: bool=False) -> None:
         """
         Generate and store the draws covered by each tickets.
         This makes the searching for solutions much faster.
@@ -210,58 +328,298 @@ class LotteryProblemWithCache(LotteryProblem):
         If the total number of tickets and draws are too large,
         we may not be able to cache all the covered draws for each ticket.
         In that case, this function should not be called.
+
+        temp_cache_draw_to_index is kept for backward compatibility.
+        Covered draws are ranked arithmetically, so draw_to_index is not needed.
         """
         if self.are_covered_draws_cached:
             return
 
-        is_draw_to_index_already_cached = self.is_draw_to_index_cached()
-        # temporarily cache draw_to_index
-        if temp_cache_draw_to_index and not is_draw_to_index_already_cached:
-            self.cache_draw_to_index()
+        observers = self.observers
+        for observer in observers:
+            observer.on_phase_start("cache_covered_draws", self.total_ticket_count, self.covered_draw_count_per_ticket)
+        self.ticket_index_to_covered_draws = []
+        for ticket_index in range(self.total_ticket_count):
+            self.ticket_index_to_covered_draws.append(self.generate_covered_draws(ticket_index))
+            for observer in observers:
+                observer.on_progress("cache_covered_draws", ticket_index + 1)
+        for observer in observers:
+            observer.on_phase_end("cache_covered_draws", self.total_ticket_count)
 
-        self.ticket_index_to_covered_draws = [
-            self.generate_covered_draws(ticket_index)
-            for ticket_index in range(self.total_ticket_count)
-        ]
+        self.are_covered_draws_cached = True
 
-        if temp_cache_draw_to_index and not is_draw_to_index_already_cached:
-            self.delete_cache_draw_to_index()
+    def generate_covered_draw_index_ranges(self, ticket_index: TicketIndexType) -> List[DrawIndexRangeType]:
+        """Return the draws covered by the ticket as sorted, disjoint [start, stop) index ranges."""
+        return generate_covered_draw_index_ranges(
+            self.get_ticket_combo(ticket_index),
+            self.total_num_count,
+            self.num_count_in_draw,
+            self.min_matched_num_count,
+        )
 
-        self.are_covered_draws_cached = True
+    def generate_covered_draw_index_array(self, ticket_index: TicketIndexType) -> "np.ndarray":
+        """
+        Return the sorted indices of the draws covered by the ticket as an int64 NumPy array.
+        Much faster than expanding generate_covered_draw_index_ranges. Requires NumPy.
+        """
+        from numpy_covered_draw_utils import generate_covered_draw_index_array
+        return generate_covered_draw_index_array(
+            self.get_ticket_combo(ticket_index),
+            self.total_num_count,
+            self.num_count_in_draw,
+            self.min_matched_num_count,
+        )
 
     def generate_covered_draws(self, ticket_index: TicketIndexType) -> DrawSetType:
-        ticket_combo = self.get_ticket_combo(ticket_index)
-        max_matched_num_count = min(self.num_count_in_draw, self.num_count_in_ticket)
-        nums_not_in_ticket = list(set(range(self.total_num_count)) - set(ticket_combo))
-        return self.create_draw_set(
-            [
-                self.get_draw_index(tuple(sorted(matched_nums + unmatched_nums)))
-                for matched_num_count in range(
-                    self.min_matched_num_count, max_matched_num_count + 1
-                )
-                for matched_nums in combinations(ticket_combo, matched_num_count)
-                for unmatched_nums in combinations(
-                    nums_not_in_ticket, self.num_count_in_draw - matched_num_count
-                )
-            ]
+        if self.which_int_set == "numpy":
+            # scattering the index array beats filling millions of short ranges one by one
+            return self.create_draw_set(self.generate_covered_draw_index_array(ticket_index))
+        return self.create_draw_set_from_ranges(
+            self.generate_covered_draw_index_ranges(ticket_index)
         )
 
     def get_covered_draws(self, ticket_index: TicketIndexType) -> DrawSetType:
         if self.are_covered_draws_cached:
             return self.ticket_index_to_covered_draws[ticket_index]
+        if self.covered_draws_csr is not None:
+            return self.create_draw_set(self.covered_draws_csr[ticket_index])
+        if self.covered_draws_lru_cache is not None:
+            covered_draws = self.covered_draws_lru_cache.get(ticket_index)
+            if covered_draws is None:
+                covered_draws = self.generate_covered_draws(ticket_index)
+                self.covered_draws_lru_cache.put(ticket_index, covered_draws)
+            return covered_draws
         return self.generate_covered_draws(ticket_index)
 
+    def get_covered_draw_indices(self, ticket_index: TicketIndexType) -> Sequence[DrawIndexType]:
+        """
+        Return the sorted indices of the draws covered by the ticket, without creating a draw set.
+        This is a zero-copy view if the covered draws are cached in a CSR layout,
+        otherwise it's get_covered_draw_index_array with NumPy and an array.array without.
+        Callers must not modify it.
+        """
+        if self.covered_draws_csr is not None:
+            return self.covered_draws_csr[ticket_index]
+        if _IS_NUMPY_AVAILABLE:
+            return self.get_covered_draw_index_array(ticket_index)
+        if self.are_covered_draws_cached:
+            return sorted(self.ticket_index_to_covered_draws[ticket_index])
+        return self._get_lru_cached_draw_indices(
+            ticket_index,
+            lambda: array(get_draw_index_typecode(self.total_draw_count), generate_covered_draw_indices(
+                self.get_ticket_combo(ticket_index),
+                self.total_num_count,
+                self.num_count_in_draw,
+                self.min_matched_num_count,
+            )),
+        )
+
+    def get_covered_draw_index_array(self, ticket_index: TicketIndexType) -> "np.ndarray":
+        """
+        Same as get_covered_draw_indices, but return a NumPy array.
+        This is a zero-copy view if the covered draws are cached in a CSR layout,
+        it's read from the draw set if the covered draws are cached by cache_covered_draws,
+        and it's a read-only array kept in the covered draws LRU cache if it is enabled. Requires NumPy.
+        """
+        import numpy as np
+        if self.covered_draws_csr is not None:
+            return np.asarray(self.covered_draws_csr[ticket_index])
+        if self.are_covered_draws_cached:
+            return self.get_draw_index_array_of_draw_set(self.ticket_index_to_covered_draws[ticket_index])
+        if self.covered_draws_lru_cache is None:
+            return self.generate_covered_draw_index_array(ticket_index)
+
+        def generate() -> np.ndarray:
+            # uint32 halves the bytes of the int64 indices for problems with up to 2 ** 32 draws
+            draw_indices = self.generate_covered_draw_index_array(ticket_index).astype(
+                np.dtype(get_draw_index_typecode(self.total_draw_count))
+            )
+            draw_indices.flags.writeable = False
+            return draw_indices
+
+        return self._get_lru_cached_draw_indices(ticket_index, generate)
+
+    def get_draw_index_array_of_draw_set(self, draw_set: DrawSetType) -> "np.ndarray":
+        """Return the sorted items of the draw set as a NumPy array. Requires NumPy."""
+        import numpy as np
+        if isinstance(draw_set, BitsetIntSet):
+            bits = np.unpackbits(np.frombuffer(draw_set.buffer, dtype=np.uint8), bitorder="little")
+            return np.flatnonzero(bits[:self.total_draw_count])
+        if hasattr(draw_set, "get_index_array"):
+            return draw_set.get_index_array()
+        return np.sort(np.fromiter(draw_set, dtype=np.int64, count=len(draw_set)))
+
+    def _get_lru_cached_draw_indices(self, ticket_index: TicketIndexType, generate):
+        """
+        Return the covered draw indices of the ticket from the covered draws LRU cache,
+        and generate and put them there first on a miss.
+        They are kept under another key than the draw set of get_covered_draws.
+        """
+        if self.covered_draws_lru_cache is None:
+            return generate()
+        key = ("draw_indices", ticket_index)
+        draw_indices = self.covered_draws_lru_cache.get(key)
+        if draw_indices is None:
+            draw_indices = generate()
+            self.covered_draws_lru_cache.put(key, draw_indices)
+        return draw_indices
+
+    """functions that handle the covered draws LRU cache"""
+
+    def enable_covered_draws_lru_cache(self, max_bytes: int) -> None:
+        """
+        Keep the covered draws of recently used tickets, using at most about max_bytes.
+        Unlike cache_covered_draws, only the tickets we actually use are generated and kept.
+        Both the draw sets of get_covered_draws and the index arrays of get_covered_draw_index_array,
+        which the analyses and searches use, share the budget.
+        Callers must not modify the returned draw sets, as with cache_covered_draws.
+        """
+        self.covered_draws_lru_cache = BoundedLRUCache(max_bytes, _get_covered_draws_memory_size)
+
+    def disable_covered_draws_lru_cache(self) -> None:
+        self.covered_draws_lru_cache = None
+
+    """functions that handle the covered draws file"""
+
+    def get_covered_draws_file_path(self, cache_dir: str) -> str:
+        return os.path.join(cache_dir, f"covered_draws_{generate_problem_signature(self).replace(',', '_')}.bin")
+
+    def save_covered_draws_file(self, path: str) -> None:
+        """Generate the draws covered by every ticket and write them to path."""
+        write_covered_draws_file(
+            path,
+            generate_problem_signature(self),
+            self.total_draw_count,
+            (
+                generate_covered_draw_indices(
+                    ticket_combo,
+                    self.total_num_count,
+                    self.num_count_in_draw,
+                    self.min_matched_num_count,
+                )
+                for ticket_combo in self.yield_all_ticket_combos()
+            ),
+        )
+
+    def load_covered_draws_file(self, path: str) -> None:
+        """Memory-map a covered draws file. Raise ValueError if it is for another problem."""
+        self.delete_covered_draws_csr()
+        self.covered_draws_csr = CoveredDrawsFile(path, generate_problem_signature(self))
+
+    def cache_covered_draws_on_disk(self, cache_dir: str) -> None:
+        """
+        Load the covered draws file of this problem from cache_dir,
+        and create it first if it doesn't exist.
+        Only the first run pays for generating the covered draws,
+        and processes loading the same file share its pages in the page cache.
+        """
+        path = self.get_covered_draws_file_path(cache_dir)
+        if not os.path.exists(path):
+            os.makedirs(cache_dir, exist_ok=True)
+            self.save_covered_draws_file(path)
+        self.load_covered_draws_file(path)
+
+    """functions that handle covered draws in a CSR layout"""
+
+    def cache_covered_draws_csr(self, chunk_size: int = 1024) -> None:
+        """
+        Same as cache_covered_draws, but store the covered draws of every ticket
+        in one offsets array and one sorted uint32 (or uint64) draw index array in this process.
+        Uses 4 or 8 bytes per covered draw instead of one draw set per ticket,
+        e.g. about 60 bytes per covered draw for native, so about 15 times larger problems fit in memory.
+        get_covered_draw_indices returns zero-copy views of it,
+        and subtract_covered_draws applies them to a draw set without creating another draw set.
+        """
+        problem_tuple = (
+            self.total_num_count,
+            self.num_count_in_ticket,
+            self.num_count_in_draw,
+            self.min_matched_num_count,
+        )
+        self.delete_covered_draws_csr()
+        csr = InMemoryCoveredDrawsCSR.create(
+            self.total_ticket_count,
+            self.total_ticket_count * self.covered_draw_count_per_ticket,
+            get_draw_index_typecode(self.total_draw_count),
+        )
+        write_fixed_size_offsets(csr, self.covered_draw_count_per_ticket)
+
+        observers = self.observers
+        for observer in observers:
+            observer.on_phase_start("cache_covered_draws_csr", self.total_ticket_count, self.covered_draw_count_per_ticket)
+        for start_ticket_index in range(0, self.total_ticket_count, chunk_size):
+            stop_ticket_index = min(start_ticket_index + chunk_size, self.total_ticket_count)
+            write_covered_draws_to_csr(csr, problem_tuple, start_ticket_index, stop_ticket_index)
+            for observer in observers:
+                observer.on_progress("cache_covered_draws_csr", stop_ticket_index)
+        for observer in observers:
+            observer.on_phase_end("cache_covered_draws_csr", self.total_ticket_count)
+        self.covered_draws_csr = csr
+
+    def cache_covered_draws_parallel(self, process_count: Optional[int] = None) -> None:
+        """
+        Generate the covered draws of every ticket with a pool of worker processes,
+        writing them straight into shared memory in a CSR layout.
+        Uses 4 or 8 bytes per covered draw, and get_covered_draws reads from it afterwards.
+        Other processes can attach to self.covered_draws_csr.get_spec() without copying it.
+        """
+        self.delete_covered_draws_csr()
+        self.covered_draws_csr = build_covered_draws_csr_in_shared_memory(
+            (
+                self.total_num_count,
+                self.num_count_in_ticket,
+                self.num_count_in_draw,
+                self.min_matched_num_count,
+            ),
+            self.total_ticket_count,
+            self.total_draw_count,
+            self.covered_draw_count_per_ticket,
+            process_count,
+        )
+
+    def delete_covered_draws_csr(self) -> None:
+        """
+        Release the covered draws in a CSR layout. A covered draws file itself is kept.
+        The CSR is detached before it is closed,
+        so this problem keeps working even if closing it fails, e.g. with a BufferError
+        because a NumPy array from get_covered_draw_index_array still views a row.
+        """
+        covered_draws_csr = self.covered_draws_csr
+        if covered_draws_csr is not None:
+            self.covered_draws_csr = None
+            covered_draws_csr.close()
+
+    # old interface
+    delete_covered_draws_file = delete_covered_draws_csr
+
+    def add_covered_draws(self, draw_set: DrawSetType, ticket_index: TicketIndexType) -> None:
+        """
+        Same as draw_set.update(self.get_covered_draws(ticket_index)),
+        but the draws of a CSR row are added from its zero-copy view without creating a draw set.
+        """
+        if self.covered_draws_csr is not None and not self.are_covered_draws_cached:
+            draw_set.update_sorted_items(self.covered_draws_csr[ticket_index])
+        else:
+            draw_set.update(self.get_covered_draws(ticket_index))
+
+    def subtract_covered_draws(self, draw_set: DrawSetType, ticket_index: TicketIndexType) -> None:
+        """Same as draw_set.difference_update(self.get_covered_draws(ticket_index)). See add_covered_draws."""
+        if self.covered_draws_csr is not None and not self.are_covered_draws_cached:
+            draw_set.difference_update_sorted_items(self.covered_draws_csr[ticket_index])
+        else:
+            draw_set.difference_update(self.get_covered_draws(ticket_index))
+
     def get_covered_draws_of_tickets(self, ticket_indices: Iterable[TicketIndexType]):
         covered_draws = self.create_empty_draw_set()
         for ticket_index in ticket_indices:
-            covered_draws.update(self.get_covered_draws(ticket_index))
+            self.add_covered_draws(covered_draws, ticket_index)
         return covered_draws
 
     def get_uncovered_draws_of_tickets(self, ticket_indices: Iterable[TicketIndexType]):
         # TODO: check if this is faster
         uncovered_draws = self.create_full_draw_set()
         for ticket_index in ticket_indices:
-            uncovered_draws.difference_update(self.get_covered_draws(ticket_index))
+            self.subtract_covered_draws(uncovered_draws, ticket_index)
         return uncovered_draws
         # uncovered_draws = self.get_covered_draws_of_tickets(ticket_indices)
         # uncovered_draws.negation_update()
@@ -270,11 +628,17 @@ class LotteryProblemWithCache(LotteryProblem):
     def create_draw_set(self, draw_indices: Iterable[DrawIndexType]) -> DrawSetType:
         return self.IntSet(self.total_draw_count, draw_indices)
 
+    def create_draw_set_from_ranges(self, draw_index_ranges: Iterable[DrawIndexRangeType]) -> DrawSetType:
+        return self.IntSet.from_ranges(self.total_draw_count, draw_index_ranges)
+
     def create_empty_draw_set(self) -> DrawSetType:
         return self.create_draw_set([])
 
     def create_full_draw_set(self) -> DrawSetType:
-        return self.create_draw_set(list(range(self.total_draw_count)))
+        # negating an empty set avoids materializing a list of all draw indices
+        draw_set = self.create_empty_draw_set()
+        draw_set.negation_update()
+        return draw_set
 
     def get_uncovered_draws_from_covered_draws(self, draw_set: DrawSetType) -> DrawSetType:
         return draw_set.negation()
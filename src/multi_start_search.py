@@ -0,0 +1,290 @@
+import logging
+import multiprocessing
+import os
+import queue
+import random
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from covered_draws_csr import SharedMemoryCoveredDrawsCSR
+from covered_draws_file import CoveredDrawsFile
+from greedy_cover_solver import GreedyCoverSolver
+from local_search_optimizer import LocalSearchOptimizer
+from lottery_bounds import get_solution_size_lower_bound
+from lottery_problem_with_cache import LotteryProblemWithCache
+from lottery_data_types import TicketIndexType
+
+
+class StartResult(NamedTuple):
+    """The cover found by one start of MultiStartSearch."""
+    start_index: int
+    process_id: int
+    greedy_ticket_count: int
+    ticket_indices: List[TicketIndexType]
+    move_count: int
+    # the whole start, including the greedy cover
+    elapsed_seconds: float
+
+    @property
+    def moves_per_second(self) -> float:
+        return self.move_count / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+
+class WorkerProgress(NamedTuple):
+    """
+    The work of one worker process so far.
+    move_count includes the moves of its running start, reported every 1,000 moves,
+    and the other fields are updated when a start finishes,
+    so best_ticket_count is None until the first one does.
+    """
+    start_count: int
+    move_count: int
+    elapsed_seconds: float
+    best_ticket_count: Optional[int]
+
+
+class MultiStartResult(NamedTuple):
+    best_ticket_indices: List[TicketIndexType]
+    start_results: List[StartResult]
+    worker_progress: Dict[int, WorkerProgress]
+
+
+# the problem a worker process searches, either inherited from the parent when forked
+# or rebuilt by _init_worker on top of the shared covered draws
+_worker_lpc: Optional[LotteryProblemWithCache] = None
+# (process id, start index, new move count) messages to the parent
+_progress_queue: Optional[multiprocessing.Queue] = None
+
+
+def _init_worker(
+    problem_tuple: Tuple[int, int, int, int],
+    which_int_set: str,
+    csr_source,
+    progress_queue: multiprocessing.Queue,
+) -> None:
+    global _worker_lpc, _progress_queue
+    _progress_queue = progress_queue
+    if _worker_lpc is not None:
+        return
+    lpc = LotteryProblemWithCache(*problem_tuple, which_int_set=which_int_set)
+    if csr_source is not None:
+        kind, value = csr_source
+        if kind == "shared_memory":
+            lpc.covered_draws_csr = SharedMemoryCoveredDrawsCSR.attach(value)
+        else:
+            lpc.load_covered_draws_file(value)
+    _worker_lpc = lpc
+
+
+def _run_start(args) -> StartResult:
+    start_index, seed, time_limit, candidate_count = args
+    process_id = os.getpid()
+
+    def on_progress(move_count: int) -> None:
+        _progress_queue.put((process_id, start_index, move_count))
+
+    return run_start(_worker_lpc, start_index, seed, time_limit, candidate_count, on_progress)
+
+
+def run_start(
+    lpc: LotteryProblemWithCache,
+    start_index: int,
+    seed: int,
+    time_limit: float,
+    candidate_count: Optional[int],
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> StartResult:
+    """
+    Build a cover greedily from candidate_count random candidates
+    (the default candidates of GreedyCoverSolver if None),
+    then shrink it with simulated annealing for time_limit seconds.
+    on_progress is passed to LocalSearchOptimizer.anneal to report the moves while annealing.
+    """
+    start_time = time.perf_counter()
+    rng = random.Random(seed)
+    candidate_ticket_indices = None
+    if candidate_count is not None and candidate_count < lpc.total_ticket_count:
+        candidate_ticket_indices = rng.sample(range(lpc.total_ticket_count), candidate_count)
+    greedy_ticket_indices = GreedyCoverSolver(lpc, candidate_ticket_indices, seed=rng.getrandbits(64)).solve(print_info=False)
+    result = LocalSearchOptimizer(lpc, seed=rng.getrandbits(64)).shrink(
+        greedy_ticket_indices, time_limit, print_info=False, on_progress=on_progress
+    )
+    return StartResult(
+        start_index=start_index,
+        process_id=os.getpid(),
+        greedy_ticket_count=len(greedy_ticket_indices),
+        ticket_indices=result.ticket_indices,
+        move_count=result.move_count,
+        elapsed_seconds=time.perf_counter() - start_time,
+    )
+
+
+class MultiStartSearch:
+    """
+    Runs independent greedy + simulated annealing searches from random starts
+    on a pool of worker processes, and keeps the smallest cover found.
+
+    Covered draws cached by the parent are shared read-only instead of being rebuilt per worker:
+    a covered draws CSR in shared memory is attached by name,
+    a covered draws file is memory-mapped again (sharing the page cache),
+    and with the fork start method everything else the parent cached,
+    e.g. cache_covered_draws, is inherited copy-on-write.
+
+    The search stops early once a cover reaches the proven lower bound of get_solution_size_lower_bound.
+    Workers report their moves while annealing, so the progress of every worker
+    is logged every log_interval seconds even when a start runs for minutes.
+    """
+
+    def __init__(
+        self,
+        lottery_problem_with_cache: LotteryProblemWithCache,
+        process_count: Optional[int] = None,
+        logger=None,
+    ) -> None:
+        self.lpc = lottery_problem_with_cache
+        self.process_count = process_count or multiprocessing.cpu_count()
+        self.logger = logger or logging.getLogger("MultiStartSearch")
+
+    def get_csr_source(self):
+        """Return how a worker process can attach to the covered draws CSR of the parent."""
+        csr = self.lpc.covered_draws_csr
+        if isinstance(csr, SharedMemoryCoveredDrawsCSR):
+            return ("shared_memory", csr.get_spec())
+        if isinstance(csr, CoveredDrawsFile):
+            return ("file", csr.path)
+        return None
+
+    def run(
+        self,
+        start_count: int,
+        time_limit_per_start: float,
+        candidate_count: Optional[int] = None,
+        seed: Optional[int] = None,
+        print_info=True,
+        log_interval: float = 10.0,
+    ) -> MultiStartResult:
+        global _worker_lpc
+        rng = random.Random(seed)
+        start_args = [
+            (start_index, rng.getrandbits(64), time_limit_per_start, candidate_count)
+            for start_index in range(start_count)
+        ]
+
+        lower_bound = get_solution_size_lower_bound(self.lpc)
+        best_ticket_indices = None
+        start_results = []
+        worker_progress = {}
+        # moves reported so far by each running start
+        running_move_counts = {}
+        done_start_indices = set()
+        next_log_time = time.perf_counter() + log_interval
+
+        def update_progress(process_id: int, move_count: int = 0, start_result: Optional[StartResult] = None) -> None:
+            progress = worker_progress.get(process_id) or WorkerProgress(0, 0, 0.0, None)
+            if start_result is not None:
+                progress = WorkerProgress(
+                    start_count=progress.start_count + 1,
+                    move_count=progress.move_count,
+                    elapsed_seconds=progress.elapsed_seconds + start_result.elapsed_seconds,
+                    best_ticket_count=min(
+                        progress.best_ticket_count or len(start_result.ticket_indices),
+                        len(start_result.ticket_indices),
+                    ),
+                )
+            worker_progress[process_id] = progress._replace(move_count=progress.move_count + move_count)
+
+        def record_moves(process_id: int, start_index: int, move_count: int) -> None:
+            """Record moves reported by a running start, and log the progress of every worker when it's time."""
+            nonlocal next_log_time
+            # a report may arrive after the result of its start, which already counts its moves
+            if start_index in done_start_indices:
+                return
+            running_move_counts[start_index] = running_move_counts.get(start_index, 0) + move_count
+            update_progress(process_id, move_count)
+            now = time.perf_counter()
+            if print_info and now >= next_log_time:
+                next_log_time = now + log_interval
+                self.logger.info(
+                    f"{len(start_results)}/{start_count} starts done; moves per process: "
+                    + ", ".join(
+                        f"{process_id}: {progress.move_count}" for process_id, progress in worker_progress.items()
+                    )
+                )
+
+        def record(start_result: StartResult) -> bool:
+            """Record the result of a start. Return True if the best cover is proven optimal."""
+            nonlocal best_ticket_indices
+            start_results.append(start_result)
+            if best_ticket_indices is None or len(start_result.ticket_indices) < len(best_ticket_indices):
+                best_ticket_indices = start_result.ticket_indices
+            done_start_indices.add(start_result.start_index)
+            update_progress(
+                start_result.process_id,
+                start_result.move_count - running_move_counts.pop(start_result.start_index, 0),
+                start_result,
+            )
+            if print_info:
+                progress = worker_progress[start_result.process_id]
+                self.logger.info(
+                    f"start {start_result.start_index} on process {start_result.process_id}: "
+                    f"{start_result.greedy_ticket_count} -> {len(start_result.ticket_indices)} tickets, "
+                    f"{start_result.moves_per_second:.0f} moves/s; "
+                    f"process done {progress.start_count} starts; "
+                    f"global best {len(best_ticket_indices)} tickets, "
+                    f"{len(start_results)}/{start_count} starts done"
+                )
+            return len(best_ticket_indices) <= lower_bound
+
+        if self.process_count == 1:
+            process_id = os.getpid()
+            for args in start_args:
+                start_index = args[0]
+                on_progress = lambda move_count: record_moves(process_id, start_index, move_count)
+                if record(run_start(self.lpc, *args, on_progress=on_progress)):
+                    break
+        else:
+            problem_tuple = (
+                self.lpc.total_num_count,
+                self.lpc.num_count_in_ticket,
+                self.lpc.num_count_in_draw,
+                self.lpc.min_matched_num_count,
+            )
+            # forked workers inherit the parent's caches copy-on-write
+            _worker_lpc = self.lpc
+            progress_queue = multiprocessing.Queue()
+
+            def drain_progress_queue() -> None:
+                while True:
+                    try:
+                        record_moves(*progress_queue.get_nowait())
+                    except queue.Empty:
+                        return
+
+            try:
+                with multiprocessing.Pool(
+                    self.process_count,
+                    _init_worker,
+                    (problem_tuple, self.lpc.which_int_set, self.get_csr_source(), progress_queue),
+                ) as pool:
+                    start_results_iterator = pool.imap_unordered(_run_start, start_args)
+                    while True:
+                        try:
+                            # wake up regularly to read the progress of the running starts
+                            start_result = start_results_iterator.next(timeout=min(log_interval, 1.0))
+                        except multiprocessing.TimeoutError:
+                            drain_progress_queue()
+                            continue
+                        except StopIteration:
+                            break
+                        drain_progress_queue()
+                        if record(start_result):
+                            # leaving the with block terminates the remaining starts
+                            break
+            finally:
+                _worker_lpc = None
+                progress_queue.close()
+
+        return MultiStartResult(
+            best_ticket_indices=best_ticket_indices,
+            start_results=start_results,
+            worker_progress=worker_progress,
+        )
@@ -0,0 +1,140 @@
+from functools import lru_cache
+from collections.abc import Sequence
+from typing import Iterable, Iterator, Tuple
+import math
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def get_pascal_table(total_numbers: int, combo_length: int) -> np.ndarray:
+    """
+    Return a read-only int64 table where table[m, r] == comb(m, r)
+    for m in range(total_numbers + 1) and r in range(combo_length + 1).
+    """
+    if math.comb(total_numbers, combo_length) >= 2 ** 63:
+        raise ValueError("Combination count does not fit in int64.")
+    table = np.array(
+        [
+            [math.comb(m, r) for r in range(combo_length + 1)]
+            for m in range(total_numbers + 1)
+        ],
+        dtype=np.int64,
+    )
+    table.flags.writeable = False
+    return table
+
+
+def get_combo_dtype(total_numbers: int) -> np.dtype:
+    """Return the smallest unsigned dtype that can store the numbers of a combination."""
+    return np.dtype(np.uint8 if total_numbers <= 256 else np.uint16)
+
+
+def calculate_combination_indices(combinations: np.ndarray, total_numbers: int) -> np.ndarray:
+    """
+    Vectorized calculate_combination_index over the rows of combinations.
+
+    The index of a sorted combination c of length k in lexicographic order is
+        comb(n, k) - 1 - sum(comb(n - 1 - c[i], k - i) for i in range(k))
+    because mapping each number x to n - 1 - x reverses the lexicographic order
+    and turns it into the colexicographic order, whose index is the sum above.
+    So it takes one table lookup per column.
+    """
+    combinations = np.asarray(combinations, dtype=np.intp)
+    if combinations.ndim != 2:
+        raise ValueError("combinations must be an (N, combo_length) array.")
+    combo_length = combinations.shape[1]
+    table = get_pascal_table(total_numbers, combo_length)
+
+    colex_indices = np.zeros(len(combinations), dtype=np.int64)
+    for position in range(combo_length):
+        colex_indices += table[total_numbers - 1 - combinations[:, position], combo_length - position]
+    return table[total_numbers, combo_length] - 1 - colex_indices
+
+
+def generate_combinations_by_indices(
+    combo_indices: np.ndarray,
+    total_numbers: int,
+    combo_length: int,
+    validate_args: bool = False,
+) -> np.ndarray:
+    """
+    Vectorized generate_combination_by_index.
+    Return an (N, combo_length) array whose rows are the combinations at combo_indices.
+
+    We invert calculate_combination_indices position by position:
+    the colexicographic index is a sum of comb(y, k - i) with decreasing y,
+    so y at each position is the largest y with comb(y, k - i) <= the remaining index,
+    which is found by binary search in a column of the Pascal table.
+    """
+    table = get_pascal_table(total_numbers, combo_length)
+    combo_indices = np.asarray(combo_indices, dtype=np.int64)
+    if validate_args:
+        if combo_length > total_numbers:
+            raise ValueError("Combination length cannot be greater than the total number of elements.")
+        if combo_indices.size and (
+            combo_indices.min() < 0 or combo_indices.max() >= table[total_numbers, combo_length]
+        ):
+            raise ValueError("Combo index is out of range for the number of combinations possible.")
+
+    remaining_indices = table[total_numbers, combo_length] - 1 - combo_indices
+    combinations = np.empty((len(combo_indices), combo_length), dtype=get_combo_dtype(total_numbers))
+    for position in range(combo_length):
+        column = table[:, combo_length - position]
+        reversed_numbers = np.searchsorted(column, remaining_indices, side="right") - 1
+        remaining_indices -= column[reversed_numbers]
+        combinations[:, position] = total_numbers - 1 - reversed_numbers
+    return combinations
+
+
+def expand_index_ranges(index_ranges: Iterable[Tuple[int, int]]) -> np.ndarray:
+    """
+    Return the int64 array of all the indices in sorted, disjoint [start, stop) ranges,
+    e.g. the output of generate_covered_draw_index_ranges.
+    """
+    bounds = np.array(list(index_ranges), dtype=np.int64).reshape(-1, 2)
+    starts = bounds[:, 0]
+    lengths = bounds[:, 1] - starts
+    # each index is its range start plus its position within the range
+    range_ids = np.repeat(np.arange(len(starts)), lengths)
+    range_first_positions = np.cumsum(lengths) - lengths
+    return np.arange(lengths.sum(), dtype=np.int64) - range_first_positions[range_ids] + starts[range_ids]
+
+
+def generate_all_combinations(total_numbers: int, combo_length: int, chunk_size: int = 1 << 20) -> np.ndarray:
+    """
+    Return all the combinations in lexicographic order as an (N, combo_length) uint8 (or uint16) array,
+    e.g. 600 MB for the 85,900,584 draws of (49, 6, 7, 3).
+    The rows are generated chunk_size at a time, so the int64 temporaries stay small.
+    """
+    combo_count = math.comb(total_numbers, combo_length)
+    combinations = np.empty((combo_count, combo_length), dtype=get_combo_dtype(total_numbers))
+    for start in range(0, combo_count, chunk_size):
+        stop = min(start + chunk_size, combo_count)
+        combinations[start:stop] = generate_combinations_by_indices(
+            np.arange(start, stop, dtype=np.int64), total_numbers, combo_length
+        )
+    return combinations
+
+
+class CombinationArray(Sequence):
+    """
+    A read-only sequence of combination tuples backed by an (N, combo_length) array,
+    so it can replace a list of tuples: self[i] is a tuple, and iterating yields tuples.
+    A list of 7-tuples costs about 100 bytes per combination, and the array 7.
+    Vectorized code can use self.array directly.
+    """
+
+    def __init__(self, array: np.ndarray) -> None:
+        self.array = array
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CombinationArray(self.array[index])
+        return tuple(self.array[index].tolist())
+
+    def __iter__(self) -> Iterator[Tuple[int, ...]]:
+        for start in range(0, len(self.array), 1 << 16):
+            yield from map(tuple, self.array[start:start + (1 << 16)].tolist())
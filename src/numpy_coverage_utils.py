@@ -0,0 +1,44 @@
+import numpy as np
+
+# the most bytes is_covered_by_tickets spends on matched counts at once
+MAX_MATCHED_COUNT_MATRIX_BYTES = 1 << 26
+
+
+def get_number_matrix(combinations: np.ndarray, total_numbers: int) -> np.ndarray:
+    """
+    Return an (N, total_numbers) float32 matrix whose entry [i, num] is 1
+    if num is in combinations[i] and 0 otherwise.
+    The matched number counts of two batches are then one matrix product.
+    """
+    combinations = np.asarray(combinations, dtype=np.intp)
+    matrix = np.zeros((len(combinations), total_numbers), dtype=np.float32)
+    np.put_along_axis(matrix, combinations, 1, axis=1)
+    return matrix
+
+
+def is_covered_by_tickets(
+    draw_combos: np.ndarray,
+    ticket_number_matrix: np.ndarray,
+    min_matched_num_count: int,
+    max_matrix_bytes: int = MAX_MATCHED_COUNT_MATRIX_BYTES,
+) -> np.ndarray:
+    """
+    Return a bool array telling whether each row of draw_combos shares
+    at least min_matched_num_count numbers with some ticket.
+    ticket_number_matrix is get_number_matrix of the tickets.
+
+    The tickets are checked in chunks, so that the matched count matrix of a chunk
+    takes at most about max_matrix_bytes however many tickets there are,
+    and each chunk only checks the draws not covered by the chunks before it.
+    """
+    draw_number_matrix = get_number_matrix(draw_combos, ticket_number_matrix.shape[1])
+    is_covered = np.zeros(len(draw_number_matrix), dtype=bool)
+    ticket_chunk_size = max(1, max_matrix_bytes // (draw_number_matrix.itemsize * max(len(draw_number_matrix), 1)))
+    for start in range(0, len(ticket_number_matrix), ticket_chunk_size):
+        uncovered_positions = np.flatnonzero(~is_covered)
+        if len(uncovered_positions) == 0:
+            break
+        # matched_counts[i, j] is the count of numbers uncovered draw i and ticket start + j share
+        matched_counts = draw_number_matrix[uncovered_positions] @ ticket_number_matrix[start:start + ticket_chunk_size].T
+        is_covered[uncovered_positions] = (matched_counts >= min_matched_num_count).any(axis=1)
+    return is_covered
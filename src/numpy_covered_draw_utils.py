@@ -0,0 +1,89 @@
+from typing import Dict, List, Tuple
+import math
+import numpy as np
+from covered_draw_utils import get_combination_table
+
+
+def generate_covered_draw_index_array(
+    ticket_combo: Tuple[int, ...],
+    total_numbers: int,
+    draw_length: int,
+    min_matched_count: int,
+) -> np.ndarray:
+    """
+    Return the sorted int64 array of the indices of the draws that share
+    at least min_matched_count numbers with ticket_combo.
+    Same as expanding generate_covered_draw_index_ranges, but vectorized.
+
+    The draws are walked as in generate_covered_draw_index_ranges,
+    and the covered draws after each (remaining_length, last number, matched numbers still needed) state
+    are solved once as an array of indices relative to the first draw after the prefix.
+    A state is then the concatenation of its children shifted by their first index,
+    so the work per state is a few NumPy calls instead of one Python tuple per range.
+    For a random ticket of (49, 6, 7, 3), the covered draws are about 1.5 million ranges of 1 or 2 draws,
+    which take about 1 second as a list of ranges, and about 40 ms this way.
+    """
+    n = total_numbers
+    t = min_matched_count
+    if t <= 0:
+        return np.arange(math.comb(n, draw_length), dtype=np.int64)
+    if t > min(draw_length, len(ticket_combo)):
+        return np.empty(0, dtype=np.int64)
+
+    comb_table = get_combination_table(n, draw_length)
+    # columns[r][m] == comb(m, r)
+    columns = [[row[r] for row in comb_table] for r in range(draw_length + 1)]
+    ticket_nums = sorted(ticket_combo)
+
+    is_in_ticket = [False] * n
+    for num in ticket_nums:
+        is_in_ticket[num] = True
+    # if we still need `need` numbers of the ticket,
+    # the next number must be less than stop_by_need[need]
+    stop_by_need = [n] + [ticket_nums[-need] + 1 for need in range(1, len(ticket_nums) + 1)]
+
+    solved: Dict[Tuple[int, int, int], np.ndarray] = {}
+    empty = np.empty(0, dtype=np.int64)
+
+    def solve(remaining_length: int, prev: int, need: int) -> np.ndarray:
+        """Return the covered draws after the prefix relative to its first draw."""
+        key = (remaining_length, prev, need)
+        draw_indices = solved.get(key)
+        if draw_indices is not None:
+            return draw_indices
+
+        column = columns[remaining_length]
+        block_column = columns[remaining_length - 1]
+        skipped_base = column[n - prev - 1]
+        if need == remaining_length:
+            # every remaining number must be a ticket number
+            next_nums = [num for num in ticket_nums if prev < num < stop_by_need[need]]
+        else:
+            next_nums = range(prev + 1, min(stop_by_need[need], n - remaining_length + 1))
+
+        parts: List[np.ndarray] = []
+        # adjacent fully covered blocks are merged into one arange
+        block_start = block_stop = None
+        for num in next_nums:
+            start = skipped_base - column[n - num]
+            if need == 1 and is_in_ticket[num]:
+                stop = start + block_column[n - num - 1]
+                if block_stop != start:
+                    if block_start is not None:
+                        parts.append(np.arange(block_start, block_stop, dtype=np.int64))
+                    block_start = start
+                block_stop = stop
+                continue
+            child_draw_indices = solve(remaining_length - 1, num, need - is_in_ticket[num])
+            if len(child_draw_indices):
+                if block_start is not None:
+                    parts.append(np.arange(block_start, block_stop, dtype=np.int64))
+                    block_start = block_stop = None
+                parts.append(child_draw_indices + start)
+        if block_start is not None:
+            parts.append(np.arange(block_start, block_stop, dtype=np.int64))
+
+        draw_indices = solved[key] = np.concatenate(parts) if parts else empty
+        return draw_indices
+
+    return solve(draw_length, -1, t)
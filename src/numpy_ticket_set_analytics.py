@@ -0,0 +1,41 @@
+from itertools import combinations
+from typing import List
+import numpy as np
+from numpy_combination_index_utils import calculate_combination_indices
+from numpy_coverage_utils import get_number_matrix
+from ticket_set_analytics import invert_shared_subset_pair_counts
+
+
+def get_overlap_histogram(ticket_combos: np.ndarray, total_numbers: int) -> List[int]:
+    """
+    Vectorized ticket_set_analytics.get_overlap_histogram.
+    The j-subsets of all the tickets are ranked with calculate_combination_indices
+    and counted with np.unique, one j at a time.
+    """
+    ticket_combos = np.sort(np.asarray(ticket_combos, dtype=np.intp), axis=1)
+    ticket_length = ticket_combos.shape[1]
+    shared_subset_pair_counts = []
+    for subset_length in range(ticket_length + 1):
+        subsets = np.concatenate([
+            ticket_combos[:, list(positions)]
+            for positions in combinations(range(ticket_length), subset_length)
+        ])
+        _, subset_counts = np.unique(calculate_combination_indices(subsets, total_numbers), return_counts=True)
+        shared_subset_pair_counts.append(int((subset_counts * (subset_counts - 1) // 2).sum()))
+    return invert_shared_subset_pair_counts(shared_subset_pair_counts)
+
+
+def get_number_frequencies(ticket_combos: np.ndarray, total_numbers: int) -> List[int]:
+    """Vectorized ticket_set_analytics.get_number_frequencies."""
+    return np.bincount(np.asarray(ticket_combos, dtype=np.intp).ravel(), minlength=total_numbers).tolist()
+
+
+def get_pair_frequencies(ticket_combos: np.ndarray, total_numbers: int) -> List[List[int]]:
+    """
+    Vectorized ticket_set_analytics.get_pair_frequencies, which is M.T @ M of the ticket number matrix M.
+    float32 counts are exact up to 2 ** 24 tickets.
+    """
+    if len(ticket_combos) == 0:
+        return [[0] * total_numbers for _ in range(total_numbers)]
+    number_matrix = get_number_matrix(ticket_combos, total_numbers)
+    return np.rint(number_matrix.T @ number_matrix).astype(np.int64).tolist()
@@ -0,0 +1,152 @@
+from itertools import combinations
+from typing import Dict, Iterable, Iterator, List, Tuple
+import math
+from combination_index_utils import calculate_combination_index
+
+
+class TSubsetShadow:
+    """
+    The t-subsets (t = min_matched_count) contained in some ticket, a.k.a. the t-shadow of the tickets.
+
+    A draw shares at least t numbers with a ticket
+    iff one of the t-subsets of the draw is contained in the ticket.
+    So whether a draw is covered only depends on this table of comb(total_numbers, t) flags,
+    e.g. 18,424 for (49, 6, 7, 3) compared with 85,900,584 draws,
+    and no covered draw set of any ticket is needed.
+
+    Uncovered draws are counted by choosing the draw numbers one by one in increasing order.
+    completion_masks[(t - 2)-subset R][x] is the bitmask of the numbers y
+    such that R + (x, y) is a marked t-subset. Choosing y after a partial draw S
+    covers every draw starting with S + (y,) if y is in the completion mask of some (t - 1)-subset of S,
+    so those draws are skipped at once, and the last number is counted with a popcount.
+    The work is proportional to the partial draws none of whose t-subsets are marked,
+    which is far less than the draws for a good cover.
+    """
+
+    def __init__(
+        self,
+        ticket_combos: Iterable[Tuple[int, ...]],
+        total_numbers: int,
+        draw_length: int,
+        min_matched_count: int,
+    ) -> None:
+        self.total_numbers = total_numbers
+        self.draw_length = draw_length
+        self.min_matched_count = min_matched_count
+        t = min_matched_count
+
+        # marked_t_subsets[calculate_combination_index(t-subset)] is 1 if a ticket contains the t-subset
+        self.marked_t_subsets = bytearray(math.comb(total_numbers, t))
+        # only the (t - 2)-subsets of tickets have a row, and with t == 1,
+        # the completion mask of the empty (t - 1)-subset is completion_masks[()][0]
+        self.completion_masks: Dict[Tuple[int, ...], List[int]] = {}
+        for ticket_combo in ticket_combos:
+            for t_subset in combinations(sorted(ticket_combo), t):
+                t_subset_index = calculate_combination_index(t_subset, total_numbers)
+                if self.marked_t_subsets[t_subset_index]:
+                    continue
+                self.marked_t_subsets[t_subset_index] = 1
+                if t == 1:
+                    self._get_completion_row(())[0] |= 1 << t_subset[0]
+                    continue
+                for position, num in enumerate(t_subset):
+                    q = t_subset[:position] + t_subset[position + 1:]
+                    self._get_completion_row(q[:-1])[q[-1]] |= 1 << num
+
+    def _get_completion_row(self, subset: Tuple[int, ...]) -> List[int]:
+        completion_row = self.completion_masks.get(subset)
+        if completion_row is None:
+            completion_row = self.completion_masks[subset] = [0] * self.total_numbers
+        return completion_row
+
+    def get_marked_t_subset_count(self) -> int:
+        return sum(self.marked_t_subsets)
+
+    def is_draw_covered(self, draw_combo: Tuple[int, ...]) -> bool:
+        return any(
+            self.marked_t_subsets[calculate_combination_index(t_subset, self.total_numbers)]
+            for t_subset in combinations(sorted(draw_combo), self.min_matched_count)
+        )
+
+    def _yield_uncovered_draw_prefixes(self) -> Iterator[Tuple[Tuple[int, ...], int]]:
+        """
+        Yield (prefix, last_num_mask) where prefix is the first draw_length - 1 numbers of uncovered draws
+        and last_num_mask is the bitmask of the last numbers completing prefix to an uncovered draw.
+        The prefixes are yielded in lexicographic order.
+        """
+        total_numbers = self.total_numbers
+        draw_length = self.draw_length
+        t = self.min_matched_count
+        completion_masks = self.completion_masks
+        if t == 0:
+            # every draw matches a ticket with at least 0 numbers
+            return
+        all_nums_mask = (1 << total_numbers) - 1
+
+        def visit(
+            prefix: Tuple[int, ...], forbidden_mask: int, completion_rows: List[List[int]]
+        ) -> Iterator[Tuple[Tuple[int, ...], int]]:
+            """completion_rows are the rows of the (t - 2)-subsets of prefix."""
+            remaining_length = draw_length - len(prefix)
+            first_num = prefix[-1] + 1 if prefix else 0
+            # the next number leaves room for the remaining_length - 1 numbers after it
+            candidate_mask = (
+                all_nums_mask >> (remaining_length - 1)
+                & ~((1 << first_num) - 1)
+                & ~forbidden_mask
+            )
+            if remaining_length == 1:
+                if candidate_mask:
+                    yield prefix, candidate_mask
+                return
+            while candidate_mask:
+                num_bit = candidate_mask & -candidate_mask
+                candidate_mask ^= num_bit
+                num = num_bit.bit_length() - 1
+                # the new (t - 1)-subsets after choosing num are the (t - 2)-subsets of prefix plus num
+                child_forbidden_mask = forbidden_mask
+                for completion_row in completion_rows:
+                    child_forbidden_mask |= completion_row[num]
+                child_prefix = prefix + (num,)
+                if remaining_length == 2:
+                    # the last number, inlined since most calls would be these
+                    last_num_mask = all_nums_mask & ~((num_bit << 1) - 1) & ~child_forbidden_mask
+                    if last_num_mask:
+                        yield child_prefix, last_num_mask
+                    continue
+                # the new (t - 2)-subsets are the (t - 3)-subsets of prefix plus num
+                child_completion_rows = completion_rows
+                if t >= 3:
+                    for subset in combinations(prefix, t - 3):
+                        completion_row = completion_masks.get(subset + (num,))
+                        if completion_row is not None:
+                            child_completion_rows = child_completion_rows + [completion_row]
+                yield from visit(child_prefix, child_forbidden_mask, child_completion_rows)
+
+        if t == 1:
+            # the empty set is the only (t - 1)-subset, and it's a subset of every draw
+            yield from visit((), completion_masks[()][0] if () in completion_masks else 0, [])
+        else:
+            # the empty set is the only (t - 2)-subset of the empty prefix when t == 2
+            yield from visit((), 0, [completion_masks[()]] if t == 2 and () in completion_masks else [])
+
+    def count_uncovered_draws(self) -> int:
+        if self.min_matched_count > self.draw_length:
+            return math.comb(self.total_numbers, self.draw_length)
+        return sum(last_num_mask.bit_count() for _, last_num_mask in self._yield_uncovered_draw_prefixes())
+
+    def yield_uncovered_draw_combos(self) -> Iterator[Tuple[int, ...]]:
+        """Yield the uncovered draws in lexicographic order."""
+        if self.min_matched_count > self.draw_length:
+            yield from combinations(range(self.total_numbers), self.draw_length)
+            return
+        for prefix, last_num_mask in self._yield_uncovered_draw_prefixes():
+            while last_num_mask:
+                num_bit = last_num_mask & -last_num_mask
+                last_num_mask ^= num_bit
+                yield prefix + (num_bit.bit_length() - 1,)
+
+    def yield_uncovered_draw_indices(self) -> Iterator[int]:
+        """Yield the indices of the uncovered draws in increasing order."""
+        for draw_combo in self.yield_uncovered_draw_combos():
+            yield calculate_combination_index(draw_combo, self.total_numbers)
@@ -0,0 +1,71 @@
+"""
+Statistics of a ticket set: how many numbers pairs of tickets share,
+and how often each number and each pair of numbers appear.
+numpy_ticket_set_analytics has the same functions vectorized.
+"""
+from collections import Counter
+from itertools import chain, combinations
+from typing import List, Sequence, Tuple
+import math
+
+
+def get_overlap_histogram(ticket_combos: Sequence[Tuple[int, ...]], total_numbers: int) -> List[int]:
+    """
+    Return a list whose item m is the count of ticket pairs sharing exactly m numbers,
+    for m in range(ticket length + 1).
+
+    A pair of tickets sharing m numbers shares comb(m, j) subsets of j numbers, so
+        shared_subset_pair_counts[j] = sum(comb(tickets containing s, 2) for every j-subset s)
+                                     = sum(comb(m, j) * histogram[m] for every m),
+    and the histogram follows by binomial inversion, see invert_shared_subset_pair_counts.
+    Counting the tickets containing each subset takes O(T * 2 ** k) instead of comparing O(T ** 2) pairs.
+    """
+    ticket_length = max(map(len, ticket_combos), default=0)
+    sorted_ticket_combos = [tuple(sorted(ticket_combo)) for ticket_combo in ticket_combos]
+    shared_subset_pair_counts = []
+    for subset_length in range(ticket_length + 1):
+        subset_counter = Counter(chain.from_iterable(
+            combinations(ticket_combo, subset_length) for ticket_combo in sorted_ticket_combos
+        ))
+        shared_subset_pair_counts.append(sum(count * (count - 1) // 2 for count in subset_counter.values()))
+    return invert_shared_subset_pair_counts(shared_subset_pair_counts)
+
+
+def invert_shared_subset_pair_counts(shared_subset_pair_counts: Sequence[int]) -> List[int]:
+    """
+    Return the histogram of get_overlap_histogram from shared_subset_pair_counts:
+        histogram[m] = sum((-1) ** (j - m) * comb(j, m) * shared_subset_pair_counts[j] for j >= m)
+    """
+    return [
+        sum(
+            (-1) ** (subset_length - overlap) * math.comb(subset_length, overlap) * pair_count
+            for subset_length, pair_count in enumerate(shared_subset_pair_counts)
+            if subset_length >= overlap
+        )
+        for overlap in range(len(shared_subset_pair_counts))
+    ]
+
+
+def get_number_frequencies(ticket_combos: Sequence[Tuple[int, ...]], total_numbers: int) -> List[int]:
+    """Return a list whose item num is the count of tickets containing num."""
+    number_frequencies = [0] * total_numbers
+    for ticket_combo in ticket_combos:
+        for num in ticket_combo:
+            number_frequencies[num] += 1
+    return number_frequencies
+
+
+def get_pair_frequencies(ticket_combos: Sequence[Tuple[int, ...]], total_numbers: int) -> List[List[int]]:
+    """
+    Return a total_numbers x total_numbers symmetric matrix as a list of lists,
+    whose item [a][b] is the count of tickets containing both a and b.
+    The diagonal is get_number_frequencies.
+    """
+    pair_frequencies = [[0] * total_numbers for _ in range(total_numbers)]
+    for ticket_combo in ticket_combos:
+        for num in ticket_combo:
+            pair_frequencies[num][num] += 1
+        for num_1, num_2 in combinations(ticket_combo, 2):
+            pair_frequencies[num_1][num_2] += 1
+            pair_frequencies[num_2][num_1] += 1
+    return pair_frequencies
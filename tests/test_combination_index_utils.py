@@ -0,0 +1,98 @@
+import sys
+sys.path.append('src')
+sys.path.append('src/int_set')
+import unittest
+from itertools import combinations
+from combination_index_utils import (
+    CombinationRankTable,
+    calculate_combination_index,
+    generate_combination_by_index,
+    yield_revolving_door_swaps,
+)
+try:
+    import numpy as np
+    from numpy_combination_index_utils import (
+        CombinationArray,
+        calculate_combination_indices,
+        generate_all_combinations,
+        generate_combinations_by_indices,
+    )
+except ImportError:
+    np = None
+
+
+class TestCombinationIndexUtils(unittest.TestCase):
+    def test_calculate_and_generate(self):
+        for total_numbers, combo_length in [(9, 4), (10, 1), (7, 7)]:
+            for combo_index, combo in enumerate(combinations(range(total_numbers), combo_length)):
+                self.assertEqual(calculate_combination_index(combo, total_numbers), combo_index)
+                self.assertEqual(
+                    generate_combination_by_index(combo_index, total_numbers, combo_length),
+                    combo
+                )
+
+    @unittest.skipUnless(np, "requires numpy")
+    def test_combination_rank_table(self):
+        for total_numbers in range(9):
+            for combo_length in range(total_numbers + 1):
+                rank_table = CombinationRankTable(total_numbers, combo_length)
+                all_combos = list(combinations(range(total_numbers), combo_length))
+                self.assertEqual(len(rank_table), len(all_combos))
+                self.assertEqual([rank_table[combo] for combo in all_combos], list(range(len(all_combos))))
+
+        rank_table = CombinationRankTable(6, 3)
+        self.assertIn((0, 2, 5), rank_table)
+        self.assertEqual(rank_table.get((0, 2, 5)), rank_table[(0, 2, 5)])
+        for combo in [(0, 2), (0, 2, 5, 1), (2, 0, 5), (0, 2, 2), (-1, 2, 5), (0, 2, 6)]:
+            self.assertNotIn(combo, rank_table)
+            self.assertIsNone(rank_table.get(combo))
+            self.assertEqual(rank_table.get(combo, -1), -1)
+            with self.assertRaises(KeyError):
+                rank_table[combo]
+
+    @unittest.skipUnless(np, "requires numpy")
+    def test_combination_array(self):
+        for total_numbers, combo_length in [(10, 3), (12, 5), (6, 6), (5, 0)]:
+            all_combos = list(combinations(range(total_numbers), combo_length))
+            combo_array = CombinationArray(generate_all_combinations(total_numbers, combo_length, chunk_size=7))
+            self.assertEqual(combo_array.array.dtype, np.uint8)
+            self.assertEqual(len(combo_array), len(all_combos))
+            self.assertEqual(list(combo_array), all_combos)
+            self.assertEqual(combo_array[len(all_combos) - 1], all_combos[-1])
+            self.assertEqual(list(combo_array[2:5]), all_combos[2:5])
+
+    def test_revolving_door_swaps(self):
+        for total_numbers in range(9):
+            for combo_length in range(total_numbers + 1):
+                combo = set(range(combo_length))
+                visited_combos = {frozenset(combo)}
+                for removed_number, added_number in yield_revolving_door_swaps(total_numbers, combo_length):
+                    self.assertIn(removed_number, combo)
+                    self.assertNotIn(added_number, combo)
+                    self.assertLess(added_number, total_numbers)
+                    combo.remove(removed_number)
+                    combo.add(added_number)
+                    visited_combos.add(frozenset(combo))
+                self.assertEqual(
+                    visited_combos, set(map(frozenset, combinations(range(total_numbers), combo_length)))
+                )
+
+    def test_batch_calculate_and_generate(self):
+        for total_numbers, combo_length in [(9, 4), (10, 1), (7, 7), (12, 6)]:
+            all_combos = np.array(list(combinations(range(total_numbers), combo_length)))
+            all_indices = np.arange(len(all_combos))
+            np.testing.assert_array_equal(
+                calculate_combination_indices(all_combos, total_numbers), all_indices
+            )
+            np.testing.assert_array_equal(
+                generate_combinations_by_indices(all_indices, total_numbers, combo_length), all_combos
+            )
+
+    @unittest.skipUnless(np, "requires numpy")
+    def test_batch_large_problem(self):
+        total_numbers, combo_length = 49, 7
+        combo_indices = np.array([0, 1, 12_345_678, 85_900_583])
+        combos = generate_combinations_by_indices(combo_indices, total_numbers, combo_length, validate_args=True)
+        for combo_index, combo in zip(combo_indices.tolist(), combos.tolist()):
+            self.assertEqual(tuple(combo), generate_combination_by_index(combo_index, total_numbers, combo_length))
+        np.testing.assert_array_equal(calculate_combination_indices(combos, total_numbers), combo_indices)
@@ -0,0 +1,49 @@
+import sys
+sys.path.append('src')
+sys.path.append('src/int_set')
+import unittest
+from lottery_problem_with_cache import LotteryProblemWithCache
+from greedy_cover_solver import DEFAULT_CANDIDATE_COUNT, GreedyCoverSolver
+
+
+class TestGreedyCoverSolver(unittest.TestCase):
+    def test_solve(self):
+        for which_int_set in ["native", "bitset"]:
+            lp = LotteryProblemWithCache(12, 5, 5, 3, which_int_set=which_int_set)
+            solver = GreedyCoverSolver(lp)
+            ticket_indices = solver.solve(print_info=False)
+            self.assertTrue(lp.is_solution(ticket_indices))
+            self.assertLess(len(ticket_indices), 12)
+
+            # draw sets instead of NumPy index arrays make the same choices
+            solver = GreedyCoverSolver(lp)
+            solver.use_index_arrays = False
+            self.assertEqual(solver.solve(print_info=False), ticket_indices)
+
+    def test_solve_with_few_candidates(self):
+        # the candidates alone can't cover every draw
+        lp = LotteryProblemWithCache(10, 5, 5, 3)
+        solver = GreedyCoverSolver(lp, candidate_ticket_indices=[0])
+        ticket_indices = solver.solve(print_info=False)
+        self.assertEqual(ticket_indices[0], 0)
+        self.assertTrue(lp.is_solution(ticket_indices))
+
+    def test_default_candidates(self):
+        lp = LotteryProblemWithCache(12, 5, 5, 3)
+        self.assertEqual(GreedyCoverSolver(lp).candidate_ticket_indices, list(range(lp.total_ticket_count)))
+        # too many tickets to evaluate them all
+        lp = LotteryProblemWithCache(39, 5, 5, 2)
+        candidate_ticket_indices = GreedyCoverSolver(lp, seed=0).candidate_ticket_indices
+        self.assertEqual(len(set(candidate_ticket_indices)), DEFAULT_CANDIDATE_COUNT)
+        self.assertEqual(GreedyCoverSolver(lp, seed=0).candidate_ticket_indices, candidate_ticket_indices)
+
+    def test_solve_from_initial_tickets(self):
+        lp = LotteryProblemWithCache(10, 5, 5, 3)
+        solver = GreedyCoverSolver(lp)
+        ticket_indices = solver.solve(initial_ticket_indices=[5], print_info=False)
+        self.assertEqual(ticket_indices[0], 5)
+        self.assertTrue(lp.is_solution(ticket_indices))
+
+
+if __name__ == '__main__':
+    unittest.main()
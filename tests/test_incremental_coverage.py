@@ -0,0 +1,42 @@
+import sys
+sys.path.append('src')
+sys.path.append('src/int_set')
+import unittest
+from lottery_problem_with_cache import LotteryProblemWithCache
+try:
+    import numpy as np
+    from incremental_coverage import IncrementalCoverage
+except ImportError:
+    np = None
+
+
+@unittest.skipUnless(np, "requires numpy")
+class TestIncrementalCoverage(unittest.TestCase):
+    def setUp(self):
+        self.lp = LotteryProblemWithCache(10, 5, 5, 3)
+
+    def _count_uncovered(self, ticket_indices):
+        return len(self.lp.get_uncovered_draws_of_tickets(ticket_indices))
+
+    def test_add_and_remove_ticket(self):
+        ticket_indices = [0, 100, 200, 251]
+        coverage = IncrementalCoverage(self.lp)
+        for i, ticket_index in enumerate(ticket_indices):
+            coverage.add_ticket(ticket_index)
+            self.assertEqual(coverage.uncovered_count, self._count_uncovered(ticket_indices[:i + 1]))
+
+        self.assertEqual(coverage.get_remove_loss(100), coverage.remove_ticket(100))
+        self.assertEqual(coverage.uncovered_count, self._count_uncovered([0, 200, 251]))
+        self.assertEqual(coverage.get_add_gain(100), coverage.add_ticket(100))
+        with self.assertRaises(ValueError):
+            coverage.remove_ticket(1)
+
+    def test_swap_ticket(self):
+        coverage = IncrementalCoverage(self.lp, [0, 100, 200])
+        for new_ticket_index in [0, 1, 150, 251]:
+            expected_delta = (
+                self._count_uncovered([0, 200, new_ticket_index]) - coverage.uncovered_count
+            )
+            self.assertEqual(coverage.get_swap_delta(100, new_ticket_index), expected_delta)
+        self.assertEqual(coverage.swap_ticket(100, 150), self._count_uncovered([0, 150, 200]) - self._count_uncovered([0, 100, 200]))
+        self.assertEqual(sorted(coverage.get_ticket_indices()), [0, 150, 200])
@@ -0,0 +1,96 @@
+import sys
+sys.path.append('src')
+sys.path.append('src/int_set')
+import unittest
+from array import array
+from int_set.native_int_set import NativeIntSet
+from int_set.bitset_int_set import BitsetIntSet
+from lottery_problem_with_cache import LotteryProblemWithCache
+try:
+    from int_set.numpy_int_set import NumpyIntSet
+except ImportError:
+    NumpyIntSet = None
+
+
+class TestIntSet(unittest.TestCase):
+    int_set_classes = [NativeIntSet, BitsetIntSet] + ([NumpyIntSet] if NumpyIntSet else [])
+    which_int_sets = ["native", "bitset"] + (["numpy"] if NumpyIntSet else [])
+
+    def test_set_algebra(self):
+        max_size = 70
+        items_1 = {0, 3, 7, 8, 15, 16, 63, 64, 69}
+        items_2 = {1, 3, 8, 9, 64, 65}
+        for IntSet in self.int_set_classes:
+            with self.subTest(IntSet=IntSet.__name__):
+                set_1 = IntSet(max_size, items_1)
+                set_2 = IntSet(max_size, items_2)
+                self.assertEqual(len(set_1), len(items_1))
+                self.assertEqual(sorted(set_1), sorted(items_1))
+                self.assertEqual(set_1.get_items(), items_1)
+                self.assertEqual(set(set_1 | set_2), items_1 | items_2)
+                self.assertEqual(set(set_1 - set_2), items_1 - items_2)
+                self.assertEqual(set(set_1 & set_2), items_1 & items_2)
+                self.assertEqual(set(set_1.negation()), set(range(max_size)) - items_1)
+
+                set_1.difference_update(set_2)
+                self.assertEqual(set(set_1), items_1 - items_2)
+                set_1.update(set_2)
+                self.assertEqual(set(set_1), items_1 | items_2)
+                set_1.intersection_update(set_2)
+                self.assertEqual(set(set_1), items_2)
+                set_1.add(20)
+                self.assertEqual(set(set_1), items_2 | {20})
+
+    def test_bitset_updates_in_place(self):
+        int_set = BitsetIntSet(70)
+        buffer = int_set.buffer
+        int_set.add(69)
+        int_set.update_sorted_items([3, 4, 5, 6, 7, 8, 9, 10, 40])
+        int_set.difference_update_sorted_items([4, 5, 40])
+        int_set.update(BitsetIntSet(70, [1]))
+        self.assertIs(int_set.buffer, buffer)
+        self.assertEqual(int_set.get_items(), {1, 3, 6, 7, 8, 9, 10, 69})
+        int_set.negation_update()
+        self.assertEqual(len(int_set), 70 - 8)
+        self.assertEqual(max(int_set), 68)
+
+    def test_from_ranges(self):
+        ranges = [(0, 1), (3, 9), (15, 17), (20, 45), (69, 70)]
+        expected_items = {item for start, stop in ranges for item in range(start, stop)}
+        for IntSet in self.int_set_classes:
+            with self.subTest(IntSet=IntSet.__name__):
+                self.assertEqual(IntSet.from_ranges(70, ranges).get_items(), expected_items)
+
+    def test_sorted_items(self):
+        items_1 = {0, 3, 7, 8, 15, 16, 63, 64, 69}
+        sorted_items_2 = [1, 3, 8, 9, 10, 64, 65]
+        for IntSet in self.int_set_classes:
+            with self.subTest(IntSet=IntSet.__name__):
+                int_set = IntSet(70, items_1)
+                int_set.difference_update_sorted_items(memoryview(array("I", sorted_items_2)))
+                self.assertEqual(int_set.get_items(), items_1 - set(sorted_items_2))
+                int_set.update_sorted_items(sorted_items_2)
+                self.assertEqual(int_set.get_items(), items_1 | set(sorted_items_2))
+
+    def test_empty_and_full(self):
+        for IntSet in self.int_set_classes:
+            with self.subTest(IntSet=IntSet.__name__):
+                int_set = IntSet(10)
+                self.assertFalse(int_set)
+                self.assertFalse(int_set.is_full())
+                int_set.negation_update()
+                self.assertTrue(int_set)
+                self.assertTrue(int_set.is_full())
+                self.assertEqual(len(int_set), 10)
+
+    def test_which_int_set(self):
+        for which_int_set in self.which_int_sets:
+            with self.subTest(which_int_set=which_int_set):
+                lp = LotteryProblemWithCache(12, 5, 4, 3, which_int_set=which_int_set)
+                self.assertTrue(lp.create_full_draw_set().is_full())
+                self.assertEqual(
+                    len(lp.get_covered_draws(0)),
+                    lp.covered_draw_count_per_ticket
+                )
+                self.assertFalse(lp.is_solution([0, 1]))
+                self.assertTrue(lp.is_solution(range(lp.total_ticket_count)))
@@ -0,0 +1,90 @@
+import sys
+sys.path.append('src')
+sys.path.append('src/int_set')
+import unittest
+from lottery_problem_with_cache import LotteryProblemWithCache
+try:
+    import numpy as np
+    from local_search_optimizer import LocalSearchOptimizer
+except ImportError:
+    np = None
+
+
+@unittest.skipUnless(np, "requires numpy")
+class TestLocalSearchOptimizer(unittest.TestCase):
+    def setUp(self):
+        self.lp = LotteryProblemWithCache(12, 5, 5, 3)
+
+    def test_get_neighbor(self):
+        optimizer = LocalSearchOptimizer(self.lp, seed=0)
+        for ticket_index in range(0, self.lp.total_ticket_count, 37):
+            ticket_combo = self.lp.get_ticket_combo(ticket_index)
+            neighbor_combo = self.lp.get_ticket_combo(optimizer.get_neighbor(ticket_index))
+            self.assertEqual(len(set(ticket_combo) & set(neighbor_combo)), 4)
+
+            draw_index = ticket_index * 3 % self.lp.total_draw_count
+            draw_combo = set(self.lp.get_draw_combo(draw_index))
+            if draw_combo != set(ticket_combo):
+                neighbor_combo = self.lp.get_ticket_combo(optimizer.get_neighbor(ticket_index, draw_index))
+                self.assertEqual(
+                    len(draw_combo & set(neighbor_combo)), len(draw_combo & set(ticket_combo)) + 1
+                )
+
+    def test_anneal(self):
+        ticket_indices = [0, 100, 200, 300]
+        results = [
+            LocalSearchOptimizer(self.lp, seed=1).anneal(ticket_indices, max_move_count=200, print_info=False)
+            for _ in range(2)
+        ]
+        # the same seed gives the same search
+        self.assertEqual(results[0].ticket_indices, results[1].ticket_indices)
+        self.assertEqual(results[0].accepted_move_count, results[1].accepted_move_count)
+        result = results[0]
+        self.assertEqual(len(result.ticket_indices), 4)
+        self.assertEqual(
+            result.uncovered_count, len(self.lp.get_uncovered_draws_of_tickets(result.ticket_indices))
+        )
+        self.assertLessEqual(
+            result.uncovered_count, len(self.lp.get_uncovered_draws_of_tickets(ticket_indices))
+        )
+        self.assertLessEqual(result.move_count, 200)
+
+    def test_anneal_progress(self):
+        reported_move_counts = []
+        result = LocalSearchOptimizer(self.lp, seed=1).anneal(
+            [0, 100, 200, 300], max_move_count=250, print_info=False,
+            on_progress=reported_move_counts.append, progress_interval=100,
+        )
+        self.assertEqual(sum(reported_move_counts), result.move_count)
+        self.assertTrue(all(move_count <= 100 for move_count in reported_move_counts))
+
+    def test_shrink(self):
+        ticket_indices = list(range(0, self.lp.total_ticket_count, 20))
+        self.assertTrue(self.lp.is_solution(ticket_indices))
+        result = LocalSearchOptimizer(self.lp, seed=0).shrink(ticket_indices, time_limit=2, print_info=False)
+        self.assertTrue(self.lp.is_solution(result.ticket_indices))
+        self.assertLess(len(result.ticket_indices), len(ticket_indices))
+        self.assertEqual(result.uncovered_count, 0)
+
+    def test_shrink_non_cover(self):
+        ticket_indices = [0, 100, 200, 300]
+        uncovered_count = len(self.lp.get_uncovered_draws_of_tickets(ticket_indices))
+        self.assertGreater(uncovered_count, 0)
+        result = LocalSearchOptimizer(self.lp, seed=0).shrink(ticket_indices, time_limit=2, print_info=False)
+        self.assertEqual(result.ticket_indices, ticket_indices)
+        self.assertEqual(result.uncovered_count, uncovered_count)
+
+    def test_delete_covered_draws_csr_after_anneal(self):
+        lp = LotteryProblemWithCache(12, 5, 5, 3, which_int_set="bitset")
+        lp.cache_covered_draws_parallel(process_count=1)
+        optimizer = LocalSearchOptimizer(lp, seed=0)
+        optimizer.anneal([0, 100, 200, 300], max_move_count=100, print_info=False)
+        # the optimizer must not keep views of the shared memory
+        lp.delete_covered_draws_csr()
+        self.assertIsNone(lp.covered_draws_csr)
+        self.assertEqual(len(lp.get_covered_draws(0)), lp.covered_draw_count_per_ticket)
+        optimizer.anneal([0, 100, 200, 300], max_move_count=100, print_info=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import sys
+sys.path.append('src')
+import unittest
+from itertools import combinations
+from lottery_bounds import (
+    get_lower_bound,
+    get_schonheim_bound,
+    get_sphere_bound,
+    get_turan_bound,
+    get_turan_number_upper_bound,
+)
+
+
+def find_min_solution_size(n, k, p, t):
+    """Find the exact size of the smallest (n, k, p, t) lottery design by brute force."""
+    draws = list(combinations(range(n), p))
+    tickets = list(combinations(range(n), k))
+    covered_draws_masks = [
+        sum(1 << draw_index for draw_index, draw in enumerate(draws) if len(set(ticket) & set(draw)) >= t)
+        for ticket in tickets
+    ]
+    all_draws_mask = (1 << len(draws)) - 1
+    for size in range(1, len(tickets) + 1):
+        for ticket_indices in combinations(range(len(tickets)), size):
+            covered_draws_mask = 0
+            for ticket_index in ticket_indices:
+                covered_draws_mask |= covered_draws_masks[ticket_index]
+            if covered_draws_mask == all_draws_mask:
+                return size
+
+
+class TestLotteryBounds(unittest.TestCase):
+    def test_known_values(self):
+        # the Fano plane is the smallest (7, 3, 2, 2) covering design
+        self.assertEqual(get_schonheim_bound(7, 3, 2), 7)
+        self.assertEqual(get_lower_bound(7, 3, 2, 2), 7)
+        self.assertEqual(get_sphere_bound(10, 5, 5, 3), 2)
+        # the Turán graph T(39, 4) has 570 edges
+        self.assertEqual(get_turan_number_upper_bound(39, 5, 2), 570)
+        self.assertEqual(get_turan_bound(39, 5, 5, 2), 18)
+
+    def test_turan_number_upper_bound(self):
+        # ex(n, K_p^t) = C(p, t) - 1 when n = p
+        for t in range(1, 5):
+            for p in range(t, 7):
+                self.assertEqual(get_turan_number_upper_bound(p, p, t), len(list(combinations(range(p), t))) - 1)
+
+    def test_lower_bound_is_valid(self):
+        for n in range(3, 7):
+            for k in range(1, n):
+                for p in range(1, n + 1):
+                    for t in range(1, min(k, p) + 1):
+                        with self.subTest(n=n, k=k, p=p, t=t):
+                            lower_bound = get_lower_bound(n, k, p, t)
+                            self.assertGreaterEqual(lower_bound, get_sphere_bound(n, k, p, t))
+                            self.assertLessEqual(lower_bound, find_min_solution_size(n, k, p, t))
+
+
+if __name__ == '__main__':
+    unittest.main()
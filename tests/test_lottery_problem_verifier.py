@@ -0,0 +1,231 @@
+import sys
+sys.path.append('src')
+sys.path.append('src/int_set')
+import logging
+import unittest
+from collections import Counter
+from lottery_problem_with_cache import LotteryProblemWithCache
+from lottery_problem_verifier import LotteryProblemVerifier
+from instrumentation import PhaseTimer
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TestLotteryProblemVerifier(unittest.TestCase):
+    def setUp(self):
+        self.lp = LotteryProblemWithCache(10, 5, 5, 3)
+        self.verifier = LotteryProblemVerifier(self.lp, logger=logging.getLogger("test"))
+        # these tickets leave 9 draws uncovered
+        self.ticket_indices = self.lp.get_indices_by_tickets(
+            [(0, 1, 2, 3, 4), (0, 5, 6, 7, 8), (1, 2, 5, 6, 9)]
+        )
+        self.expected_uncovered_draws = [
+            draw_index
+            for draw_index, draw_combo in enumerate(self.lp.yield_all_draw_combos())
+            if all(
+                len(set(draw_combo) & set(self.lp.get_ticket_combo(ticket_index))) < 3
+                for ticket_index in self.ticket_indices
+            )
+        ]
+        self.assertEqual(len(self.expected_uncovered_draws), 9)
+
+    def test_verify_coverage(self):
+        self.assertEqual(
+            self.verifier.verify_coverage(self.ticket_indices, print_info=False),
+            len(self.expected_uncovered_draws)
+        )
+
+    def test_verify_coverage_draw_sets(self):
+        for which_int_set in ["native", "bitset"] + (["numpy"] if np is not None else []):
+            with self.subTest(which_int_set=which_int_set):
+                verifier = LotteryProblemVerifier(LotteryProblemWithCache(10, 5, 5, 3, which_int_set=which_int_set))
+                self.assertEqual(
+                    verifier.verify_coverage_draw_sets(self.ticket_indices, print_info=False),
+                    len(self.expected_uncovered_draws)
+                )
+
+    def test_verify_coverage_progress(self):
+        phase_timer = PhaseTimer()
+        self.verifier.add_observer(phase_timer)
+        self.lp.add_observer(phase_timer)
+        self.lp.cache_covered_draws()
+        with self.assertLogs("test", level="INFO") as logs:
+            uncovered_draw_count = self.verifier.verify_coverage(self.ticket_indices, log_interval=0)
+        self.assertEqual(uncovered_draw_count, len(self.expected_uncovered_draws))
+        self.assertEqual(phase_timer.phase_step_counts["cache_covered_draws"], self.lp.total_ticket_count)
+        self.assertEqual(phase_timer.phase_step_counts["subtract_covered_draws"], len(self.ticket_indices))
+        self.assertIn("subtract_covered_draws", phase_timer.phase_seconds)
+        # the details are only computed for the reported progress
+        self.assertTrue(any("9 / 252 = 3.57% draws uncovered" in line for line in logs.output))
+
+    def test_verify_coverage_shadow(self):
+        self.assertEqual(
+            self.verifier.find_uncovered_draws_shadow(self.ticket_indices),
+            self.expected_uncovered_draws
+        )
+        self.assertEqual(
+            self.verifier.verify_coverage_shadow(self.ticket_indices, print_info=False),
+            len(self.expected_uncovered_draws)
+        )
+
+    def test_verify_coverage_revolving_door(self):
+        self.assertEqual(
+            sorted(self.verifier.yield_uncovered_draws_revolving_door(self.ticket_indices)),
+            self.expected_uncovered_draws
+        )
+        self.assertEqual(
+            self.verifier.verify_coverage_revolving_door(self.ticket_indices, print_info=False),
+            len(self.expected_uncovered_draws)
+        )
+
+    def test_verify_coverage_parallel(self):
+        for process_count in [1, 2]:
+            self.assertEqual(
+                self.verifier.find_uncovered_draws_parallel(
+                    self.ticket_indices, process_count=process_count, shard_count=7, print_info=False
+                ),
+                self.expected_uncovered_draws
+            )
+            self.assertEqual(
+                self.verifier.verify_coverage_parallel(
+                    self.ticket_indices, process_count=process_count, print_info=False
+                ),
+                len(self.expected_uncovered_draws)
+            )
+
+    def test_verify_coverage_streaming(self):
+        self.assertEqual(
+            list(self.verifier.yield_uncovered_draws_streaming(self.ticket_indices, chunk_size=10)),
+            self.expected_uncovered_draws
+        )
+        self.assertEqual(
+            self.verifier.verify_coverage_streaming(self.ticket_indices, print_info=False),
+            len(self.expected_uncovered_draws)
+        )
+
+    def test_find_uncovered_draw(self):
+        draw_index, draw_combo = self.verifier.find_uncovered_draw(self.ticket_indices, seed=0, print_info=False)
+        self.assertIn(draw_index, self.expected_uncovered_draws)
+        self.assertEqual(self.lp.get_draw_combo(draw_index), draw_combo)
+        # only the exhaustive check can find it
+        draw_index, _ = self.verifier.find_uncovered_draw(
+            self.ticket_indices, greedy_attempt_count=0, sample_count=0, print_info=False
+        )
+        self.assertEqual(draw_index, self.expected_uncovered_draws[0])
+
+        all_ticket_indices = range(self.lp.total_ticket_count)
+        self.assertIsNone(self.verifier.find_uncovered_draw(all_ticket_indices, print_info=False))
+        self.assertTrue(self.verifier.verify_coverage_fail_fast(all_ticket_indices, print_info=False))
+
+    @unittest.skipUnless(np, "requires numpy")
+    def test_estimate_coverage(self):
+        estimate = self.verifier.estimate_coverage(
+            self.ticket_indices, target_half_width=0.005, batch_size=1000, seed=0, print_info=False
+        )
+        expected_coverage = 1 - len(self.expected_uncovered_draws) / self.lp.total_draw_count
+        self.assertLessEqual(estimate.lower_bound, expected_coverage)
+        self.assertGreaterEqual(estimate.upper_bound, expected_coverage)
+        self.assertLessEqual((estimate.upper_bound - estimate.lower_bound) / 2, 0.005)
+
+        estimate = self.verifier.estimate_coverage(
+            range(self.lp.total_ticket_count), max_sample_count=500, seed=0, print_info=False
+        )
+        self.assertEqual((estimate.coverage, estimate.sample_count), (1.0, 500))
+
+        # a budget of one byte checks one ticket at a time, and gives the same estimate
+        chunked_estimate, estimate = [
+            self.verifier.estimate_coverage(
+                self.ticket_indices, max_sample_count=3000, batch_size=1000, seed=0, print_info=False,
+                max_matrix_bytes=max_matrix_bytes,
+            )
+            for max_matrix_bytes in [1, 1 << 26]
+        ]
+        self.assertEqual(chunked_estimate, estimate)
+        self.assertGreater(estimate.uncovered_sample_count, 0)
+
+    def test_check_coverage_distribution(self):
+        expected_counter = Counter(
+            sum(
+                len(set(draw_combo) & set(self.lp.get_ticket_combo(ticket_index))) >= 3
+                for ticket_index in self.ticket_indices
+            )
+            for draw_combo in self.lp.yield_all_draw_combos()
+        )
+        self.assertEqual(
+            self.verifier.check_coverage_distribution(self.ticket_indices, print_info=False),
+            expected_counter
+        )
+        self.assertEqual(expected_counter[0], len(self.expected_uncovered_draws))
+
+    @unittest.skipUnless(np, "requires numpy")
+    def test_check_coverage_distribution_with_cached_covered_draws(self):
+        expected_counter = self.verifier.check_coverage_distribution(self.ticket_indices, print_info=False)
+        for which_int_set in ["native", "bitset", "numpy"]:
+            with self.subTest(which_int_set=which_int_set):
+                lp = LotteryProblemWithCache(10, 5, 5, 3, which_int_set=which_int_set, cache_covered_draws=True)
+                # the cached draw sets are read instead of generating the covered draws again
+                lp.generate_covered_draw_index_array = None
+                verifier = LotteryProblemVerifier(lp)
+                self.assertEqual(verifier.check_coverage_distribution(self.ticket_indices, print_info=False), expected_counter)
+
+    @unittest.skipUnless(np, "requires numpy")
+    def test_repeated_analysis_uses_lru_cache(self):
+        self.lp.enable_covered_draws_lru_cache(1 << 20)
+        lru_cache = self.lp.covered_draws_lru_cache
+        counter = self.verifier.check_coverage_distribution(self.ticket_indices, print_info=False)
+        self.assertEqual((lru_cache.hit_count, lru_cache.miss_count), (0, len(self.ticket_indices)))
+        self.assertEqual(self.verifier.check_coverage_distribution(self.ticket_indices, print_info=False), counter)
+        self.verifier.evaluate_redundancy(self.ticket_indices)
+        # the covered draws are generated only once
+        self.assertEqual(lru_cache.miss_count, len(self.ticket_indices))
+        self.assertGreaterEqual(lru_cache.hit_count, len(self.ticket_indices) * 2)
+
+    def test_evaluate_redundancy(self):
+        # the last ticket covers nothing the others don't
+        ticket_indices = self.ticket_indices + self.lp.get_indices_by_tickets([(0, 1, 2, 5, 6)])
+        redundancies = self.verifier.evaluate_redundancy(ticket_indices)
+        for ticket_index, redundancy in zip(ticket_indices, redundancies):
+            other_covered_draws = self.lp.get_covered_draws_of_tickets(
+                [other_index for other_index in ticket_indices if other_index != ticket_index]
+            )
+            self.assertEqual(
+                redundancy,
+                len(self.lp.get_covered_draws(ticket_index) & other_covered_draws)
+            )
+        self.assertEqual(redundancies[-1], self.lp.covered_draw_count_per_ticket)
+
+    def test_evaluate_unique_coverage(self):
+        unique_coverages = self.verifier.evaluate_unique_coverage(self.ticket_indices)
+        for ticket_index, unique_coverage in zip(self.ticket_indices, unique_coverages):
+            other_covered_draws = self.lp.get_covered_draws_of_tickets(
+                [other_index for other_index in self.ticket_indices if other_index != ticket_index]
+            )
+            self.assertEqual(unique_coverage, len(self.lp.get_covered_draws(ticket_index) - other_covered_draws))
+        # a ticket selected twice covers nothing on its own
+        self.assertEqual(
+            self.verifier.evaluate_unique_coverage(self.ticket_indices + self.ticket_indices[:1]),
+            [0] + unique_coverages[1:] + [0]
+        )
+
+    @unittest.skipUnless(np, "requires numpy")
+    def test_ticket_set_analytics(self):
+        # tickets (0, 1, 2, 3, 4), (0, 5, 6, 7, 8), (1, 2, 5, 6, 9) share 1, 2 and 2 numbers
+        self.assertEqual(dict(self.verifier.count_overlap(self.ticket_indices, print_info=False)), {1: 1, 2: 2})
+        self.assertEqual(
+            self.verifier.count_nums(self.ticket_indices, print_info=False),
+            Counter([0, 1, 2, 3, 4, 0, 5, 6, 7, 8, 1, 2, 5, 6, 9])
+        )
+        pair_frequencies = self.verifier.count_pairs(self.ticket_indices)
+        self.assertEqual(pair_frequencies[1][2], 2)
+        self.assertEqual(pair_frequencies[0][9], 0)
+
+    def test_prune_redundant_tickets(self):
+        ticket_indices = self.lp.get_indices_by_tickets([(0, 1, 2, 5, 6)]) + self.ticket_indices
+        pruned_ticket_indices = self.verifier.prune_redundant_tickets(ticket_indices, print_info=False)
+        self.assertEqual(pruned_ticket_indices, self.ticket_indices)
+        self.assertEqual(
+            self.verifier.verify_coverage(pruned_ticket_indices, print_info=False),
+            self.verifier.verify_coverage(ticket_indices, print_info=False),
+        )
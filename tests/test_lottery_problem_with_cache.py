@@ -1,11 +1,22 @@
 import sys
 sys.path.append('src')
 sys.path.append('src/int_set')
+import os
+import tempfile
 import unittest
+from multiprocessing.shared_memory import SharedMemory
+from covered_draws_csr import SharedMemoryCoveredDrawsCSR
+from covered_draws_file import write_covered_draws_file
 from lottery_problem_with_cache import LotteryProblemWithCache
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class TestLotteryProblemWithCache(unittest.TestCase):
+    which_int_sets = ["native", "bitset"] + (["numpy"] if np is not None else [])
+
     def test_init(self):
         lp = LotteryProblemWithCache(
             18, 6, 4, 3,
@@ -31,6 +42,136 @@ class TestLotteryProblemWithCache(unittest.TestCase):
             lp.covered_draw_count_per_ticket
         )
 
+    def test_generate_covered_draws(self):
+        for problem_tuple in [(10, 5, 4, 2), (9, 4, 6, 3), (8, 6, 5, 4)]:
+            lp = LotteryProblemWithCache(*problem_tuple)
+            for ticket_index in [0, lp.total_ticket_count // 3, lp.total_ticket_count - 1]:
+                ticket_combo = lp.get_ticket_combo(ticket_index)
+                expected_draws = {
+                    draw_index
+                    for draw_index, draw_combo in enumerate(lp.yield_all_draw_combos())
+                    if len(set(draw_combo) & set(ticket_combo)) >= lp.min_matched_num_count
+                }
+                self.assertEqual(lp.generate_covered_draws(ticket_index).get_items(), expected_draws)
+                if np is not None:
+                    self.assertEqual(
+                        lp.generate_covered_draw_index_array(ticket_index).tolist(), sorted(expected_draws)
+                    )
+
+    def test_cache_covered_draws_on_disk(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for which_int_set in ["native", "bitset"]:
+                lp = LotteryProblemWithCache(10, 5, 4, 2, which_int_set=which_int_set, covered_draws_cache_dir=cache_dir)
+                self.assertTrue(os.path.exists(lp.get_covered_draws_file_path(cache_dir)))
+                for ticket_index in [0, 100, lp.total_ticket_count - 1]:
+                    self.assertEqual(
+                        lp.get_covered_draws(ticket_index).get_items(),
+                        lp.generate_covered_draws(ticket_index).get_items()
+                    )
+                    self.assertEqual(
+                        list(lp.get_covered_draw_indices(ticket_index)),
+                        sorted(lp.generate_covered_draws(ticket_index))
+                    )
+                lp.delete_covered_draws_file()
+
+            other_lp = LotteryProblemWithCache(10, 5, 4, 3)
+            with self.assertRaises(ValueError):
+                other_lp.load_covered_draws_file(lp.get_covered_draws_file_path(cache_dir))
+
+    @unittest.skipUnless(np, "requires numpy")
+    def test_delete_covered_draws_csr_with_exported_view(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for cache_covered_draws in [
+                lambda lp: lp.cache_covered_draws_on_disk(cache_dir),
+                lambda lp: lp.cache_covered_draws_parallel(process_count=1),
+            ]:
+                lp = LotteryProblemWithCache(10, 5, 4, 2)
+                cache_covered_draws(lp)
+                covered_draws_csr = lp.covered_draws_csr
+                draw_indices = lp.get_covered_draw_index_array(0)
+                with self.assertRaises(BufferError):
+                    lp.delete_covered_draws_csr()
+                # the problem is detached from the half-closed CSR anyway
+                self.assertIsNone(lp.covered_draws_csr)
+                self.assertEqual(sorted(lp.get_covered_draws(0)), draw_indices.tolist())
+                if isinstance(covered_draws_csr, SharedMemoryCoveredDrawsCSR):
+                    # and the shared memory is unlinked, so it doesn't leak
+                    with self.assertRaises(FileNotFoundError):
+                        SharedMemory(covered_draws_csr.get_spec()[0])
+                del draw_indices
+                covered_draws_csr.close()
+
+    def test_write_covered_draws_file_failure(self):
+        def yield_covered_draw_indices():
+            yield [0, 1]
+            raise RuntimeError("interrupted")
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            path = os.path.join(cache_dir, "covered_draws.bin")
+            with self.assertRaises(RuntimeError):
+                write_covered_draws_file(path, "", 10, yield_covered_draw_indices())
+            # neither the file nor its temporary file is left behind
+            self.assertEqual(os.listdir(cache_dir), [])
+
+    def test_cache_covered_draws_parallel(self):
+        lp = LotteryProblemWithCache(10, 5, 4, 2)
+        for process_count in [1, 2]:
+            lp.cache_covered_draws_parallel(process_count=process_count)
+            self.assertEqual(len(lp.covered_draws_csr), lp.total_ticket_count)
+            for ticket_index in range(lp.total_ticket_count):
+                self.assertEqual(
+                    list(lp.get_covered_draw_indices(ticket_index)),
+                    sorted(lp.generate_covered_draws(ticket_index))
+                )
+            lp.delete_covered_draws_csr()
+
+    def test_cache_covered_draws_csr(self):
+        for which_int_set in self.which_int_sets:
+            with self.subTest(which_int_set=which_int_set):
+                lp = LotteryProblemWithCache(10, 5, 4, 2, which_int_set=which_int_set)
+                lp.cache_covered_draws_csr(chunk_size=100)
+                self.assertEqual(len(lp.covered_draws_csr), lp.total_ticket_count)
+                # uint64 offsets and uint32 draw indices
+                self.assertEqual(
+                    lp.covered_draws_csr.get_memory_size(),
+                    (lp.total_ticket_count + 1) * 8 + lp.total_ticket_count * lp.covered_draw_count_per_ticket * 4
+                )
+                for ticket_index in range(lp.total_ticket_count):
+                    self.assertEqual(
+                        list(lp.get_covered_draw_indices(ticket_index)),
+                        sorted(lp.generate_covered_draws(ticket_index))
+                    )
+                ticket_indices = [0, 100, lp.total_ticket_count - 1]
+                expected_covered_draws = set().union(
+                    *(lp.generate_covered_draws(ticket_index) for ticket_index in ticket_indices)
+                )
+                self.assertEqual(lp.get_covered_draws_of_tickets(ticket_indices).get_items(), expected_covered_draws)
+                self.assertEqual(
+                    lp.get_uncovered_draws_of_tickets(ticket_indices).get_items(),
+                    set(range(lp.total_draw_count)) - expected_covered_draws
+                )
+                lp.delete_covered_draws_csr()
+
+    def test_covered_draws_lru_cache(self):
+        # every ticket covers the same count of draws, so every native draw set has the same size
+        lp = LotteryProblemWithCache(10, 5, 4, 2)
+        draw_set_size = lp.generate_covered_draws(0).get_memory_size()
+        lp.enable_covered_draws_lru_cache(draw_set_size * 2)
+        lru_cache = lp.covered_draws_lru_cache
+
+        covered_draws_0 = lp.get_covered_draws(0)
+        self.assertIs(lp.get_covered_draws(0), covered_draws_0)
+        lp.get_covered_draws(1)
+        lp.get_covered_draws(0)
+        lp.get_covered_draws(2)  # evicts ticket 1
+        self.assertIn(0, lru_cache)
+        self.assertNotIn(1, lru_cache)
+        self.assertEqual(
+            (lru_cache.hit_count, lru_cache.miss_count, lru_cache.eviction_count),
+            (2, 3, 1)
+        )
+        self.assertLessEqual(lru_cache.current_bytes, lru_cache.max_bytes)
+
     def test_get_combination_index(self):
         total_num_count = 18
         num_count_in_ticket = 6
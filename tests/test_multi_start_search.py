@@ -0,0 +1,50 @@
+import sys
+sys.path.append('src')
+sys.path.append('src/int_set')
+import unittest
+from lottery_problem_with_cache import LotteryProblemWithCache
+try:
+    import numpy as np
+    from multi_start_search import MultiStartSearch, StartResult
+except ImportError:
+    np = None
+
+
+@unittest.skipUnless(np, "requires numpy")
+class TestMultiStartSearch(unittest.TestCase):
+    def test_run(self):
+        lp = LotteryProblemWithCache(12, 5, 5, 3, which_int_set="bitset")
+        for process_count in [1, 2]:
+            result = MultiStartSearch(lp, process_count).run(
+                4, 0.2, candidate_count=100, seed=0, print_info=False
+            )
+            self.assertTrue(lp.is_solution(result.best_ticket_indices))
+            # it may stop early at a proven optimum
+            self.assertLessEqual({r.start_index for r in result.start_results}, {0, 1, 2, 3})
+            self.assertEqual(min(len(r.ticket_indices) for r in result.start_results), len(result.best_ticket_indices))
+            self.assertEqual(
+                sum(p.start_count for p in result.worker_progress.values()), len(result.start_results)
+            )
+            # the moves of starts terminated by an early stop are counted too
+            self.assertGreaterEqual(
+                sum(p.move_count for p in result.worker_progress.values()),
+                sum(r.move_count for r in result.start_results)
+            )
+
+    def test_moves_per_second(self):
+        self.assertEqual(StartResult(0, 0, 1, [0], 10, 2.0).moves_per_second, 5.0)
+        # a start that found the optimum at once
+        self.assertEqual(StartResult(0, 0, 1, [0], 0, 0.0).moves_per_second, 0.0)
+
+    def test_run_with_shared_covered_draws(self):
+        lp = LotteryProblemWithCache(12, 5, 5, 3, which_int_set="bitset")
+        lp.cache_covered_draws_parallel(process_count=1)
+        try:
+            result = MultiStartSearch(lp, 2).run(2, 0.2, seed=0, print_info=False)
+            self.assertTrue(lp.is_solution(result.best_ticket_indices))
+        finally:
+            lp.delete_covered_draws_csr()
+
+
+if __name__ == '__main__':
+    unittest.main()
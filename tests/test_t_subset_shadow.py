@@ -0,0 +1,33 @@
+import sys
+sys.path.append('src')
+import random
+import unittest
+from itertools import combinations
+from t_subset_shadow import TSubsetShadow
+
+
+class TestTSubsetShadow(unittest.TestCase):
+    def test_uncovered_draws(self):
+        rng = random.Random(0)
+        for n, k, p, t in [(10, 5, 5, 3), (9, 4, 5, 2), (8, 3, 4, 1), (9, 5, 4, 3), (9, 6, 5, 4), (8, 2, 3, 3), (7, 3, 1, 1)]:
+            for ticket_count in [0, 1, 3, 6]:
+                with self.subTest(problem=(n, k, p, t), ticket_count=ticket_count):
+                    ticket_combos = [tuple(sorted(rng.sample(range(n), k))) for _ in range(ticket_count)]
+                    expected_uncovered_draw_indices = [
+                        draw_index
+                        for draw_index, draw_combo in enumerate(combinations(range(n), p))
+                        if all(len(set(draw_combo) & set(ticket_combo)) < t for ticket_combo in ticket_combos)
+                    ]
+                    shadow = TSubsetShadow(ticket_combos, n, p, t)
+                    self.assertEqual(shadow.count_uncovered_draws(), len(expected_uncovered_draw_indices))
+                    self.assertEqual(list(shadow.yield_uncovered_draw_indices()), expected_uncovered_draw_indices)
+
+    def test_is_draw_covered(self):
+        shadow = TSubsetShadow([(0, 1, 2, 3, 4)], 10, 5, 3)
+        self.assertEqual(shadow.get_marked_t_subset_count(), 10)
+        self.assertTrue(shadow.is_draw_covered((0, 2, 4, 8, 9)))
+        self.assertFalse(shadow.is_draw_covered((0, 2, 7, 8, 9)))
+
+
+if __name__ == '__main__':
+    unittest.main()
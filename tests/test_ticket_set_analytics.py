@@ -0,0 +1,55 @@
+import sys
+sys.path.append('src')
+import random
+import unittest
+from itertools import combinations
+import ticket_set_analytics
+try:
+    import numpy as np
+    import numpy_ticket_set_analytics
+except ImportError:
+    np = None
+
+
+class TestTicketSetAnalytics(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(0)
+        self.total_numbers = 12
+        self.ticket_combos = [tuple(sorted(rng.sample(range(self.total_numbers), 5))) for _ in range(40)]
+        self.expected_overlap_histogram = [0] * 6
+        for combo_1, combo_2 in combinations(self.ticket_combos, 2):
+            self.expected_overlap_histogram[len(set(combo_1) & set(combo_2))] += 1
+        self.expected_pair_frequencies = [
+            [sum(1 for combo in self.ticket_combos if a in combo and b in combo) for b in range(self.total_numbers)]
+            for a in range(self.total_numbers)
+        ]
+
+    def check_analytics(self, analytics, ticket_combos):
+        self.assertEqual(
+            analytics.get_overlap_histogram(ticket_combos, self.total_numbers),
+            self.expected_overlap_histogram
+        )
+        self.assertEqual(
+            analytics.get_number_frequencies(ticket_combos, self.total_numbers),
+            [self.expected_pair_frequencies[num][num] for num in range(self.total_numbers)]
+        )
+        self.assertEqual(
+            analytics.get_pair_frequencies(ticket_combos, self.total_numbers),
+            self.expected_pair_frequencies
+        )
+
+    def test_analytics(self):
+        self.check_analytics(ticket_set_analytics, self.ticket_combos)
+        self.assertEqual(ticket_set_analytics.get_overlap_histogram([], self.total_numbers), [0])
+
+    @unittest.skipUnless(np, "requires numpy")
+    def test_numpy_analytics(self):
+        self.check_analytics(numpy_ticket_set_analytics, np.array(self.ticket_combos, dtype=np.uint8))
+        self.assertEqual(
+            numpy_ticket_set_analytics.get_overlap_histogram(np.zeros((0, 5), dtype=np.uint8), self.total_numbers),
+            [0] * 6
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()